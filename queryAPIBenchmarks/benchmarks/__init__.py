@@ -1,3 +1,14 @@
+from .queryAPIAsyncSessions import BenchmarkAsyncSessions
+from .queryAPIAsyncSessionsImplicit import BenchmarkAsyncSessionsImplicit
+from .queryAPIBatchSweep import BatchSweep
+from .queryAPICompressionSweep import CompressionSweep
+from .queryAPIConcurrencySearch import ConcurrencySearch
+from .queryAPIDecodeCost import DecodeCost
+from .queryAPIDistributed import Distributed
+from .queryAPIHttp2Multiplex import Http2Multiplex
+from .queryAPIMultiProcess import MultiProcess
+from .queryAPIResponseFormats import BenchmarkResponseFormats
+from .queryAPIScenario import BenchmarkScenario
 from .queryAPISync import BenchmarkSync
 from .queryAPISyncImplicit import BenchmarkSyncImplicit
 from .queryAPISyncSessions import BenchmarkSyncSessions
@@ -15,5 +26,16 @@ __all__ = [
     "BenchmarkSyncImplicit",
     "BenchmarkSyncSessionsImplicit",
     "BenchmarkThreadsImplicit",
-    "BenchmarkThreadsSessionsImplicit"
+    "BenchmarkThreadsSessionsImplicit",
+    "BenchmarkAsyncSessions",
+    "BenchmarkAsyncSessionsImplicit",
+    "BenchmarkScenario",
+    "ConcurrencySearch",
+    "BatchSweep",
+    "CompressionSweep",
+    "DecodeCost",
+    "BenchmarkResponseFormats",
+    "Http2Multiplex",
+    "MultiProcess",
+    "Distributed"
 ]
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Dev'
+
+# Generic / built in
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+# Owned
+from queryAPIBenchmarks.common import APIException, BenchmarkResult, ClientOptions, LoadProfile, ParameterSource, Profiler, ProgressBar, RequestTracer, ResourceSampler, RetryPolicy, TransactionShape, TXasyncSession
+
+
+class BenchmarkAsyncSessionsImplicit:
+    """
+    Provides methods to benchmark Neo4j Query API performance using asyncio and a shared async session with implicit transactions.
+    """
+    @staticmethod
+    async def _TXAsyncSessionsImplicit(tx_session: TXasyncSession, cypher: str, parameters: dict, result: BenchmarkResult, retry: RetryPolicy, intended: float = None):
+        """
+          PRIVATE
+
+          Executes the supplied Cypher statement in an implicit TX. Uses an async session
+
+          :param tx_session - an instance of the TXasyncSession class
+          :param cypher - the cypher statement to run
+          :param parameters - values for the $ parameters of the statement, or None
+          :param result - where to record how long the transaction took
+          :param retry - tries the transaction again on a transient error
+          :param intended - ( optional ) for open loop tests, when the transaction should have been sent
+          :return: - Nothing is returned
+        """
+
+        tx_start = time.perf_counter()
+
+        # run the transaction
+        try:
+            _, retries = await retry.run_async(tx_session.tx_async_implicit, cypher, parameters)
+
+        except APIException as e:
+            # Record that it failed, and how long it took to
+            result.record_error(e, tx_start, time.perf_counter(), intended=intended)
+            return
+
+        # Record how long the transaction took
+        result.record_phases(tx_start, time.perf_counter(), intended=intended, retries=retries)
+
+
+    @staticmethod
+    async def _worker(tx_session: TXasyncSession, tx_statements, test_runs, tx_progress_bar: ProgressBar, result: BenchmarkResult, retry: RetryPolicy, worker_start: float):
+        """
+          PRIVATE
+
+          Keeps taking test runs from the shared iterator until there are none left.
+          Every worker runs on the same event loop so the iterator does not need a lock.
+          Workers added by a later step of the load profile wait until worker_start, a perf_counter() time
+        """
+        delay = worker_start - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        for intended, (tx_cypher, tx_parameters) in zip(test_runs, tx_statements):
+            # When open loop, wait until the transaction is due.  If every worker was
+            # busy we are already late, so go straight away and the wait counts in its latency
+            if intended is not None:
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            await BenchmarkAsyncSessionsImplicit._TXAsyncSessionsImplicit(tx_session, tx_cypher, tx_parameters, result, retry, intended)
+            tx_progress_bar.add_progress_entry()
+
+
+    @staticmethod
+    async def _run_async(number_tests: int, cypher: str, url: str, usr: str, pwd:str, db: str, t_out: int, workers: int, http2: bool, load_profile: LoadProfile, parameters: ParameterSource, client_options: ClientOptions):
+        """
+          PRIVATE
+
+          Starts the workers and waits for them all to finish.  Returns the results of the test
+        """
+
+        # One async session shared by every worker.  The connection pool
+        # is sized to the number of workers so none of them wait for a connection
+        tx_session = TXasyncSession(url, usr, pwd, db, t_out, http2, load_profile.max_workers(workers), client_options)
+
+        # Progress bar
+        tx_progress_bar = ProgressBar("TXAsyncSessionsImplicit", load_profile.expected_tests(number_tests))
+
+        # Results of the test, including the latency of every transaction.
+        # Open loop tests also record how long each transaction waited to be sent
+        result = BenchmarkResult(load_profile.expected_tests(number_tests), load_profile.phases(), load_profile.rate)
+
+        # Time each part of every request, including how long it waits for a connection from the pool
+        tx_session.tracer = RequestTracer(result.http)
+
+        # Tries a transaction again on a transient error, when asked to
+        retry = (client_options or ClientOptions()).retry_policy()
+
+        # The statement and parameters of each transaction.  Parameters are made now so it does not slow the test down
+        tx_statements = ParameterSource.statements(cypher, parameters, load_profile.expected_tests(number_tests))
+
+        # Starting time
+        start_time = datetime.now()
+        run_start = time.perf_counter()
+
+        # Sample the client itself while the test runs, to tell when it rather than Neo4j is the bottleneck
+        sampler = ResourceSampler(loop=asyncio.get_running_loop()).start()
+
+        # Profile just the timed part of the test, when asked to with --profile
+        profiler = Profiler().start()
+
+        # Rather than creating a task for every test run up front, we start
+        # a fixed number of workers that share the test runs between them.
+        # Each test run is the time it is due when open loop, otherwise None
+        test_runs = load_profile.intended_times(number_tests, run_start)
+        await asyncio.gather(*[BenchmarkAsyncSessionsImplicit._worker(tx_session, tx_statements, test_runs, tx_progress_bar, result, retry, run_start + load_profile.worker_start(worker_number, workers))
+                               for worker_number in range(load_profile.max_workers(workers))])
+
+        result.profile = profiler.stop()
+        result.resources.append(sampler.stop())
+
+        # Destroy progress bar object
+        # Make sure to do this to avoid the console
+        # output showing the progress bar more than once
+        # when something else is printed to the screen
+        del tx_progress_bar
+
+        # Close the session
+        await tx_session.aclose()
+
+        end_time = datetime.now()
+        run_end = time.perf_counter()
+        total_time: timedelta = end_time - start_time
+        result.total_time = total_time.total_seconds()
+
+        # Leave out the warm up and cool down, and split a stepped test into its steps
+        result.set_window(*load_profile.measurement_window(run_start, run_end))
+        result.steps = load_profile.steps(run_start, run_end, workers)
+
+        return result
+
+
+    @staticmethod
+    def run(number_tests: int, cypher: str, url: str, usr: str, pwd:str, db: str, t_out: int, workers:int = 0, http2: bool = False, load_profile: LoadProfile = None, parameters: ParameterSource = None, tx_shape: TransactionShape = None, client_options: ClientOptions = None):
+        """
+         Repeats a cypher statement, neo4j_cyper, for the number of times set by num_tests to the Neo4j Query API
+         at neo4j_url using asyncio. The total time is returned.
+
+         Workers are coroutines on a single event loop rather than threads, so
+         this can keep a lot more requests in flight than the Threads tests
+
+         :param cypher - the cypher statement to run
+         :param number_tests  - the number of times to execute the test
+         :param url - the URL of the Neo4j Query API
+         :param usr - the user account to use
+         :param pwd  - the password of the user account
+         :param workers - the number of requests to have in flight at once
+         :param http2 - ( optional ) request to use http2 protocol.
+         :param load_profile - ( optional ) when to send each transaction.  Closed loop when not given
+         :param parameters - ( optional ) makes the parameters sent with each cypher statement
+         :param tx_shape - not used.  Implicit transactions always run one statement
+         :param client_options - ( optional ) how the client makes its requests and reads the responses
+         :return: BenchmarkResult with the total time taken and the latency of each transaction
+         """
+
+        # Closed loop unless told otherwise
+        if load_profile is None:
+            load_profile = LoadProfile()
+
+        result: BenchmarkResult = asyncio.run(BenchmarkAsyncSessionsImplicit._run_async(number_tests, cypher, url, usr, pwd, db, t_out, max(workers, 1), http2, load_profile, parameters, client_options))
+
+        return result
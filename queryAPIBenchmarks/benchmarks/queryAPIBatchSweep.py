@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Dev'
+
+# Generic / built in
+
+# Owned
+from queryAPIBenchmarks.common import ClientOptions, LoadProfile, ParameterSource, TransactionShape
+
+
+# Batch sizes swept when none are given
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+
+
+class BatchSweep:
+    """
+    Finds the batch size that loads data fastest.  Runs a benchmark test once for each batch size, sending
+    that many rows with every statement as the rows parameter e.g UNWIND $rows AS row MERGE (p:Person {id: row.id}).
+    The fields of each row are made by a ParameterSource.
+
+    Works with any test, implicit or managed.  Each result has the batch size, rows per transaction and the
+    size of each request added to it, and its summary reports rows per second as well as requests per second
+    """
+
+    @staticmethod
+    def run(test, batch_sizes: tuple, number_tests: int, cypher: str, url: str, usr: str, pwd:str, db: str, t_out: int, workers:int = 0, http2: bool = False,
+            load_profile: LoadProfile = None, parameters: ParameterSource = None, tx_shape: TransactionShape = None, client_options: ClientOptions = None) -> list:
+        """
+         Runs the test at each batch size
+
+         :param test - the benchmark test class to run e.g BenchmarkThreadsSessionsImplicit
+         :param batch_sizes - the rows to send with each statement, one run for each
+         :param parameters - makes the fields of each row
+         :param tx_shape - ( optional ) the statements in each managed transaction.  Each statement has its own batch
+         :param client_options - ( optional ) how the client makes its requests and reads the responses
+         The remaining parameters are the same as for the test's run()
+         :return: list of the batch size and result of each run
+         """
+
+        # Statements in each transaction, each of them sending a batch
+        statements_per_tx = tx_shape.statements if tx_shape else 1
+
+        sweep = []
+
+        for batch_size in batch_sizes:
+            batch_parameters = parameters.for_batch(batch_size)
+
+            result = test.run(number_tests, cypher, url, usr, pwd, db, t_out, workers, http2, load_profile, batch_parameters, tx_shape, client_options)
+
+            result.batch = {"batch_size": batch_size,
+                            "rows_per_transaction": batch_size * statements_per_tx,
+                            "request_bytes": batch_parameters.request_size(cypher)}
+
+            sweep.append((batch_size, result))
+
+        return sweep
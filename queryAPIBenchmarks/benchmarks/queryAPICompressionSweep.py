@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Dev'
+
+# Generic / built in
+import time
+
+# Owned
+from queryAPIBenchmarks.common import CONTENT_ENCODINGS, ClientOptions, LatencyRecorder, ProgressBar, TXsession
+
+
+# Rows in the results swept when none are given
+ROWS = (1, 100, 10000, 100000)
+
+# Makes a result of $rows rows without needing any data
+ROWS_CYPHER = "UNWIND range(1, $rows) AS n RETURN n, 'row ' + toString(n) AS s"
+
+
+class CompressionSweep:
+    """
+    Finds whether compressing responses pays off.  For each result size, implicit transactions are sent one at a time
+    with a session asking for each of CONTENT_ENCODINGS in turn, identity being no compression.
+
+    Reported for each are the bytes downloaded, the bytes once decompressed, the client's CPU time and the end to
+    end latency of each transaction.  Compression saves time when the bandwidth saved is worth more than the
+    CPU time it costs both ends
+    """
+
+    @staticmethod
+    def run(number_tests: int, rows: int, url: str, usr: str, pwd:str, db: str, t_out: int, http2: bool = False,
+            cypher: str = ROWS_CYPHER, encodings: tuple = CONTENT_ENCODINGS, client_options: ClientOptions = None) -> list:
+        """
+         Sends number_tests transactions asking for a result of rows rows with each encoding
+
+         :param number_tests  - the number of transactions for each encoding
+         :param rows - the rows in each result, sent as $rows
+         :param url - the URL of the Neo4j Query API
+         :param usr - the user account to use
+         :param pwd  - the password of the user account
+         :param cypher - ( optional ) makes a result of $rows rows
+         :param encodings - ( optional ) the Accept-Encoding of each run, see CONTENT_ENCODINGS
+         :param client_options - ( optional ) how the client makes its requests, including any compression of them.
+                                 Responses are always read
+         :return: list with, for each encoding, the mean bytes downloaded and decoded, mean CPU seconds and a summary of the latency
+         """
+
+        sweep = []
+
+        for encoding in encodings:
+            # Responses have to be read for their size to be known
+            options = ClientOptions.from_dict((client_options.to_dict() if client_options else {}) |
+                                              {"accept_encoding": encoding, "skip_body": False})
+
+            tx_session = TXsession(url, usr, pwd, db, t_out, http2, options)
+
+            # Open the connection before timing anything
+            tx_session.tx_session_implicit(cypher, {"rows": rows})
+
+            tx_progress_bar = ProgressBar(f"{rows} rows {encoding}", number_tests)
+
+            latency = LatencyRecorder()
+            response_bytes = 0
+            wire_bytes = 0
+
+            # CPU time of this process only.  Neo4j, or the mock, is not counted
+            cpu_start = time.process_time()
+
+            for _ in range(number_tests):
+                tx_start = time.perf_counter()
+                tx_session.tx_session_implicit(cypher, {"rows": rows})
+                latency.record(tx_start, time.perf_counter() - tx_start)
+
+                size, downloaded, _ = tx_session.last_response
+                response_bytes += size
+                wire_bytes += downloaded
+
+                tx_progress_bar.add_progress_entry()
+
+            cpu_time = time.process_time() - cpu_start
+
+            del tx_progress_bar
+            del tx_session
+
+            number = max(number_tests, 1)
+
+            sweep.append({"rows": rows, "encoding": encoding,
+                          "response_bytes": response_bytes / number, "wire_bytes": wire_bytes / number,
+                          "cpu": cpu_time / number, "latency": latency.summary()})
+
+        return sweep
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Dev'
+
+# Generic / built in
+
+# Owned
+from queryAPIBenchmarks.common import BenchmarkResult, ClientOptions, LoadProfile, ParameterSource, TransactionShape
+
+
+class ConcurrencySearch:
+    """
+    Finds the number of workers, or the open loop rate, that gives the most transactions per second
+    while the p99 latency and the share of transactions that fail stay inside bounds.  Does this by running a benchmark test repeatedly for a
+    short, timed trial, doubling the workers or rate until throughput stops rising or latency goes over
+    a bound, then narrowing in on the best value with a binary search.
+
+    Works with any test that uses the workers setting e.g ThreadsSessions or ThreadsSessionsImplicit
+    """
+
+    # A trial must improve throughput by at least this much to count as still rising
+    MIN_GAIN = 0.05
+
+    # An open loop trial must achieve at least this much of its target rate to count as keeping up
+    MIN_RATE_ACHIEVED = 0.95
+
+    # The most of a trial's transactions, 0 to 1, that may fail for it to be inside the bound
+    ERROR_BOUND = 0.01
+
+    @staticmethod
+    def _trial(test, level, search_by: str, latency_bound: float, trial_time: float, trials: list,
+               number_tests: int, cypher: str, url: str, usr: str, pwd:str, db: str, t_out: int, workers: int, http2: bool, parameters: ParameterSource, tx_shape: TransactionShape, client_options: ClientOptions,
+               error_bound: float) -> dict:
+        """
+          PRIVATE
+
+          Runs one trial of the test at level workers or rate.  Adds it to trials and returns it
+        """
+
+        # A fifth of each trial is used to warm up so that new connections do not count against it
+        if search_by == "rate":
+            load_profile = LoadProfile(rate=level, duration=trial_time, warm_up=trial_time / 5)
+            trial_workers = workers
+        else:
+            load_profile = LoadProfile(duration=trial_time, warm_up=trial_time / 5)
+            trial_workers = level
+
+        result: BenchmarkResult = test.run(number_tests, cypher, url, usr, pwd, db, t_out, trial_workers, http2, load_profile, parameters, tx_shape, client_options)
+        summary = result.summary()
+
+        trial = {"trial": len(trials) + 1,
+                 "workers": trial_workers,
+                 "rate": level if search_by == "rate" else 0.0,
+                 "requests_per_second": summary["requests_per_second"],
+                 "p99": summary["latency"]["p99"],
+                 "error_rate": summary.get("errors", {}).get("error_rate", 0.0),
+                 "result": result}
+
+        # Inside the bound if p99 is low enough, few enough transactions failed and, when open loop, we kept up with the rate.
+        # Only transactions that succeeded count towards the throughput so failing fast does not look like a gain.
+        # A trial stopped early with Ctrl-C did not run for long enough to count
+        trial["within_bound"] = trial["p99"] <= latency_bound and trial["error_rate"] <= error_bound and not result.cancelled
+        if search_by == "rate":
+            trial["within_bound"] = trial["within_bound"] and trial["requests_per_second"] >= level * ConcurrencySearch.MIN_RATE_ACHIEVED
+
+        trials.append(trial)
+
+        return trial
+
+
+    @staticmethod
+    def run(test, search_by: str, latency_bound: float, trial_time: float, max_trials: int,
+            number_tests: int, cypher: str, url: str, usr: str, pwd:str, db: str, t_out: int, workers:int = 1, http2: bool = False, rate: float = 0.0, parameters: ParameterSource = None, tx_shape: TransactionShape = None, client_options: ClientOptions = None,
+            error_bound: float = ERROR_BOUND):
+        """
+         Searches for the workers or rate that give the most transactions per second with p99 latency inside latency_bound
+         and no more than error_bound of the transactions failing
+
+         :param test - the benchmark test class to search with e.g BenchmarkThreadsSessions
+         :param search_by - workers to tune the number of workers in a closed loop test or rate to tune the rate of an open loop test
+         :param latency_bound - the highest p99 latency allowed, in seconds
+         :param trial_time - how long to run each trial for, in seconds
+         :param max_trials - the most trials to run
+         :param workers - the workers to start from.  When searching by rate, the workers used for every trial
+         :param rate - ( optional ) the rate to start from when searching by rate
+         :param parameters - ( optional ) makes the parameters sent with each cypher statement
+         :param tx_shape - ( optional ) the statements in each managed transaction and how often it is reused
+         :param client_options - ( optional ) how the client makes its requests and reads the responses
+         :param error_bound - ( optional ) the most of a trial's transactions, 0 to 1, that may fail.  See ERROR_BOUND
+         The remaining parameters are the same as for the test's run()
+         :return: tuple of the best trial, or None if no trial was inside the bound, and a list of every trial
+         """
+
+        trials = []
+        best = None
+
+        def trial_at(level):
+            return ConcurrencySearch._trial(test, level, search_by, latency_bound, trial_time, trials,
+                                            number_tests, cypher, url, usr, pwd, db, t_out, workers, http2, parameters, tx_shape, client_options, error_bound)
+
+        def searching():
+            # Stop at the most trials or once a trial has been stopped early with Ctrl-C
+            return len(trials) < max_trials and not trials[-1]["result"].cancelled
+
+        def next_level(low, high):
+            # Workers are whole numbers, rates need not be
+            return (low + high) // 2 if search_by == "workers" else (low + high) / 2
+
+        # Where we start from
+        level = max(workers, 1) if search_by == "workers" else max(rate, 1.0)
+
+        # Levels known to be good and known to be too much.  Search happens between them
+        good_level = None
+        bad_level = None
+
+        # If the starting point is already outside the bound, halve until we find one that is not
+        trial = trial_at(level)
+        while not trial["within_bound"] and searching() and level > 1:
+            bad_level = level
+            level = max(level // 2 if search_by == "workers" else level / 2, 1)
+            trial = trial_at(level)
+
+        if not trial["within_bound"]:
+            return None, trials
+
+        best = trial
+        good_level = level
+
+        # Keep doubling until throughput stops rising or we go outside the bound
+        while bad_level is None and searching():
+            level = good_level * 2
+            trial = trial_at(level)
+
+            if trial["within_bound"] and trial["requests_per_second"] > best["requests_per_second"] * (1 + ConcurrencySearch.MIN_GAIN):
+                best = trial
+                good_level = level
+            else:
+                bad_level = level
+
+        # Narrow in on the best level between the last good one and the first that was not.
+        # Stop once they are within 10% of each other as the difference is then lost in the noise
+        while bad_level is not None and searching() and bad_level - good_level > max(1, good_level * 0.1):
+            level = next_level(good_level, bad_level)
+            trial = trial_at(level)
+
+            if trial["within_bound"] and trial["requests_per_second"] > best["requests_per_second"]:
+                best = trial
+                good_level = level
+            else:
+                bad_level = level
+
+        return best, trials
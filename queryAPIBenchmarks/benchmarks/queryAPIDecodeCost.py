@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Dev'
+
+# Generic / built in
+import json
+import time
+
+# Owned
+from queryAPIBenchmarks.common import ResponseSkimmer
+from queryAPIBenchmarks.common.requestEncoder import orjson
+
+
+# Rows in the results measured when none are given
+ROWS = (1, 10, 100, 1000, 10000, 100000)
+
+# Size of the chunks a response is skimmed in.  About what httpx reads from a connection at a time
+CHUNK_SIZE = 65536
+
+
+class DecodeCost:
+    """
+    Measures how long the client takes to read a Query API response of each size, without Neo4j or the network,
+    so that it can be seen when a benchmark with a large result is measuring the client's JSON decoding
+    rather than Neo4j.
+
+    Each response is decoded with json, with orjson when it is installed, and skimmed as --skip-body does
+    """
+
+    @staticmethod
+    def _response(rows: int, row_size: int) -> bytes:
+        """
+          PRIVATE
+
+          A response with rows rows, each with a string of row_size bytes, as the mock Query API sends
+        """
+        result_data = {"fields": ["n", "value"], "values": [[n, "x" * row_size] for n in range(rows)]}
+
+        return json.dumps({"data": result_data, "bookmarks": ["FB:kcwQx2ZK"]}).encode()
+
+
+    @staticmethod
+    def _skim(content: bytes) -> dict:
+        """
+          PRIVATE
+
+          Reads content a chunk at a time as a streamed response is read with --skip-body
+        """
+        skimmer = ResponseSkimmer(200)
+
+        for offset in range(0, len(content), CHUNK_SIZE):
+            skimmer.feed(content[offset:offset + CHUNK_SIZE])
+
+        return skimmer.result()
+
+
+    @staticmethod
+    def _time(read, content: bytes, repeats: int) -> float:
+        """
+          PRIVATE
+
+          Mean seconds read takes with content
+        """
+        start = time.perf_counter()
+
+        for _ in range(repeats):
+            read(content)
+
+        return (time.perf_counter() - start) / repeats
+
+
+    @staticmethod
+    def run(rows: tuple = ROWS, row_size: int = 8, repeats: int = 20) -> list:
+        """
+         Times reading a response with each number of rows
+
+         :param rows - the rows in each response measured
+         :param row_size - bytes in the string value of each row
+         :param repeats - times each response is read.  The mean is reported
+         :return: list with, for each response, its rows and size in bytes and the mean seconds each way of reading it took
+         """
+
+        readers = {"json": json.loads}
+
+        if orjson:
+            readers["orjson"] = orjson.loads
+
+        readers["skip body"] = DecodeCost._skim
+
+        costs = []
+
+        for response_rows in rows:
+            content = DecodeCost._response(response_rows, row_size)
+
+            costs.append({"rows": response_rows,
+                          "response_bytes": len(content),
+                          "seconds": {name: DecodeCost._time(read, content, repeats) for name, read in readers.items()}})
+
+        return costs
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Dev'
+
+# Generic / built in
+import concurrent.futures
+import socket
+import time
+
+# Owned
+from queryAPIBenchmarks.common import ClientOptions, HistogramResult, LoadProfile, ParameterSource, Profiler, ProgressBar, Scenario, TransactionShape, WorkerAgentError, parse_address, receive_message, send_message
+
+
+class Distributed:
+    """
+    Coordinates a benchmark test run by worker agents on other machines, see queryAPIWorker.py, so that the
+    load is not limited by what one machine's CPU and network can do.  Each worker runs the test with its
+    share of the transactions and rate, all starting at the same moment, and sends back LatencyHistograms
+    which are merged into one HistogramResult.  An instance has the same run() as a benchmark test so can
+    be used wherever a test is, including with ConcurrencySearch
+
+    When an agent fails, or Ctrl-C is pressed, the others are asked to stop and what they recorded until then
+    is still merged.  A failure raises WorkerAgentError with that result
+    """
+
+    # Seconds to wait when connecting to a worker
+    CONNECT_TIMEOUT = 10
+
+    # Seconds from sending the test to the workers to them starting it.  Long enough for every worker to have it
+    START_DELAY = 2.0
+
+    def __init__(self, test_name: str, worker_addresses: list, processes: int = 1, token: str = ""):
+        """
+        :param test_name - the name of the test to run e.g ThreadsSessions
+        :param worker_addresses - host:port of each worker agent
+        :param processes - the number of processes each worker runs the test in
+        :param token - ( optional ) the token every worker agent was started with
+        """
+        self._test_name = test_name
+        self._worker_addresses = worker_addresses
+        self._processes = processes
+        self._token = token or ""
+
+
+    @staticmethod
+    def _connect(address: str, token: str):
+        """
+          PRIVATE
+
+          Connects to a worker, giving it our token, and finds how far its clock is from ours
+
+          :return: the socket, a stream for messages and the offset of the worker's clock in seconds.
+                   WorkerAgentError is raised when the worker cannot be reached or refuses us
+        """
+
+        try:
+            worker_socket = socket.create_connection(parse_address(address), timeout=Distributed.CONNECT_TIMEOUT)
+        except OSError as e:
+            raise WorkerAgentError(f"Could not connect to worker agent at {address}: {e}")
+
+        # Tests can run for a long time without a message so only the connection has a timeout
+        worker_socket.settimeout(None)
+        stream = worker_socket.makefile("rwb")
+
+        # The worker's clock is taken to be read half way through the round trip
+        asked = time.time()
+        send_message(stream, "time", token=token)
+
+        try:
+            message = receive_message(stream)
+        except ConnectionError:
+            message = {"type": "error", "message": "Connection closed"}
+
+        if message["type"] != "time":
+            worker_socket.close()
+            raise WorkerAgentError(f"Worker agent at {address} refused the connection: {message.get('message')}")
+
+        offset = message["time"] - (asked + time.time()) / 2
+
+        return worker_socket, stream, offset
+
+
+    @staticmethod
+    def _collect(address: str, stream, tx_progress_bar: ProgressBar) -> dict:
+        """
+          PRIVATE
+
+          Shows the progress of a worker until it sends its result
+
+          :return: the report from BenchmarkResult.histograms(), or None when the worker stopped without one.
+                   WorkerAgentError is raised when the worker fails or goes away
+        """
+
+        shown = 0
+
+        while True:
+            try:
+                message = receive_message(stream)
+            except (ConnectionError, OSError, ValueError) as e:
+                raise WorkerAgentError(f"Lost the connection to worker agent at {address}: {e}")
+
+            if message["type"] == "progress":
+                tx_progress_bar.add_progress_entry(message["done"] - shown)
+                shown = message["done"]
+
+            elif message["type"] == "result":
+                return message["report"]
+
+            elif message["type"] == "stopped":
+                return None
+
+            else:
+                raise WorkerAgentError(f"Worker agent at {address} failed: {message.get('message')}")
+
+
+    @staticmethod
+    def _stop(streams: list):
+        """
+          PRIVATE
+
+          Asks workers to stop the test they are running.  Each sends what it recorded until then, or that it stopped
+        """
+
+        for stream in streams:
+            try:
+                send_message(stream, "stop")
+            except OSError:
+                # Gone already, which _collect() reports
+                pass
+
+
+    def run(self, number_tests: int, cypher: str, url: str, usr: str, pwd:str, db: str, t_out: int, workers:int = 0, http2: bool = False, load_profile: LoadProfile = None, parameters: ParameterSource = None, tx_shape: TransactionShape = None, client_options: ClientOptions = None):
+        """
+         Runs the test on every worker agent, sharing number_tests between them, and merges the results
+
+         :param number_tests  - the number of times to execute the test, across all of the workers
+         :param cypher - the cypher statement to run, or the Scenario of a scenario test
+         :param url - the URL of the Neo4j Query API.  Must be reachable from every worker
+         :param usr - not sent.  Each worker agent uses the NEO4J_USERNAME it was started with
+         :param pwd  - not sent.  Each worker agent uses the NEO4J_PASSWORD it was started with
+         :param workers - the workers in each process on each worker agent
+         :param load_profile - ( optional ) when to send each transaction.  The rate is shared between the worker agents
+         :param parameters - ( optional ) makes the parameters sent with each cypher statement.  Each worker agent gets its own share
+         :param tx_shape - ( optional ) the statements in each managed transaction and how often it is reused
+         :param client_options - ( optional ) how the client makes its requests and reads the responses
+         :return: HistogramResult of all of the worker agents
+         """
+
+        # Closed loop unless told otherwise
+        if load_profile is None:
+            load_profile = LoadProfile()
+
+        agents = len(self._worker_addresses)
+        connections = []
+
+        try:
+            for address in self._worker_addresses:
+                connections.append(Distributed._connect(address, self._token))
+        except WorkerAgentError:
+            # Nothing has been sent to those connected so far
+            for worker_socket, stream, _ in connections:
+                stream.close()
+                worker_socket.close()
+            raise
+
+        # Every worker starts at the same moment, given in the worker's own clock
+        start_at = time.time() + Distributed.START_DELAY
+
+        for agent, (_, stream, offset) in enumerate(connections):
+            # Share the transactions as evenly as possible
+            agent_tests = number_tests // agents + (1 if agent < number_tests % agents else 0)
+
+            # A scenario is sent on its own and rebuilt by the worker, with its own share of the picks
+            scenario = cypher.for_process(agent, agents).to_dict() if isinstance(cypher, Scenario) else None
+
+            # Credentials are never sent over the connection, which is not encrypted
+            send_message(stream, "run", test=self._test_name, start_at=start_at + offset, processes=self._processes,
+                         args=[agent_tests, None if scenario else cypher, url, None, None, db, t_out, workers, http2],
+                         load_profile=vars(load_profile.for_process(agents)),
+                         parameters=parameters.for_process(agent, agents).to_dict() if parameters else None,
+                         scenario=scenario,
+                         tx_shape=vars(tx_shape) if tx_shape else None,
+                         client_options=client_options.to_dict() if client_options else None,
+                         profile=Profiler.settings())
+
+        # Progress of all of the workers
+        tx_progress_bar = ProgressBar(f"{self._test_name} x {agents} workers", load_profile.expected_tests(number_tests))
+
+        reports = []
+        failures = []
+        stopped = False
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=agents) as executor:
+            futures = {executor.submit(Distributed._collect, address, stream, tx_progress_bar): stream
+                       for address, (_, stream, _) in zip(self._worker_addresses, connections)}
+            not_done = set(futures)
+
+            while not_done:
+                try:
+                    done, not_done = concurrent.futures.wait(not_done, return_when=concurrent.futures.FIRST_COMPLETED)
+
+                # Stop every worker and wait for what they recorded.  Pressing Ctrl-C again stops at once
+                except KeyboardInterrupt:
+                    if stopped:
+                        raise
+
+                    print("\nStopping.  Waiting for the worker agents to stop, press Ctrl-C again to stop at once")
+                    stopped = True
+                    Distributed._stop([futures[future] for future in not_done])
+                    continue
+
+                for future in done:
+                    try:
+                        report = future.result()
+                    except WorkerAgentError as e:
+                        failures.append(str(e))
+
+                        # Stop the others rather than leave them running a test that can no longer be reported
+                        if not stopped:
+                            stopped = True
+                            Distributed._stop([futures[future] for future in not_done])
+                        continue
+
+                    if report is not None:
+                        reports.append(report)
+
+        # Destroy progress bar object
+        del tx_progress_bar
+
+        for worker_socket, stream, _ in connections:
+            stream.close()
+            worker_socket.close()
+
+        result = HistogramResult(load_profile.expected_tests(number_tests), load_profile.rate)
+
+        for report in reports:
+            result.merge(report)
+
+        result.cancelled = result.cancelled or stopped
+
+        if failures:
+            raise WorkerAgentError(".  ".join(failures), result if reports else None)
+
+        return result
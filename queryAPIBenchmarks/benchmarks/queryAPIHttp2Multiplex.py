@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Dev'
+
+# Generic / built in
+import asyncio
+import time
+
+# Owned
+from queryAPIBenchmarks.common import ClientOptions, LatencyRecorder, ProgressBar, RequestTracer, TXasyncSession
+
+
+# Connections, and concurrent streams on each of them, swept when none are given
+CONNECTIONS = (1, 2, 4)
+STREAMS = (1, 4, 16, 64)
+
+# The protocols compared for each number of connections and streams
+PROTOCOLS = ("HTTP/2", "HTTP/1.1")
+
+
+class _StreamCounter(RequestTracer):
+    """
+    PRIVATE
+
+    A RequestTracer that also counts the requests on the wire.  A request is on the wire from the first
+    trace event, once it has a connection, until its response is closed.  Every client of a trial shares
+    one so that the most streams in flight across all of the connections is known
+    """
+
+    def __init__(self, recorders: dict):
+        super().__init__(recorders)
+        self.streams = 0
+        self.peak_streams = 0
+
+
+    def trace(self):
+        record_wait = super().trace()
+        on_wire = []
+
+        def on_event(event_name: str, info: dict):
+            # Still waiting for the pool
+            if event_name == RequestTracer.POOL_EVENT:
+                pass
+            elif not on_wire:
+                on_wire.append(True)
+                self.streams += 1
+                self.peak_streams = max(self.peak_streams, self.streams)
+            elif event_name.endswith("response_closed.complete"):
+                self.streams -= 1
+
+            record_wait(event_name, info)
+
+        return on_event
+
+
+class Http2Multiplex:
+    """
+    Finds what HTTP/2 multiplexing gives over HTTP/1.1.  For each number of connections and of concurrent
+    streams on each of them, implicit transactions are sent with that many requests in flight:
+
+        HTTP/2 - one async client per connection, each held to a single connection, with streams workers
+                 sharing it.  The requests of a client are multiplexed over its one connection
+        HTTP/1.1 - one async client with a pool of connections x streams connections, one for each worker,
+                   so the same number of requests are in flight, each with a connection to itself
+
+    Reported for each are the throughput, the latency, whose tail shows requests on a busy connection being held up
+    behind others ( head of line blocking ), how long requests waited for a connection and the most streams seen on
+    the wire.  HTTP/2 is agreed with the server during the TLS handshake so needs an https URL.  When the server
+    does not agree, the protocol column shows HTTP/1.1 and each client's requests take turns on its one connection
+    """
+
+    @staticmethod
+    async def _worker(tx_session: TXasyncSession, cypher: str, tx_runs, latency: LatencyRecorder, tx_progress_bar: ProgressBar):
+        """
+          PRIVATE
+
+          Keeps taking test runs from the iterator shared by every worker until there are none left.
+          Every worker runs on the same event loop so the iterator does not need a lock
+        """
+        for _ in tx_runs:
+            tx_start = time.perf_counter()
+            await tx_session.tx_async_implicit(cypher)
+            latency.record(tx_start, time.perf_counter() - tx_start)
+
+            tx_progress_bar.add_progress_entry()
+
+
+    @staticmethod
+    async def _trial(number_tests: int, cypher: str, url: str, usr: str, pwd:str, db: str, t_out: int, protocol: str,
+                     connections: int, streams: int, client_options: ClientOptions) -> dict:
+        """
+          PRIVATE
+
+          Sends number_tests transactions with connections x streams of them in flight over the protocol given
+        """
+
+        # The connections are pinned by the trial so any pool limits in the client options are left out
+        options = ClientOptions.from_dict((client_options.to_dict() if client_options else {}) | {"max_connections": 0, "max_keepalive": 0})
+
+        if protocol == "HTTP/2":
+            tx_sessions = [TXasyncSession(url, usr, pwd, db, t_out, True, 1, options) for _ in range(connections)]
+            workers = [tx_session for tx_session in tx_sessions for _ in range(streams)]
+        else:
+            tx_sessions = [TXasyncSession(url, usr, pwd, db, t_out, False, connections * streams, options)]
+            workers = tx_sessions * (connections * streams)
+
+        # Open the connections, and for HTTP/2 agree it with the server, before timing anything
+        await asyncio.gather(*[tx_session.tx_async_implicit(cypher) for tx_session in workers])
+
+        http = {}
+        stream_counter = _StreamCounter(http)
+
+        for tx_session in tx_sessions:
+            tx_session.tracer = stream_counter
+
+        tx_progress_bar = ProgressBar(f"{protocol} {connections}x{streams}", number_tests)
+
+        latency = LatencyRecorder()
+        tx_runs = iter(range(number_tests))
+
+        run_start = time.perf_counter()
+        await asyncio.gather(*[Http2Multiplex._worker(tx_session, cypher, tx_runs, latency, tx_progress_bar) for tx_session in workers])
+        run_time = time.perf_counter() - run_start
+
+        del tx_progress_bar
+
+        # The protocol the server agreed to, which is HTTP/1.1 when HTTP/2 was asked for but not agreed
+        http_version = tx_sessions[0].http_version
+
+        for tx_session in tx_sessions:
+            await tx_session.aclose()
+
+        open_connections = connections if protocol == "HTTP/2" else connections * streams
+
+        return {"protocol": protocol, "http_version": http_version, "connections": open_connections,
+                "streams": streams, "concurrency": connections * streams,
+                "requests_per_second": number_tests / run_time if run_time > 0 else 0.0,
+                "peak_streams": stream_counter.peak_streams,
+                "streams_per_connection": stream_counter.peak_streams / open_connections,
+                "latency": latency.summary(), "pool_wait": http["pool_wait"].summary()}
+
+
+    @staticmethod
+    def run(number_tests: int, cypher: str, url: str, usr: str, pwd:str, db: str, t_out: int, connections: tuple = CONNECTIONS,
+            streams: tuple = STREAMS, protocols: tuple = PROTOCOLS, client_options: ClientOptions = None) -> list:
+        """
+         Sends number_tests transactions for each number of connections, number of streams and protocol
+
+         :param number_tests  - the number of transactions for each trial
+         :param cypher - the cypher statement to run
+         :param url - the URL of the Neo4j Query API.  https for HTTP/2
+         :param usr - the user account to use
+         :param pwd  - the password of the user account
+         :param connections - ( optional ) the HTTP/2 connections of each trial, see CONNECTIONS
+         :param streams - ( optional ) the concurrent streams on each HTTP/2 connection, see STREAMS
+         :param protocols - ( optional ) the protocols to compare, see PROTOCOLS
+         :param client_options - ( optional ) how the clients make their requests.  Pool limits are set by each trial
+         :return: list with, for each trial, the throughput, latency, pool wait and most streams seen on the wire
+         """
+
+        sweep = []
+
+        for connection_count in connections:
+            for stream_count in streams:
+                for protocol in protocols:
+                    sweep.append(asyncio.run(Http2Multiplex._trial(number_tests, cypher, url, usr, pwd, db, t_out, protocol,
+                                                                   connection_count, stream_count, client_options)))
+
+        return sweep
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Dev'
+
+# Generic / built in
+import concurrent.futures
+import multiprocessing
+import threading
+import time
+
+# Owned
+from queryAPIBenchmarks.common import BenchmarkResult, ClientOptions, LoadProfile, ParameterSource, ProcessStartError, Profiler, ProgressBar, Scenario, TransactionShape
+
+
+# Seconds to wait for every worker process to be ready before giving up
+READY_TIMEOUT = 60
+
+# How often, in seconds, the worker processes are checked while they start
+READY_CHECK_EVERY = 0.1
+
+
+def _init_process(counter, ready, started, profile: dict):
+    # Runs once in each worker process.  Progress goes to the parent instead of a progress bar per process
+    # and tests are profiled as they would have been in the parent
+    ProgressBar.share(counter)
+    Profiler.enable(**profile)
+    MultiProcess._ready = ready
+    MultiProcess._started = started
+
+
+def _terminate(executor: concurrent.futures.ProcessPoolExecutor):
+    # Ends every worker process at once, rather than waiting for those still starting.
+    # terminate_workers() is only there from Python 3.14
+    if hasattr(executor, "terminate_workers"):
+        executor.terminate_workers()
+        return
+
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+class MultiProcess:
+    """
+    Runs a benchmark test in a number of worker processes at the same time so that the load is not
+    limited to what one core can do under the GIL.  Each process has its own TXsession or client,
+    its own workers and its share of the transactions or rate.
+
+    Processes wait for each other before starting.  If one has not started within READY_TIMEOUT seconds, or failed
+    to, every process is stopped and ProcessStartError raised.  When finished, each sends its latencies back as
+    raw bytes which are merged into one BenchmarkResult.  An instance has the same run() as a benchmark
+    test so can be used wherever a test is, including with ConcurrencySearch
+    """
+
+    # Set in worker processes by _init_process()
+    _ready = None
+    _started = None
+
+    def __init__(self, test, processes: int):
+        """
+        :param test - the benchmark test to run e.g BenchmarkThreadsSessions
+        :param processes - the number of processes to run it in
+        """
+        self._test = test
+        self._processes = processes
+
+
+    @staticmethod
+    def _run_process(test, process: int, number_tests: int, cypher: str, url: str, usr: str, pwd:str, db: str, t_out: int, workers: int, http2: bool, load_profile: LoadProfile, parameters: ParameterSource, tx_shape: TransactionShape, client_options: ClientOptions) -> dict:
+        """
+          PRIVATE
+
+          Runs in a worker process.  Waits for the other processes then runs the test
+          and returns its result from BenchmarkResult.pack()
+        """
+
+        # Let the parent know which processes got as far as starting
+        MultiProcess._started[process] = 1
+        MultiProcess._ready.wait(READY_TIMEOUT)
+
+        result: BenchmarkResult = test.run(number_tests, cypher, url, usr, pwd, db, t_out, workers, http2, load_profile, parameters, tx_shape, client_options)
+
+        return result.pack()
+
+
+    @staticmethod
+    def _not_ready(executor: concurrent.futures.ProcessPoolExecutor, futures: list, started):
+        """
+          PRIVATE
+
+          Stops every process when one of them was not ready in time and raises ProcessStartError saying which
+        """
+
+        processes = len(futures)
+        not_started = [str(process + 1) for process in range(processes) if not started[process]]
+
+        # A process that exits while starting, e.g as its imports fail, breaks the pool and fails every future
+        broken = any(future.done() and isinstance(future.exception(), concurrent.futures.BrokenExecutor) for future in futures)
+
+        _terminate(executor)
+
+        if not_started:
+            why = "a worker process exited while starting" if broken else f"not ready within {READY_TIMEOUT} seconds"
+            raise ProcessStartError(f"Process {', '.join(not_started)} of {processes} did not start: {why}")
+
+        raise ProcessStartError(f"The {processes} processes did not start together within {READY_TIMEOUT} seconds")
+
+
+    def run(self, number_tests: int, cypher: str, url: str, usr: str, pwd:str, db: str, t_out: int, workers:int = 0, http2: bool = False, load_profile: LoadProfile = None, parameters: ParameterSource = None, tx_shape: TransactionShape = None, client_options: ClientOptions = None):
+        """
+         Runs the test in each process, sharing number_tests between them, and merges the results
+
+         :param number_tests  - the number of times to execute the test, across all of the processes
+         :param cypher - the cypher statement to run, or the Scenario of a scenario test.  Each process picks from a scenario with its own seed
+         :param url - the URL of the Neo4j Query API
+         :param usr - the user account to use
+         :param pwd  - the password of the user account
+         :param workers - the workers in each process
+         :param load_profile - ( optional ) when to send each transaction.  The rate is shared between the processes
+         :param parameters - ( optional ) makes the parameters sent with each cypher statement.  Each process gets its own share
+         :param tx_shape - ( optional ) the statements in each managed transaction and how often it is reused
+         :param client_options - ( optional ) how the client makes its requests and reads the responses
+         :return: BenchmarkResult of all of the processes
+         """
+
+        # Closed loop unless told otherwise
+        if load_profile is None:
+            load_profile = LoadProfile()
+
+        processes = self._processes
+        process_profile = load_profile.for_process(processes)
+
+        # Spawn rather than fork so that worker processes do not inherit the threads of this one
+        context = multiprocessing.get_context("spawn")
+        counter = context.Value("q", 0)
+        ready = context.Barrier(processes + 1)
+        started = context.Array("b", processes)
+
+        # Progress of all of the processes
+        tx_progress_bar = ProgressBar(f"{self._test.__name__} x {processes} processes", load_profile.expected_tests(number_tests))
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes, mp_context=context,
+                                                    initializer=_init_process, initargs=(counter, ready, started, Profiler.settings())) as executor:
+
+            # Share the transactions as evenly as possible
+            futures = [executor.submit(MultiProcess._run_process, self._test, process,
+                                       number_tests // processes + (1 if process < number_tests % processes else 0),
+                                       cypher.for_process(process, processes) if isinstance(cypher, Scenario) else cypher,
+                                       url, usr, pwd, db, t_out, workers, http2, process_profile,
+                                       parameters.for_process(process, processes) if parameters else None, tx_shape, client_options)
+                       for process in range(processes)]
+
+            # Wait for every process to start, giving up early when one cannot
+            give_up_at = time.monotonic() + READY_TIMEOUT
+
+            while not all(started) and not any(future.done() for future in futures) and time.monotonic() < give_up_at:
+                time.sleep(READY_CHECK_EVERY)
+
+            # Start every process at the same time
+            try:
+                if not all(started):
+                    ready.abort()
+
+                ready.wait(max(give_up_at - time.monotonic(), READY_CHECK_EVERY))
+            except threading.BrokenBarrierError:
+                MultiProcess._not_ready(executor, futures, started)
+
+            shown = 0
+            not_done = futures
+
+            while not_done:
+                _, not_done = concurrent.futures.wait(not_done, timeout=ProgressBar.SHARE_EVERY)
+
+                progress = counter.value
+                tx_progress_bar.add_progress_entry(progress - shown)
+                shown = progress
+
+            packed_results = [future.result() for future in futures]
+
+        # Destroy progress bar object
+        del tx_progress_bar
+
+        result = BenchmarkResult(load_profile.expected_tests(number_tests), tuple(packed_results[0]["phases"]), load_profile.rate,
+                                 tuple(packed_results[0]["classes"]))
+
+        for packed in packed_results:
+            result.merge(packed)
+
+        return result
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Dev'
+
+# Generic / built in
+import time
+
+# Owned
+from queryAPIBenchmarks.common import RESPONSE_FORMATS, ClientOptions, LatencyRecorder, ProgressBar, TXsession
+
+
+# Result shapes compared when none are given.  Both are made by Neo4j without needing any data
+RESULT_SHAPES = {"small": "RETURN 1 AS n",
+                 "large": "UNWIND range(1, 10000) AS n RETURN n, 'row ' + toString(n) AS s, n * 1.5 AS f"}
+
+
+class BenchmarkResponseFormats:
+    """
+    Compares the response formats of the Query API, plain JSON and typed JSON, for each of a number of result shapes.
+
+    For every shape and format, implicit transactions are sent one at a time with a session and the size of each
+    response, the time it took less the time spent decoding it, which is the server and the network, and the time
+    spent decoding it are recorded.  This shows the bandwidth and decoding cost of each format
+    """
+
+    @staticmethod
+    def run(number_tests: int, shapes: dict, url: str, usr: str, pwd:str, db: str, t_out: int, http2: bool = False,
+            formats: tuple = tuple(RESPONSE_FORMATS), client_options: ClientOptions = None) -> list:
+        """
+         Sends number_tests implicit transactions for each shape in each format
+
+         :param number_tests  - the number of transactions for each shape and format
+         :param shapes - the cypher statement of each result shape, by name
+         :param url - the URL of the Neo4j Query API
+         :param usr - the user account to use
+         :param pwd  - the password of the user account
+         :param formats - ( optional ) the response formats to compare, see RESPONSE_FORMATS
+         :param client_options - ( optional ) how the client makes its requests.  Bodies are always read
+         :return: list with, for each shape and format, the mean response size and a summary of the server and decode times
+         """
+
+        comparison = []
+
+        for shape, cypher in shapes.items():
+            for response_format in formats:
+                # Responses have to be decoded for the decoding to be timed
+                options = ClientOptions.from_dict((client_options.to_dict() if client_options else {}) |
+                                                  {"response_format": response_format, "skip_body": False})
+
+                tx_session = TXsession(url, usr, pwd, db, t_out, http2, options)
+
+                # Open the connection before timing anything
+                tx_session.tx_session_implicit(cypher)
+
+                tx_progress_bar = ProgressBar(f"{shape} {response_format}", number_tests)
+
+                server = LatencyRecorder()
+                decode = LatencyRecorder()
+                response_bytes = 0
+
+                for _ in range(number_tests):
+                    tx_start = time.perf_counter()
+                    tx_session.tx_session_implicit(cypher)
+                    tx_end = time.perf_counter()
+
+                    size, _, decode_seconds = tx_session.last_response
+
+                    server.record(tx_start, tx_end - tx_start - decode_seconds)
+                    decode.record(tx_start, decode_seconds)
+                    response_bytes += size
+
+                    tx_progress_bar.add_progress_entry()
+
+                del tx_progress_bar
+                del tx_session
+
+                comparison.append({"shape": shape, "cypher": cypher, "response_format": response_format,
+                                   "response_bytes": response_bytes / max(number_tests, 1),
+                                   "server": server.summary(), "decode": decode.summary()})
+
+        return comparison
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Dev'
+
+# Generic / built in
+import concurrent.futures
+import time
+from datetime import datetime, timedelta
+
+# Owned
+from queryAPIBenchmarks.common import APIException, BenchmarkResult, BoundedProducer, ClientOptions, LoadProfile, ParameterSource, Profiler, ProgressBar, RequestTracer, ResourceSampler, RetryPolicy, Scenario, SessionClients, TransactionShape
+
+
+class BenchmarkScenario:
+    """
+    Provides methods to benchmark Neo4j Query API performance with a weighted mix of transactions,
+    see Scenario, using threads and sessions.  Results are reported for the mix and for each class in it
+    """
+    @staticmethod
+    def _transaction(tx_session: SessionClients, statement_class, tx_parameters: dict):
+        """
+          PRIVATE
+
+          Sends the statements of one transaction of a class
+        """
+        if statement_class.transaction == "implicit":
+            tx_session.tx_session_implicit(statement_class.statements[0], tx_parameters, statement_class.access_mode)
+
+        else:
+            # Begin our transaction, run each of the statements in it and commit
+            tx_id, tx_cluster_affinity = tx_session.tx_session_id(statement_class.access_mode)
+
+            for tx_cypher in statement_class.statements:
+                tx_session.tx_session_cypher(tx_id, tx_cypher, tx_cluster_affinity, tx_parameters)
+
+            tx_session.tx_session_commit(tx_id, tx_cluster_affinity)
+
+
+    @staticmethod
+    def _TXScenario(tx_session: SessionClients, tx_transactions, result: BenchmarkResult, retry: RetryPolicy, intended: float = None):
+        """
+          PRIVATE
+
+          Executes the statements of the next transaction in the scenario. Uses Sessions
+
+          :param tx_session - the session shared by every thread
+          :param tx_transactions - iterator, shared by every thread, of the class and parameters of each transaction
+          :param result - where to record how long the transaction took, and for which class
+          :param retry - tries the transaction again on a transient error
+          :param intended - ( optional ) for open loop tests, when the transaction should have been sent
+          :return: - Nothing is returned
+        """
+
+        # Take this transaction's class and parameters before the clock starts
+        statement_class, tx_parameters = next(tx_transactions)
+
+        tx_start = time.perf_counter()
+
+        try:
+            _, retries = retry.run(BenchmarkScenario._transaction, tx_session, statement_class, tx_parameters)
+
+        except APIException as e:
+            # Record that it failed, and how long it took to
+            result.record_error(e, tx_start, time.perf_counter(), intended=intended)
+            return
+
+        # Record how long the transaction took, against its class as well
+        result.record_phases(tx_start, time.perf_counter(), intended=intended, statement_class=statement_class.name, retries=retries)
+
+        pass
+
+
+    @staticmethod
+    def run(number_tests: int, scenario: Scenario, url: str, usr: str, pwd:str, db: str, t_out: int, workers:int = 0, http2: bool = False, load_profile: LoadProfile = None, parameters: ParameterSource = None, tx_shape: TransactionShape = None, client_options: ClientOptions = None):
+        """
+         Sends number_tests transactions, each picked from the classes of a scenario by their weight, to the
+         Neo4j Query API at url using Threads. The total time is returned.
+
+         :param number_tests  - the number of transactions to send
+         :param scenario - the mix of transactions to send.  Takes the place of the cypher statement of other tests
+         :param url - the URL of the Neo4j Query API
+         :param usr - the user account to use
+         :param pwd  - the password of the user account
+         :param load_profile - ( optional ) when to send each transaction.  Closed loop when not given
+         :param parameters - not used.  Each class in the scenario has its own parameters
+         :param tx_shape - not used.  Each class in the scenario has its own statements
+         :param client_options - ( optional ) how the client makes its requests and reads the responses
+         :return: BenchmarkResult with the total time taken and the latency of each transaction and class
+         """
+
+        # Closed loop unless told otherwise
+        if load_profile is None:
+            load_profile = LoadProfile()
+
+        # We can use the same session across all of the threads, or a session per thread or a few in turn, as the client options ask
+        tx_session = SessionClients(url, usr, pwd, db, t_out, http2, client_options)
+
+        # Progress bar
+        tx_progress_bar = ProgressBar("TXScenario", load_profile.expected_tests(number_tests))
+
+        # Results of the test, including the latency of every transaction and of each class.
+        # Classes differ in how many requests they make so there is no phase breakdown.
+        # Open loop tests record how long each transaction waited to be sent
+        result = BenchmarkResult(load_profile.expected_tests(number_tests), load_profile.phases(), load_profile.rate, scenario.names)
+
+        # Time each part of every request, including how long it waits for a connection from the pool
+        tx_session.tracer = RequestTracer(result.http)
+
+        # Tries a transaction again on a transient error, when asked to
+        retry = (client_options or ClientOptions()).retry_policy()
+
+        # The class and parameters of each transaction.  Picked now so it does not slow the test down
+        tx_transactions = scenario.transactions(load_profile.expected_tests(number_tests))
+
+        # Starting time
+        start_time = datetime.now()
+        run_start = time.perf_counter()
+
+        # Transactions are submitted as they are due, keeping no more than a couple for
+        # each worker in flight so memory use stays flat however long the test runs
+        producer = BoundedProducer(load_profile, workers, tx_progress_bar)
+
+        # Sample the client itself while the test runs, to tell when it rather than Neo4j is the bottleneck
+        sampler = ResourceSampler(queue_depth=producer.in_flight).start()
+
+        # Profile just the timed part of the test, when asked to with --profile
+        profiler = Profiler().start()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=producer.max_workers) as executor:
+            producer.run(executor, number_tests, run_start, BenchmarkScenario._TXScenario, tx_session, tx_transactions, result, retry)
+            result.profile = profiler.stop()
+            result.resources.append(sampler.stop())
+
+        # Stopped early by Ctrl-C.  What was recorded until then is still reported
+        result.cancelled = producer.cancelled
+
+        # Destroy progress bar object
+        del tx_progress_bar
+
+        # Destroy the session object
+        del tx_session
+
+        end_time = datetime.now()
+        run_end = time.perf_counter()
+        total_time: timedelta = end_time - start_time
+
+        result.total_time = total_time.total_seconds()
+
+        # Leave out the warm up and cool down, and split a stepped test into its steps
+        result.set_window(*load_profile.measurement_window(run_start, run_end))
+        result.steps = load_profile.steps(run_start, run_end, workers)
+
+        return result
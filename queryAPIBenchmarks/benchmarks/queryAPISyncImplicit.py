@@ -10,10 +10,11 @@ __email__ = 'jon.giffard@neo4j.com'
 __status__ = 'Alpha'
 
 # Generic / built in
+import time
 from datetime import datetime, timedelta
 
 # Owned
-from queryAPIBenchmarks.common import ProgressBar, TXrequest
+from queryAPIBenchmarks.common import APIException, BenchmarkResult, ClientOptions, LoadProfile, ParameterSource, Profiler, ProgressBar, RequestTracer, ResourceSampler, TransactionShape, TXrequest
 
 
 class BenchmarkSyncImplicit:
@@ -21,7 +22,7 @@ class BenchmarkSyncImplicit:
     Class to run a benchmark by executing a Cypher statement multiple times using implicit transactions with the Neo4j Query API.
     """
     @staticmethod
-    def run(number_tests: int, cypher: str, url: str, usr: str, pwd:str, db: str, t_out: int, workers:int = 0, http2: bool = False  ):
+    def run(number_tests: int, cypher: str, url: str, usr: str, pwd:str, db: str, t_out: int, workers:int = 0, http2: bool = False, load_profile: LoadProfile = None, parameters: ParameterSource = None, tx_shape: TransactionShape = None, client_options: ClientOptions = None):
         """
          Repeats a cypher statement, neo4j_cyper, for the number of times set by num_tests to the Neo4j Query API
          at neo4j_url.  The total time is returned.
@@ -32,28 +33,71 @@ class BenchmarkSyncImplicit:
          :param usr - the user account to use
          :param pwd  - the password of the user account
          :param http2 - ( optional ) request to use http2 protocol.
-         :return: total time taken
+         :param load_profile - ( optional ) when to send each transaction.  Closed loop when not given
+         :param parameters - ( optional ) makes the parameters sent with each cypher statement
+         :param tx_shape - not used.  Implicit transactions always run one statement
+         :param client_options - ( optional ) how the client makes its requests and reads the responses
+         :return: BenchmarkResult with the total time taken and the latency of each transaction
          """
 
+        # Closed loop unless told otherwise
+        if load_profile is None:
+            load_profile = LoadProfile()
+
         # Progress bar
-        tx_progress_bar = ProgressBar("TXSync", number_tests)
+        tx_progress_bar = ProgressBar("TXSync", load_profile.expected_tests(number_tests))
 
         # Object to handle our requests
-        tx_request = TXrequest(url, usr, pwd, db, t_out)
+        tx_request = TXrequest(url, usr, pwd, db, t_out, client_options)
+
+        # Results of the test, including the latency of every transaction.
+        # Open loop tests also record how long each transaction waited to be sent
+        result = BenchmarkResult(load_profile.expected_tests(number_tests), load_profile.phases(), load_profile.rate)
+
+        # Time each part of every request, from opening its connection to reading the response
+        tx_request.tracer = RequestTracer(result.http)
+
+        # Tries a transaction again on a transient error, when asked to
+        retry = (client_options or ClientOptions()).retry_policy()
+
+        # The statement and parameters of each transaction.  Parameters are made now so it does not slow the test down
+        tx_statements = ParameterSource.statements(cypher, parameters, load_profile.expected_tests(number_tests))
 
         # Set the start time
         start_time = datetime.now()
+        run_start = time.perf_counter()
+
+        # Sample the client itself while the test runs, to tell when it rather than Neo4j is the bottleneck
+        sampler = ResourceSampler().start()
+
+        # Profile just the timed part of the test, when asked to with --profile
+        profiler = Profiler().start()
 
         tx_id: str = ""
         tx_affinity: str = ""
 
-        for _ in range(number_tests):
+        # When open loop, this waits until each transaction is due
+        for intended, (tx_cypher, tx_parameters) in zip(load_profile.schedule(number_tests, run_start), tx_statements):
+            tx_start = time.perf_counter()
+
             # Do the implicit transaction with the cypher statement
-            tx_request.tx_request_implicit(cypher)
+            try:
+                _, retries = retry.run(tx_request.tx_request_implicit, tx_cypher, tx_parameters)
+
+            except APIException as e:
+                # Record that it failed, and how long it took to
+                result.record_error(e, tx_start, time.perf_counter(), intended=intended)
+
+            else:
+                # Record how long the transaction took
+                result.record_phases(tx_start, time.perf_counter(), intended=intended, retries=retries)
 
             # Update progress bar
             tx_progress_bar.add_progress_entry()
 
+        result.profile = profiler.stop()
+        result.resources.append(sampler.stop())
+
         # Destroy progress bar object
         # Make sure to do this to avoid the console
         # output showing the progress bar more than once
@@ -66,9 +110,17 @@ class BenchmarkSyncImplicit:
 
         # Set the end time
         end_time = datetime.now()
+        run_end = time.perf_counter()
 
         # Work out how long the test took
         total_time: timedelta = end_time - start_time
 
 
-        return total_time.total_seconds()
+        result.total_time = total_time.total_seconds()
+
+        # Leave out the warm up and cool down, and split a stepped test into its steps.
+        # There is only ever the one worker so only the rate can step
+        result.set_window(*load_profile.measurement_window(run_start, run_end))
+        result.steps = load_profile.steps(run_start, run_end, 1, step_workers=False)
+
+        return result
@@ -11,15 +11,16 @@ __email__ = 'jon.giffard@neo4j.com'
 __status__ = 'Alpha'
 
 # Generic / built in
+import time
 from datetime import datetime, timedelta
 
 # Owned
-from queryAPIBenchmarks.common import ProgressBar, TXsession
+from queryAPIBenchmarks.common import MANAGED_TX_PHASES, APIException, BenchmarkResult, ClientOptions, LoadProfile, ManagedTransactions, ParameterSource, Profiler, ProgressBar, RequestTracer, ResourceSampler, TransactionShape, TXsession
 
 
 class BenchmarkSyncSessions():
     @staticmethod
-    def run(number_tests: int, cypher: str, url: str, usr: str, pwd:str, db, t_out: int, workers: int = 0, http2: bool = False):
+    def run(number_tests: int, cypher: str, url: str, usr: str, pwd:str, db, t_out: int, workers: int = 0, http2: bool = False, load_profile: LoadProfile = None, parameters: ParameterSource = None, tx_shape: TransactionShape = None, client_options: ClientOptions = None):
         """
          Repeats a cypher statement, neo4j_cyper, for the number of times set by num_tests to the Neo4j Query API
          at neo4j_url.  The total time is returned.
@@ -32,32 +33,76 @@ class BenchmarkSyncSessions():
          :param usr - the user account to use
          :param pwd  - the password of the user account
          :param http2 - request to use http2
-         :return: total time taken
+         :param load_profile - ( optional ) when to send each transaction.  Closed loop when not given
+         :param parameters - ( optional ) makes the parameters sent with each cypher statement
+         :param tx_shape - ( optional ) the statements in each transaction and how often it is reused.  One statement when not given
+         :param client_options - ( optional ) how the client makes its requests and reads the responses
+         :return: BenchmarkResult with the total time taken and the latency of each transaction
          """
 
+        # Closed loop unless told otherwise
+        if load_profile is None:
+            load_profile = LoadProfile()
+
         # Create an instance of TXSession as this triggers
         # the use of httpx client to allow us to re-use connections
-        tx_session = TXsession(url, usr, pwd, db, t_out, http2)
+        tx_session = TXsession(url, usr, pwd, db, t_out, http2, client_options)
 
         # Progress bar
-        tx_progress_bar = ProgressBar("TXSyncSessions", number_tests)
+        tx_progress_bar = ProgressBar("TXSyncSessions", load_profile.expected_tests(number_tests))
+
+        # Results of the test, including the latency of every transaction
+        # and of the begin, run and commit phases that make it up.
+        # Open loop tests also record how long each transaction waited to be sent
+        result = BenchmarkResult(load_profile.expected_tests(number_tests), load_profile.phases(MANAGED_TX_PHASES), load_profile.rate)
+
+        # Time each part of every request, including how long it waits for a connection from the pool
+        tx_session.tracer = RequestTracer(result.http)
+
+        # Tries a transaction again on a transient error, when asked to
+        retry = (client_options or ClientOptions()).retry_policy()
+
+        # Begins, reuses and commits transactions in the shape asked for
+        tx_managed = ManagedTransactions(result, tx_shape)
+
+        # The statement and parameters of every statement the test runs.  Parameters are made now so it does not slow the test down
+        tx_statements = ParameterSource.statements(cypher, parameters, tx_managed.tx_shape.expected_statements(load_profile.expected_tests(number_tests)))
 
         # Set the start time
         start_time = datetime.now()
+        run_start = time.perf_counter()
+
+        # Sample the client itself while the test runs, to tell when it rather than Neo4j is the bottleneck
+        sampler = ResourceSampler().start()
 
-        for _ in range(number_tests):
-            # Begin our transaction
-            tx_id, tx_cluster_affinity = tx_session.tx_session_id()
+        # Profile just the timed part of the test, when asked to with --profile
+        profiler = Profiler().start()
 
-            # In our transaction context, create a movie
-            tx_session.tx_session_cypher(tx_id, cypher, tx_cluster_affinity)
+        # When open loop, this waits until each transaction is due
+        for intended in load_profile.schedule(number_tests, run_start):
+            tx_cypher_statements = tx_managed.statements(tx_statements)
+
+            # Begin our transaction, run the cypher statements in it and commit it.  How long it and each of
+            # its phases took is recorded by tx_managed once the transaction it ran in has been committed
+            use = tx_managed.new_use(intended)
+
+            try:
+                retry.run(tx_managed.run, tx_cypher_statements, tx_session.tx_session_id, tx_session.tx_session_cypher, tx_session.tx_session_commit, use)
+
+            except APIException as e:
+                # Record that it failed, and how long it took to
+                result.record_error(e, use["first_attempt"], time.perf_counter(), intended=intended)
 
-            # Commit the transaction
-            tx_session.tx_session_commit(tx_id, tx_cluster_affinity)
 
             # Update progress bar
             tx_progress_bar.add_progress_entry()
 
+        result.profile = profiler.stop()
+        result.resources.append(sampler.stop())
+
+        # Commit any transactions kept open for reuse
+        tx_managed.commit_open(tx_session.tx_session_commit)
+
         # Destroy progress bar object
         # Make sure to do this to avoid the console
         # output showing the progress bar more than once
@@ -70,12 +115,20 @@ class BenchmarkSyncSessions():
 
         # Set the end time
         end_time = datetime.now()
+        run_end = time.perf_counter()
 
         # Work out how long the test took
         total_time: timedelta = end_time - start_time
 
 
-        return total_time.total_seconds()
+        result.total_time = total_time.total_seconds()
+
+        # Leave out the warm up and cool down, and split a stepped test into its steps.
+        # There is only ever the one worker so only the rate can step
+        result.set_window(*load_profile.measurement_window(run_start, run_end))
+        result.steps = load_profile.steps(run_start, run_end, 1, step_workers=False)
+
+        return result
 
 
 
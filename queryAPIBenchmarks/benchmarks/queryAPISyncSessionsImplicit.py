@@ -11,15 +11,16 @@ __email__ = 'jon.giffard@neo4j.com'
 __status__ = 'Alpha'
 
 # Generic / built in
+import time
 from datetime import datetime, timedelta
 
 # Owned
-from queryAPIBenchmarks.common import ProgressBar, TXsession
+from queryAPIBenchmarks.common import APIException, BenchmarkResult, ClientOptions, LoadProfile, ParameterSource, Profiler, ProgressBar, RequestTracer, ResourceSampler, TransactionShape, TXsession
 
 
 class BenchmarkSyncSessionsImplicit():
     @staticmethod
-    def run(number_tests: int, cypher: str, url: str, usr: str, pwd:str, db, t_out: int, workers:int = 0, http2: bool = False ):
+    def run(number_tests: int, cypher: str, url: str, usr: str, pwd:str, db, t_out: int, workers:int = 0, http2: bool = False, load_profile: LoadProfile = None, parameters: ParameterSource = None, tx_shape: TransactionShape = None, client_options: ClientOptions = None):
         """
          Repeats a cypher statement, neo4j_cyper, for the number of times set by num_tests to the Neo4j Query API
          at neo4j_url.  The total time is returned.
@@ -32,26 +33,68 @@ class BenchmarkSyncSessionsImplicit():
          :param usr - the user account to use
          :param pwd  - the password of the user account
          :param http2 - request to use http2
-         :return: total time taken
+         :param load_profile - ( optional ) when to send each transaction.  Closed loop when not given
+         :param parameters - ( optional ) makes the parameters sent with each cypher statement
+         :param tx_shape - not used.  Implicit transactions always run one statement
+         :param client_options - ( optional ) how the client makes its requests and reads the responses
+         :return: BenchmarkResult with the total time taken and the latency of each transaction
          """
 
+        # Closed loop unless told otherwise
+        if load_profile is None:
+            load_profile = LoadProfile()
+
         # Create an instance of TXSession as this triggers
         # the use of httpx client to allow us to re-use connections
-        tx_session = TXsession(url, usr, pwd, db, t_out)
+        tx_session = TXsession(url, usr, pwd, db, t_out, http2, client_options)
 
         # Progress bar
-        tx_progress_bar = ProgressBar("TXSyncSessions", number_tests)
+        tx_progress_bar = ProgressBar("TXSyncSessions", load_profile.expected_tests(number_tests))
+
+        # Results of the test, including the latency of every transaction.
+        # Open loop tests also record how long each transaction waited to be sent
+        result = BenchmarkResult(load_profile.expected_tests(number_tests), load_profile.phases(), load_profile.rate)
+
+        # Time each part of every request, including how long it waits for a connection from the pool
+        tx_session.tracer = RequestTracer(result.http)
+
+        # Tries a transaction again on a transient error, when asked to
+        retry = (client_options or ClientOptions()).retry_policy()
+
+        # The statement and parameters of each transaction.  Parameters are made now so it does not slow the test down
+        tx_statements = ParameterSource.statements(cypher, parameters, load_profile.expected_tests(number_tests))
 
         # Set the start time
         start_time = datetime.now()
+        run_start = time.perf_counter()
+
+        # Sample the client itself while the test runs, to tell when it rather than Neo4j is the bottleneck
+        sampler = ResourceSampler().start()
 
-        for _ in range(number_tests):
+        # Profile just the timed part of the test, when asked to with --profile
+        profiler = Profiler().start()
 
-            tx_session.tx_session_implicit(cypher)
+        # When open loop, this waits until each transaction is due
+        for intended, (tx_cypher, tx_parameters) in zip(load_profile.schedule(number_tests, run_start), tx_statements):
+            tx_start = time.perf_counter()
+
+            try:
+                _, retries = retry.run(tx_session.tx_session_implicit, tx_cypher, tx_parameters)
+
+            except APIException as e:
+                # Record that it failed, and how long it took to
+                result.record_error(e, tx_start, time.perf_counter(), intended=intended)
+
+            else:
+                # Record how long the transaction took
+                result.record_phases(tx_start, time.perf_counter(), intended=intended, retries=retries)
 
             # Update progress bar
             tx_progress_bar.add_progress_entry()
 
+        result.profile = profiler.stop()
+        result.resources.append(sampler.stop())
+
         # Destroy progress bar object
         # Make sure to do this to avoid the console
         # output showing the progress bar more than once
@@ -64,12 +107,20 @@ class BenchmarkSyncSessionsImplicit():
 
         # Set the end time
         end_time = datetime.now()
+        run_end = time.perf_counter()
 
         # Work out how long the test took
         total_time: timedelta = end_time - start_time
 
 
-        return total_time.total_seconds()
+        result.total_time = total_time.total_seconds()
+
+        # Leave out the warm up and cool down, and split a stepped test into its steps.
+        # There is only ever the one worker so only the rate can step
+        result.set_window(*load_profile.measurement_window(run_start, run_end))
+        result.steps = load_profile.steps(run_start, run_end, 1, step_workers=False)
+
+        return result
 
 
 
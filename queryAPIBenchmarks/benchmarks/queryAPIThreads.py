@@ -12,10 +12,11 @@ __status__ = 'Dev'
 
 # Generic/Built-in
 import concurrent.futures
+import time
 from datetime import datetime, timedelta
 
 # Owned
-from queryAPIBenchmarks.common import ProgressBar, TXrequest
+from queryAPIBenchmarks.common import MANAGED_TX_PHASES, APIException, BenchmarkResult, BoundedProducer, ClientOptions, LoadProfile, ManagedTransactions, ParameterSource, Profiler, ProgressBar, RequestTracer, ResourceSampler, RetryPolicy, TransactionShape, TXrequest
 
 
 class BenchmarkThreads:
@@ -23,33 +24,40 @@ class BenchmarkThreads:
     Provides methods to execute Cypher statements against the Neo4j Query API using threads for benchmarking.
     """
     @staticmethod
-    def _TXThreads(tx_request: TXrequest, cypher: str):
+    def _TXThreads(tx_request: TXrequest, tx_managed: ManagedTransactions, tx_statements, result: BenchmarkResult, retry: RetryPolicy, intended: float = None):
         """
         PRIVATE
 
         Executes the supplied Cypher statement in a managed TX
 
         :param tx_request - an instance of the TXRequest class
-        :param cypher - the cypher statement to run
+        :param tx_managed - begins, reuses and commits transactions in the shape asked for
+        :param tx_statements - iterator, shared by every thread, of the cypher statement and parameters of each statement
+        :param result - where to record how long the transaction and each of its phases took
+        :param retry - tries the transaction again on a transient error
+        :param intended - ( optional ) for open loop tests, when the transaction should have been sent
 
         :return: - Nothing is returned
         """
-        tx_id:str = ""
-        tx_cluster_affinity:str = ""
+        # Take this transaction's statements and parameters before the clock starts
+        tx_cypher_statements = tx_managed.statements(tx_statements)
 
-        tx_id, tx_cluster_affinity = tx_request.tx_request_id()
+        # Begin our transaction, run the cypher statements in it and commit it.  How long it and each of
+        # its phases took is recorded by tx_managed once the transaction it ran in has been committed
+        use = tx_managed.new_use(intended)
 
-        # In our transaction context, run the cypher statement
-        tx_request.tx_request_cypher(tx_id, cypher, tx_cluster_affinity)
+        try:
+            retry.run(tx_managed.run, tx_cypher_statements, tx_request.tx_request_id, tx_request.tx_request_cypher, tx_request.tx_request_commit, use)
 
-        # Commit the transaction
-        tx_request.tx_request_commit(tx_id, tx_cluster_affinity)
+        except APIException as e:
+            # Record that it failed, and how long it took to
+            result.record_error(e, use["first_attempt"], time.perf_counter(), intended=intended)
 
         pass
 
 
     @staticmethod
-    def run(number_tests: int, cypher: str, url: str, usr: str, pwd:str, db: str, t_out: int, workers:int = 0, http2: bool = False ):
+    def run(number_tests: int, cypher: str, url: str, usr: str, pwd:str, db: str, t_out: int, workers:int = 0, http2: bool = False, load_profile: LoadProfile = None, parameters: ParameterSource = None, tx_shape: TransactionShape = None, client_options: ClientOptions = None):
         """
          Repeats a cypher statement, neo4j_cyper, for the number of times set by num_tests to the Neo4j Query API
          at neo4j_url using Threads. The total time is returned.
@@ -59,32 +67,67 @@ class BenchmarkThreads:
          :param url - the URL of the Neo4j Query API
          :param usr - the user account to use
          :param pwd  - the password of the user account
-         :return: total time taken
+         :param load_profile - ( optional ) when to send each transaction.  Closed loop when not given
+         :param parameters - ( optional ) makes the parameters sent with each cypher statement
+         :param tx_shape - ( optional ) the statements in each transaction and how often it is reused.  One statement when not given
+         :param client_options - ( optional ) how the client makes its requests and reads the responses
+         :return: BenchmarkResult with the total time taken and the latency of each transaction
          """
 
+        # Closed loop unless told otherwise
+        if load_profile is None:
+            load_profile = LoadProfile()
+
 
         # Progress bar
-        tx_progress_bar = ProgressBar("TXThreads", number_tests)
+        tx_progress_bar = ProgressBar("TXThreads", load_profile.expected_tests(number_tests))
 
         # Object to handle our requests
-        tx_request = TXrequest(url, usr, pwd, db, t_out)
+        tx_request = TXrequest(url, usr, pwd, db, t_out, client_options)
+
+        # Results of the test, including the latency of every transaction
+        # and of the begin, run and commit phases that make it up.
+        # Open loop tests also record how long each transaction waited to be sent
+        result = BenchmarkResult(load_profile.expected_tests(number_tests), load_profile.phases(MANAGED_TX_PHASES), load_profile.rate)
+
+        # Time each part of every request, from opening its connection to reading the response
+        tx_request.tracer = RequestTracer(result.http)
+
+        # Tries a transaction again on a transient error, when asked to
+        retry = (client_options or ClientOptions()).retry_policy()
+
+        # Begins, reuses and commits transactions in the shape asked for.  Shared by every thread
+        tx_managed = ManagedTransactions(result, tx_shape)
+
+        # The statement and parameters of every statement the test runs.  Parameters are made now so it does not slow the test down
+        tx_statements = ParameterSource.statements(cypher, parameters, tx_managed.tx_shape.expected_statements(load_profile.expected_tests(number_tests)))
 
         start_time = datetime.now()
+        run_start = time.perf_counter()
 
         # Be careful with the number of workers - bad things happen if this is too high
         # looks like we exhaust the number of connections, showing as hitting max retries
         # you'll need to tweak this to reach a table value.
-        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        # Transactions are submitted as they are due, keeping no more than a couple for
+        # each worker in flight so memory use stays flat however long the test runs
+        producer = BoundedProducer(load_profile, workers, tx_progress_bar)
 
-            futures = [executor.submit(BenchmarkThreads._TXThreads, tx_request, cypher) for i in range(number_tests)]
+        # Sample the client itself while the test runs, to tell when it rather than Neo4j is the bottleneck
+        sampler = ResourceSampler(queue_depth=producer.in_flight).start()
 
-            for future in concurrent.futures.as_completed(futures):
-                try:
-                    result = future.result()  # Retrieve result from a thread or raise an exception
-                    tx_progress_bar.add_progress_entry() # thread has finished, so increment the progress bar
-                except Exception as e:
-                    print(f"Task raised an exception: {e}")
-                    raise
+        # Profile just the timed part of the test, when asked to with --profile
+        profiler = Profiler().start()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=producer.max_workers) as executor:
+            producer.run(executor, number_tests, run_start, BenchmarkThreads._TXThreads, tx_request, tx_managed, tx_statements, result, retry)
+            result.profile = profiler.stop()
+            result.resources.append(sampler.stop())
+
+        # Stopped early by Ctrl-C.  What was recorded until then is still reported
+        result.cancelled = producer.cancelled
+
+        # Commit any transactions kept open for reuse
+        tx_managed.commit_open(tx_request.tx_request_commit)
 
         # Destroy progress bar object
         # Make sure to do this to avoid the console
@@ -96,7 +139,14 @@ class BenchmarkThreads:
         del tx_request
 
         end_time = datetime.now()
+        run_end = time.perf_counter()
 
         total_time: timedelta = end_time - start_time
 
-        return total_time.total_seconds()
+        result.total_time = total_time.total_seconds()
+
+        # Leave out the warm up and cool down, and split a stepped test into its steps
+        result.set_window(*load_profile.measurement_window(run_start, run_end))
+        result.steps = load_profile.steps(run_start, run_end, workers)
+
+        return result
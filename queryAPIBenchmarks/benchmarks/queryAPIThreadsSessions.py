@@ -12,10 +12,11 @@ __status__ = 'Dev'
 
 import concurrent.futures
 # Generic / built in
+import time
 from datetime import datetime, timedelta
 
 # Owned
-from queryAPIBenchmarks.common import ProgressBar, TXsession
+from queryAPIBenchmarks.common import MANAGED_TX_PHASES, APIException, BenchmarkResult, BoundedProducer, ClientOptions, LoadProfile, ManagedTransactions, ParameterSource, Profiler, ProgressBar, RequestTracer, ResourceSampler, RetryPolicy, SessionClients, TransactionShape
 
 
 class BenchmarkThreadsSessions:
@@ -23,33 +24,42 @@ class BenchmarkThreadsSessions:
     Provides methods to benchmark Neo4j Query API performance using threads and sessions.
     """
     @staticmethod
-    def _TXThreadsSessions(tx_session: TXsession, cypher: str):
+    def _TXThreadsSessions(tx_session: SessionClients, tx_managed: ManagedTransactions, tx_statements, result: BenchmarkResult, retry: RetryPolicy, intended: float = None):
         """
           PRIVATE
 
           Executes the supplied Cypher statement. Uses Sessions
 
-          :param cypher - the cypher statement to run
+          :param tx_managed - begins, reuses and commits transactions in the shape asked for
+          :param tx_statements - iterator, shared by every thread, of the cypher statement and parameters of each statement
           :param url - the URL of the Neo4j Query API
           :param usr - the user account to use
           :param pwd  - the password of the user account
+          :param result - where to record how long the transaction and each of its phases took
+          :param retry - tries the transaction again on a transient error
+          :param intended - ( optional ) for open loop tests, when the transaction should have been sent
           :return: - Nothing is returned
         """
 
-        # Begin our transaction
-        tx_id, tx_cluster_affinity = tx_session.tx_session_id()
+        # Take this transaction's statements and parameters before the clock starts
+        tx_cypher_statements = tx_managed.statements(tx_statements)
 
-        # In our transaction context, create a movie
-        tx_session.tx_session_cypher(tx_id, cypher, tx_cluster_affinity)
+        # Begin our transaction, run the cypher statements in it and commit it.  How long it and each of
+        # its phases took is recorded by tx_managed once the transaction it ran in has been committed
+        use = tx_managed.new_use(intended)
 
-        # Commit the transaction
-        tx_session.tx_session_commit(tx_id, tx_cluster_affinity)
+        try:
+            retry.run(tx_managed.run, tx_cypher_statements, tx_session.tx_session_id, tx_session.tx_session_cypher, tx_session.tx_session_commit, use)
+
+        except APIException as e:
+            # Record that it failed, and how long it took to
+            result.record_error(e, use["first_attempt"], time.perf_counter(), intended=intended)
 
         pass
 
 
     @staticmethod
-    def run(number_tests: int, cypher: str, url: str, usr: str, pwd:str, db: str, t_out: int, workers:int = 0, http2: bool = False ):
+    def run(number_tests: int, cypher: str, url: str, usr: str, pwd:str, db: str, t_out: int, workers:int = 0, http2: bool = False, load_profile: LoadProfile = None, parameters: ParameterSource = None, tx_shape: TransactionShape = None, client_options: ClientOptions = None):
         """
          Repeats a cypher statement, neo4j_cyper, for the number of times set by num_tests to the Neo4j Query API
          at neo4j_url using Threads. The total time is returned.
@@ -59,31 +69,67 @@ class BenchmarkThreadsSessions:
          :param url - the URL of the Neo4j Query API
          :param usr - the user account to use
          :param pwd  - the password of the user account
-         :return: total time taken
+         :param load_profile - ( optional ) when to send each transaction.  Closed loop when not given
+         :param parameters - ( optional ) makes the parameters sent with each cypher statement
+         :param tx_shape - ( optional ) the statements in each transaction and how often it is reused.  One statement when not given
+         :param client_options - ( optional ) how the client makes its requests and reads the responses
+         :return: BenchmarkResult with the total time taken and the latency of each transaction
          """
 
+        # Closed loop unless told otherwise
+        if load_profile is None:
+            load_profile = LoadProfile()
+
         # Create an instance of TXSession as this triggers
         # the use of httpx client to allow us to re-use connections
-        # We can use the same session across all of the threads
-        tx_session = TXsession(url, usr, pwd, db, t_out)
+        # We can use the same session across all of the threads, or a session per thread or a few in turn, as the client options ask
+        tx_session = SessionClients(url, usr, pwd, db, t_out, http2, client_options)
 
 
         # Progress bar
-        tx_progress_bar = ProgressBar("TXThreadsSessions", number_tests)
+        tx_progress_bar = ProgressBar("TXThreadsSessions", load_profile.expected_tests(number_tests))
+
+        # Results of the test, including the latency of every transaction
+        # and of the begin, run and commit phases that make it up.
+        # Open loop tests also record how long each transaction waited to be sent
+        result = BenchmarkResult(load_profile.expected_tests(number_tests), load_profile.phases(MANAGED_TX_PHASES), load_profile.rate)
+
+        # Time each part of every request, including how long it waits for a connection from the pool
+        tx_session.tracer = RequestTracer(result.http)
+
+        # Tries a transaction again on a transient error, when asked to
+        retry = (client_options or ClientOptions()).retry_policy()
+
+        # Begins, reuses and commits transactions in the shape asked for.  Shared by every thread
+        tx_managed = ManagedTransactions(result, tx_shape)
+
+        # The statement and parameters of every statement the test runs.  Parameters are made now so it does not slow the test down
+        tx_statements = ParameterSource.statements(cypher, parameters, tx_managed.tx_shape.expected_statements(load_profile.expected_tests(number_tests)))
 
         # Starting time
         start_time = datetime.now()
+        run_start = time.perf_counter()
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
-            futures = [executor.submit(BenchmarkThreadsSessions._TXThreadsSessions, tx_session, cypher) for i in range(number_tests)]
-            #concurrent.futures.wait(futures)
-            for future in concurrent.futures.as_completed(futures):
-                try:
-                    result = future.result()  # Retrieve result or raise an exception
-                    tx_progress_bar.add_progress_entry()  # thread has finished, so increment the progress bar
-                except Exception as e:
-                    print(f"Task raised an exception: {e}")
-                    raise 
+        # Transactions are submitted as they are due, keeping no more than a couple for
+        # each worker in flight so memory use stays flat however long the test runs
+        producer = BoundedProducer(load_profile, workers, tx_progress_bar)
+
+        # Sample the client itself while the test runs, to tell when it rather than Neo4j is the bottleneck
+        sampler = ResourceSampler(queue_depth=producer.in_flight).start()
+
+        # Profile just the timed part of the test, when asked to with --profile
+        profiler = Profiler().start()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=producer.max_workers) as executor:
+            producer.run(executor, number_tests, run_start, BenchmarkThreadsSessions._TXThreadsSessions, tx_session, tx_managed, tx_statements, result, retry)
+            result.profile = profiler.stop()
+            result.resources.append(sampler.stop())
+
+        # Stopped early by Ctrl-C.  What was recorded until then is still reported
+        result.cancelled = producer.cancelled
+
+        # Commit any transactions kept open for reuse
+        tx_managed.commit_open(tx_session.tx_session_commit)
 
         # Destroy progress bar object
         # Make sure to do this to avoid the console
@@ -95,6 +141,13 @@ class BenchmarkThreadsSessions:
         del tx_session
 
         end_time = datetime.now()
+        run_end = time.perf_counter()
         total_time: timedelta = end_time - start_time
 
-        return total_time.total_seconds()
+        result.total_time = total_time.total_seconds()
+
+        # Leave out the warm up and cool down, and split a stepped test into its steps
+        result.set_window(*load_profile.measurement_window(run_start, run_end))
+        result.steps = load_profile.steps(run_start, run_end, workers)
+
+        return result
@@ -1,3 +1,23 @@
+from .benchmarkResult import MANAGED_TX_PHASES, BenchmarkResult
+from .boundedProducer import BoundedProducer
+from .clientOptions import CLIENT_STRATEGIES, ClientOptions
+from .customExceptions import APIException, ProcessStartError, WorkerAgentError
+from .distributedProtocol import WORKER_PORT, parse_address, receive_message, send_message
+from .histogramResult import HistogramResult
+from .latencyHistogram import LatencyHistogram
+from .latencyRecorder import LatencyRecorder
+from .loadProfile import LoadProfile
+from .managedTransactions import ManagedTransactions, TransactionShape
+from .mockQueryAPI import MockQueryAPIServer, start_mock_query_api
+from .parameterSource import BATCH_PARAMETER, ParameterSource, register_generator
+from .profiler import PROFILE_MODES, PROFILE_TOP, Profiler
 from .queryAPIBenchmarkProgressBar import ProgressBar
 from .queryAPIErrors import query_api_errors
-from .queryAPIOperations import TXrequest, TXsession
+from .queryAPIOperations import TXasyncSession, TXrequest, TXsession
+from .requestEncoder import CONTENT_ENCODINGS, JSON_CODEC, RESPONSE_FORMATS, RequestEncoder, ResponseSkimmer
+from .requestTracer import HTTP_PHASES, RequestTracer
+from .resourceSampler import CPU_BOUND, ResourceSampler
+from .resultsStore import ResultsStore, new_run_id
+from .retryPolicy import RetryPolicy
+from .scenario import Scenario
+from .sessionClients import SessionClients
@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import base64
+import threading
+from array import array
+
+# Owned
+from .customExceptions import APIException
+from .latencyHistogram import LatencyHistogram
+from .latencyRecorder import LatencyRecorder
+from .profiler import Profiler
+from .resourceSampler import ResourceSampler
+
+
+# The round trips that make up a managed transaction, in the order they are made
+MANAGED_TX_PHASES = ("begin", "run", "commit")
+
+
+class BenchmarkResult:
+    """
+    The outcome of running a single benchmark test.  Holds the total time taken
+    and the latency of every transaction that was made.
+
+    Tests that split a transaction into phases, such as the begin, run and commit
+    round trips of a managed transaction, also get a LatencyRecorder per phase.
+
+    Scenario tests mix classes of transaction and get a LatencyRecorder per class too.
+
+    Parts of each HTTP request, such as the wait for a connection from the pool, are timed
+    by a RequestTracer into a LatencyRecorder per part.  See HTTP_PHASES
+
+    Transactions that fail are counted by error code and their latency is kept apart from that of
+    the transactions that succeeded, as is the latency of those that succeeded after being tried again
+
+    When a test has a warm up or cool down, only transactions that started inside the
+    measurement window are summarised.  Stepped tests are also summarised step by step
+
+    A test stopped early, by Ctrl-C, is cancelled.  Its summary is of the transactions made until then
+
+    The client is sampled while the test runs by a ResourceSampler in each process that runs it, so that a
+    test limited by the client's own CPU rather than by Neo4j is flagged.  When asked to, the same part
+    of the test is profiled by a Profiler
+    """
+
+    def __init__(self, num_requests: int, phases: tuple = (), target_rate: float = 0.0, classes: tuple = ()):
+        self.num_requests = num_requests
+        self.target_rate = target_rate
+        self.total_time: float = 0.0
+        self.latencies = LatencyRecorder()
+        self.phases = {phase: LatencyRecorder() for phase in phases}
+        self.classes = {name: LatencyRecorder() for name in classes}
+
+        # Parts of each HTTP request, added by a RequestTracer
+        self.http: dict[str, LatencyRecorder] = {}
+
+        # Failed transactions by error code, as { code: { class, count } }, and the times transactions were tried again.
+        # Latency of transactions that failed and of those that succeeded after being tried again
+        self.errors: dict[str, dict] = {}
+        self.retries = 0
+        self.failed = LatencyRecorder()
+        self.retried = LatencyRecorder()
+        self._errors_lock = threading.Lock()
+
+        # Stopped before every transaction had been sent
+        self.cancelled = False
+
+        # What the client used while the test ran, from ResourceSampler.stop(), one for each process that ran it
+        self.resources: list[dict] = []
+
+        # Where the client spent its time or memory, from Profiler.stop(), merged across processes.  None unless profiled
+        self.profile: dict = None
+
+        # perf_counter() times of the part of the test to summarise.  All of it when None
+        self.measure_from: float = None
+        self.measure_to: float = None
+
+        # Steps of a stepped test.  See LoadProfile.steps()
+        self.steps: list[dict] = []
+
+        # Every trial when this result is the best one found by a concurrency search
+        self.search_trials: list[dict] = []
+
+        # Batch size, rows per transaction and request size when this result is part of a batch size sweep
+        self.batch: dict = None
+
+
+    def set_window(self, measure_from: float, measure_to: float):
+        """
+        Sets the part of the test to summarise, leaving out any warm up and cool down
+
+        :param measure_from - perf_counter() time to start from
+        :param measure_to - perf_counter() time to end at
+        :return: None
+        """
+        self.measure_from = measure_from
+        self.measure_to = measure_to
+
+
+    def pack(self) -> dict:
+        """
+        Everything needed to rebuild this result in another process.  Latencies are
+        sent as raw bytes, see LatencyRecorder.dump(), so nothing is pickled per transaction
+
+        :return: dict
+        """
+        return {"total_time": self.total_time,
+                "measure_from": self.measure_from,
+                "measure_to": self.measure_to,
+                "steps": self.steps,
+                "latencies": self.latencies.dump(),
+                "phases": {name: recorder.dump() for name, recorder in self.phases.items()},
+                "classes": {name: recorder.dump() for name, recorder in self.classes.items()},
+                "http": {name: recorder.dump() for name, recorder in self.http.items()},
+                "errors": self.errors,
+                "retries": self.retries,
+                "failed": self.failed.dump(),
+                "retried": self.retried.dump(),
+                "cancelled": self.cancelled,
+                "resources": self.resources,
+                "profile": self.profile}
+
+
+    def samples(self) -> dict:
+        """
+        The start time and latency of every transaction in the part of the test being summarised.
+        Start times are from the start of that part.  Each is the base64 of an array of doubles
+        so that a million samples take 21MB of JSON rather than many times that as numbers
+
+        :return: dict with starts and durations, and the ResourceSampler samples of each process
+        """
+        starts = array('d')
+        durations = array('d')
+        measure_from = self.measure_from
+
+        if measure_from is None:
+            measure_from = min(self.latencies.starts, default=0.0)
+
+        for start, duration in zip(self.latencies.starts, self.latencies.durations):
+            if self.measure_from is None or self.measure_from <= start < self.measure_to:
+                starts.append(start - measure_from)
+                durations.append(duration)
+
+        return {"starts": base64.b64encode(starts.tobytes()).decode(),
+                "durations": base64.b64encode(durations.tobytes()).decode(),
+                "resources": [report["samples"] for report in self.resources]}
+
+
+    def histograms(self) -> dict:
+        """
+        The result as LatencyHistograms of the part of the test being summarised, and of each step.
+        Much smaller than pack() and used to send the result to another machine.  See HistogramResult
+
+        :return: dict of plain values that can be sent as JSON
+        """
+        report = {"num_requests": self.num_requests,
+                  "target_rate": self.target_rate,
+                  "total_time": self.total_time,
+                  "measured_time": self.measured_time(),
+                  "latency": LatencyHistogram.from_durations(self.latencies.window(self.measure_from, self.measure_to)).to_dict(),
+                  "phases": {name: LatencyHistogram.from_durations(recorder.window(self.measure_from, self.measure_to)).to_dict()
+                             for name, recorder in self.phases.items()},
+                  "classes": {name: LatencyHistogram.from_durations(recorder.window(self.measure_from, self.measure_to)).to_dict()
+                              for name, recorder in self.classes.items()},
+                  "http": {name: LatencyHistogram.from_durations(recorder.window(self.measure_from, self.measure_to)).to_dict()
+                           for name, recorder in self.http.items()},
+                  "errors": self.errors,
+                  "retries": self.retries,
+                  "failed": LatencyHistogram.from_durations(self.failed.window(self.measure_from, self.measure_to)).to_dict(),
+                  "retried": LatencyHistogram.from_durations(self.retried.window(self.measure_from, self.measure_to)).to_dict(),
+                  "cancelled": self.cancelled,
+                  "resources": self.resources,
+                  "profile": self.profile,
+                  "steps": []}
+
+        for step in self.steps:
+            report["steps"].append({"step": step["step"],
+                                    "start": step["start"],
+                                    "workers": step["workers"],
+                                    "target_rate": step["target_rate"],
+                                    "time": step["to"] - step["from"],
+                                    "latency": LatencyHistogram.from_durations(self.latencies.window(step["from"], step["to"])).to_dict()})
+
+        return report
+
+
+    def merge(self, packed: dict):
+        """
+        Adds a result from pack(), made by another process running the same test at the same time.
+        The measurement window and each step cover all of the merged results and the workers and
+        target rate of each step are added together
+
+        :param packed - from pack()
+        :return: None
+        """
+        self.total_time = max(self.total_time, packed["total_time"])
+        self.latencies.load(*packed["latencies"])
+
+        for name, samples in packed["phases"].items():
+            self.phases[name].load(*samples)
+
+        for name, samples in packed["classes"].items():
+            self.classes[name].load(*samples)
+
+        for name, samples in packed.get("http", {}).items():
+            self.http.setdefault(name, LatencyRecorder()).load(*samples)
+
+        for code, error in packed.get("errors", {}).items():
+            self.errors.setdefault(code, {"class": error["class"], "count": 0})["count"] += error["count"]
+
+        self.retries += packed.get("retries", 0)
+        self.cancelled = self.cancelled or packed.get("cancelled", False)
+        self.resources.extend(packed.get("resources", []))
+        self.profile = Profiler.merge(self.profile, packed.get("profile"))
+
+        if "failed" in packed:
+            self.failed.load(*packed["failed"])
+            self.retried.load(*packed["retried"])
+
+        if packed["measure_from"] is not None:
+            self.measure_from = packed["measure_from"] if self.measure_from is None else min(self.measure_from, packed["measure_from"])
+            self.measure_to = packed["measure_to"] if self.measure_to is None else max(self.measure_to, packed["measure_to"])
+
+        for index, step in enumerate(packed["steps"]):
+            if index == len(self.steps):
+                self.steps.append(dict(step))
+                continue
+
+            merged = self.steps[index]
+            merged["from"] = min(merged["from"], step["from"])
+            merged["to"] = max(merged["to"], step["to"])
+            merged["workers"] += step["workers"]
+            merged["target_rate"] += step["target_rate"]
+
+
+    def measured_time(self) -> float:
+        """
+        Length of the part of the test being summarised, in seconds
+        """
+        if self.measure_from is None:
+            return self.total_time
+
+        return self.measure_to - self.measure_from
+
+
+    def record_phases(self, *timestamps: float, intended: float = None, statement_class: str = None, retries: int = 0,
+                      first_attempt: float = None):
+        """
+        Records a transaction made up of phases.  Takes a perf_counter() value for the
+        start of each phase, in the same order as the phases, followed by one for the end
+        of the last phase.  The whole transaction is recorded as well as each phase
+
+        :param timestamps - len(phases) + 1 perf_counter() values
+        :param intended - ( optional ) for open loop tests, when the transaction should have been sent.
+                          The transaction latency is measured from this and the wait is recorded as the queue phase
+        :param statement_class - ( optional ) for scenario tests, the class of the transaction
+        :param retries - ( optional ) the times the transaction was tried again before it succeeded
+        :param first_attempt - ( optional ) perf_counter() value when the first try started.  The phases are those of
+                               the try that succeeded but the transaction latency is measured from this
+        :return: None
+        """
+        if intended is not None:
+            timestamps = (intended,) + timestamps
+
+        for phase, start, end in zip(self.phases.values(), timestamps, timestamps[1:]):
+            phase.record(start, end - start)
+
+        tx_start = timestamps[0] if first_attempt is None or intended is not None else min(timestamps[0], first_attempt)
+
+        self.latencies.record(tx_start, timestamps[-1] - tx_start)
+
+        if statement_class is not None:
+            self.classes[statement_class].record(tx_start, timestamps[-1] - tx_start)
+
+        if retries:
+            self.retried.record(tx_start, timestamps[-1] - tx_start)
+
+            with self._errors_lock:
+                self.retries += retries
+
+
+    def record_error(self, error: APIException, start: float, end: float, intended: float = None, retries: int = None):
+        """
+        Records a transaction that failed, after any times it was tried again
+
+        :param error - why it failed
+        :param start - perf_counter() value when the transaction started
+        :param end - perf_counter() value when it failed
+        :param intended - ( optional ) for open loop tests, when the transaction should have been sent.  Its latency is measured from this
+        :param retries - ( optional ) the times it was tried again.  error.retries when not given.  See ManagedTransactions
+                         for transactions that failed with the error of another that shared a managed transaction with them
+        :return: None
+        """
+        if intended is not None:
+            start = intended
+
+        self.failed.record(start, end - start)
+
+        with self._errors_lock:
+            self.errors.setdefault(error.code, {"class": error.error_class, "count": 0})["count"] += 1
+            self.retries += error.retries if retries is None else retries
+
+
+    def error_rate(self) -> float:
+        """
+        Share, 0 to 1, of the transactions in the part of the test being summarised that failed
+        """
+        failed = len(self.failed.window(self.measure_from, self.measure_to))
+        succeeded = len(self.latencies.window(self.measure_from, self.measure_to))
+
+        return failed / (failed + succeeded) if failed + succeeded > 0 else 0.0
+
+
+    def requests_per_second(self) -> float:
+        """
+        Average number of transactions per second over the part of the test being summarised
+        """
+        if self.measured_time() <= 0:
+            return 0.0
+
+        return len(self.latencies.window(self.measure_from, self.measure_to)) / self.measured_time()
+
+
+    def summary(self) -> dict:
+        """
+        Machine readable summary of the test.  Latencies are in seconds
+
+        :return: dict
+        """
+        summary = {
+            "num_requests": self.num_requests,
+            "total_time": self.total_time,
+            "measured_time": self.measured_time(),
+            "requests_per_second": self.requests_per_second(),
+            "target_rate": self.target_rate,
+            "latency": self.latencies.summary(self.measure_from, self.measure_to)
+        }
+
+        if self.phases:
+            summary["phases"] = {name: recorder.summary(self.measure_from, self.measure_to) for name, recorder in self.phases.items()}
+
+        if self.classes:
+            measured_time = self.measured_time()
+            summary["classes"] = {}
+
+            for name, recorder in self.classes.items():
+                class_latency = recorder.summary(self.measure_from, self.measure_to)
+                summary["classes"][name] = {"requests_per_second": class_latency["count"] / measured_time if measured_time > 0 else 0.0,
+                                            "latency": class_latency}
+
+        if any(len(recorder) for recorder in self.http.values()):
+            summary["http"] = {name: recorder.summary(self.measure_from, self.measure_to) for name, recorder in self.http.items()}
+
+        if self.errors or self.retries:
+            summary["errors"] = {"failed": len(self.failed.window(self.measure_from, self.measure_to)),
+                                 "error_rate": self.error_rate(),
+                                 "retries": self.retries,
+                                 "by_code": self.errors,
+                                 "failed_latency": self.failed.summary(self.measure_from, self.measure_to),
+                                 "retried_latency": self.retried.summary(self.measure_from, self.measure_to)}
+
+        if self.search_trials:
+            summary["search"] = self.search_trials
+
+        if self.cancelled:
+            summary["cancelled"] = True
+
+        if self.resources:
+            summary["resources"] = ResourceSampler.combine(self.resources)
+
+        if self.profile:
+            summary["profile"] = Profiler.summarise(self.profile)
+
+        if self.batch:
+            summary["batch"] = self.batch | {"rows_per_second": summary["requests_per_second"] * self.batch["rows_per_transaction"]}
+
+        if self.steps:
+            summary["steps"] = []
+
+            for step in self.steps:
+                step_latency = self.latencies.summary(step["from"], step["to"])
+                step_time = step["to"] - step["from"]
+
+                summary["steps"].append({"step": step["step"],
+                                         "start": step["start"],
+                                         "workers": step["workers"],
+                                         "target_rate": step["target_rate"],
+                                         "requests_per_second": step_latency["count"] / step_time,
+                                         "latency": step_latency})
+
+        return summary
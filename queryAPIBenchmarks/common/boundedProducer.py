@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import concurrent.futures
+import threading
+import time
+
+# Owned
+from .loadProfile import LoadProfile
+from .queryAPIBenchmarkProgressBar import ProgressBar
+
+
+# Transactions allowed in flight for each worker, the one it is running and those queued for it.
+# One queued transaction means a worker that finishes rarely waits for the producer to hand it its next one.
+# Only the profile's workers run at once however many are queued, see BoundedProducer
+IN_FLIGHT_PER_WORKER = 2
+
+# Returned in place of a transaction's result when it was skipped as the test stopped
+_SKIPPED = object()
+
+class InFlightWindow:
+    """
+    Counts the transactions that are in flight and blocks when there are too many.
+    Like a semaphore except the limit can be changed while it is in use
+    """
+
+    def __init__(self, limit: int):
+        self._limit = limit
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+
+    def set_limit(self, limit: int):
+        with self._condition:
+            self._limit = limit
+            self._condition.notify_all()
+
+
+    def acquire(self):
+        # Waits until there is room for another transaction
+        with self._condition:
+            while self._in_flight >= self._limit:
+                self._condition.wait()
+            self._in_flight += 1
+
+
+    def release(self):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+
+    def wait_empty(self):
+        # Waits until every transaction has finished
+        with self._condition:
+            while self._in_flight > 0:
+                self._condition.wait()
+
+
+class BoundedProducer:
+    """
+    Submits transactions to a thread pool as the load profile says they are due, while keeping
+    no more than per_worker times the profile's workers in flight.  Futures are not kept once they
+    have finished, so memory use does not grow with the length of the test.
+
+    The thread pool is sized for the most workers the test will have, so the threads of a stepped test
+    outnumber its workers until the last step.  No more transactions than the profile's workers at that
+    moment run at once.  The rest of those in flight wait, in the thread pool or for a worker's turn, and
+    are not timed until they run unless open loop.
+
+    Stops early when a transaction raises an exception or Ctrl-C is pressed.  Transactions queued but not started
+    are cancelled and those running are left to finish so that what has been recorded so far can still be reported.
+    cancelled is then True.  Pressing Ctrl-C again while they finish stops at once
+    """
+
+    def __init__(self, load_profile: LoadProfile, workers: int, tx_progress_bar: ProgressBar, per_worker: int = IN_FLIGHT_PER_WORKER):
+        self._load_profile = load_profile
+        self._workers = workers
+        self._per_worker = per_worker
+        self._tx_progress_bar = tx_progress_bar
+        self._window = InFlightWindow(workers * per_worker)
+        self._running = InFlightWindow(workers)
+        self._start_time: float = None
+        self._stopping = False
+        self._error: BaseException = None
+        self.cancelled = False
+
+        # Futures in flight, so the queued ones can be cancelled when stopping early
+        self._pending: set[concurrent.futures.Future] = set()
+        self._pending_lock = threading.Lock()
+
+
+    def in_flight(self) -> int:
+        """
+        The transactions submitted to the thread pool that have not finished, queued or running
+        """
+        return self._window.in_flight
+
+
+    @property
+    def max_workers(self) -> int:
+        """
+        The number of threads the thread pool needs
+        """
+        return self._load_profile.max_workers(self._workers)
+
+
+    def _workers_now(self) -> int:
+        # The profile's workers at this moment of the test
+        return self._load_profile.workers_at(time.perf_counter() - self._start_time, self._workers)
+
+
+    def _run_one(self, tx_function, *tx_args):
+        # Runs a transaction once one of the profile's workers is free.  Threads beyond them wait here
+        self._running.set_limit(self._workers_now())
+        self._running.acquire()
+
+        try:
+            # Stopped while it waited for a worker, so it is treated as cancelled
+            if self._stopping:
+                return _SKIPPED
+
+            return tx_function(*tx_args)
+        finally:
+            self._running.release()
+
+
+    def _submit(self, executor: concurrent.futures.Executor, tx_function, *tx_args):
+        # Submits a transaction and keeps its future until it is done
+        future = executor.submit(self._run_one, tx_function, *tx_args)
+
+        with self._pending_lock:
+            self._pending.add(future)
+
+        future.add_done_callback(self._done)
+
+
+    def _cancel_queued(self):
+        # Cancels the transactions that have not started.  Their futures are done once cancelled.
+        # Those waiting for a worker are skipped when their turn comes
+        self._stopping = True
+
+        with self._pending_lock:
+            pending = list(self._pending)
+
+        for future in pending:
+            future.cancel()
+
+
+    def _done(self, future: concurrent.futures.Future):
+        # Called by the thread pool when a transaction finishes or is cancelled
+        self._window.release()
+
+        with self._pending_lock:
+            self._pending.discard(future)
+
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        if error is not None:
+            # Keep the first error so it can be raised once the producer has stopped
+            if self._error is None:
+                self._error = error
+            return
+
+        if future.result() is _SKIPPED:
+            return
+
+        # thread has finished, so increment the progress bar
+        self._tx_progress_bar.add_progress_entry()
+
+
+    def run(self, executor: concurrent.futures.Executor, number_tests: int, start_time: float, tx_function, *tx_args):
+        """
+        Submits tx_function(*tx_args, intended) for each transaction in the load profile and waits for
+        them all to finish.  intended is when the transaction was due when open loop, otherwise None.
+        If a transaction raises an exception, no more are submitted and the exception is raised.
+        On Ctrl-C no more are submitted and cancelled is set
+
+        :param executor - the thread pool to run transactions on
+        :param number_tests - the number of transactions to send.  Ignored for a timed test
+        :param start_time - perf_counter() time the test started
+        :param tx_function - runs a single transaction
+        :param tx_args - arguments for tx_function
+        :return: None
+        """
+
+        # A place in the window taken for a transaction that has not been submitted yet
+        holding = False
+        self._start_time = start_time
+
+        # When open loop, load_profile.schedule() waits until each transaction is due before it is submitted.
+        # If every worker is busy the transaction waits here, or queued in the thread pool, and that wait is counted in its latency
+        try:
+            for intended in self._load_profile.schedule(number_tests, start_time):
+                # Follow any step in the number of workers, in those running and in those queued for them
+                workers_now = self._workers_now()
+                self._running.set_limit(workers_now)
+                self._window.set_limit(workers_now * self._per_worker)
+                self._window.acquire()
+                holding = True
+
+                if self._error is not None:
+                    break
+
+                self._submit(executor, tx_function, *tx_args, intended)
+                holding = False
+
+        except KeyboardInterrupt:
+            self.cancelled = True
+            print("\nStopping.  Waiting for the transactions running to finish, press Ctrl-C again to stop at once")
+
+        if holding:
+            self._window.release()
+
+        if self._error is not None or self.cancelled:
+            self._cancel_queued()
+
+        self._window.wait_empty()
+
+        if self._error is not None:
+            print(f"Task raised an exception: {self._error}")
+            raise self._error
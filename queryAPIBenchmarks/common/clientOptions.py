@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import httpx
+
+# Owned
+from .requestEncoder import CONTENT_ENCODINGS, RESPONSE_FORMATS
+from .retryPolicy import RetryPolicy
+
+
+# How the workers of a threaded session test share clients, see SessionClients
+CLIENT_STRATEGIES = ("shared", "per-thread", "round-robin")
+
+# httpx's own pool limits, used when none are given
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE = 20
+KEEPALIVE_EXPIRY = 5.0
+
+
+class ClientOptions:
+    """
+    How the clients, TXrequest, TXsession and TXasyncSession, make their requests and read the responses.
+    The defaults behave as a normal application would.
+
+    skip_body - only check the status and the start of each response for errors.  The rest is read and thrown away
+                without being decoded.  Responses that begin a transaction are still decoded for the transaction id
+    response_format - json or typed.  The format, see RESPONSE_FORMATS, the Query API is asked to answer in
+    accept_encoding - the Accept-Encoding header, the compression responses can use e.g gzip, zstd or identity for none.
+                      httpx asks for gzip and deflate when empty
+    request_encoding - one of CONTENT_ENCODINGS to compress request bodies with.  identity is no compression
+    max_connections - most connections in each client's pool.  0 for the default, MAX_CONNECTIONS or the workers of an async test
+    max_keepalive - most idle connections each pool keeps open.  0 for the default, MAX_KEEPALIVE or the workers of an async test
+    keepalive_expiry - seconds an idle connection is kept open for
+    pool_timeout - seconds a request waits for a connection from the pool before failing.  0 for the network timeout
+    client_strategy - how the workers of a threaded session test share clients, one of CLIENT_STRATEGIES
+    clients - the clients transactions are shared between, in turn, with the round-robin strategy
+    retries - the most times a test tries a transaction again after a transient error.  0 to measure each transaction once
+    retry_backoff - seconds the first wait before trying again can be up to.  Doubled for each try after it
+    retry_max_backoff - the most seconds any wait before trying again can be up to
+    """
+
+    def __init__(self, skip_body: bool = False, response_format: str = "json", accept_encoding: str = "", request_encoding: str = "identity",
+                 max_connections: int = 0, max_keepalive: int = 0, keepalive_expiry: float = KEEPALIVE_EXPIRY, pool_timeout: float = 0.0,
+                 client_strategy: str = "shared", clients: int = 4, retries: int = 0, retry_backoff: float = 0.05, retry_max_backoff: float = 2.0):
+        if response_format not in RESPONSE_FORMATS:
+            raise ValueError(f"response_format must be one of {', '.join(RESPONSE_FORMATS)}")
+
+        if request_encoding not in CONTENT_ENCODINGS:
+            raise ValueError(f"request_encoding must be one of {', '.join(CONTENT_ENCODINGS)}.  zstd needs the zstandard package")
+
+        if client_strategy not in CLIENT_STRATEGIES:
+            raise ValueError(f"client_strategy must be one of {', '.join(CLIENT_STRATEGIES)}")
+
+        if max_connections < 0 or max_keepalive < 0 or keepalive_expiry < 0 or pool_timeout < 0:
+            raise ValueError("Pool limits and timeouts cannot be less than 0")
+
+        if clients < 1:
+            raise ValueError("There must be at least one client")
+
+        if retries < 0 or retry_backoff < 0 or retry_max_backoff < 0:
+            raise ValueError("Retries and their backoff cannot be less than 0")
+
+        self.skip_body = skip_body
+        self.response_format = response_format
+        self.accept_encoding = accept_encoding
+        self.request_encoding = request_encoding
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.pool_timeout = pool_timeout
+        self.client_strategy = client_strategy
+        self.clients = clients
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.retry_max_backoff = retry_max_backoff
+
+
+    def limits(self, max_connections: int = MAX_CONNECTIONS, max_keepalive: int = MAX_KEEPALIVE) -> httpx.Limits:
+        """
+        The limits of a client's connection pool.  Limits left at 0 take the defaults given
+        """
+        return httpx.Limits(max_connections=self.max_connections or max_connections,
+                            max_keepalive_connections=self.max_keepalive or max_keepalive,
+                            keepalive_expiry=self.keepalive_expiry)
+
+
+    def timeout(self, t_out: float) -> httpx.Timeout:
+        """
+        The timeouts of each request.  t_out for all of them unless a pool timeout has been given
+        """
+        return httpx.Timeout(t_out, pool=self.pool_timeout or t_out)
+
+
+    def retry_policy(self) -> RetryPolicy:
+        """
+        How a test tries transactions again after transient errors
+        """
+        return RetryPolicy(self.retries, self.retry_backoff, self.retry_max_backoff)
+
+
+    def to_dict(self) -> dict:
+        return vars(self).copy()
+
+
+    @staticmethod
+    def from_dict(values: dict):
+        return ClientOptions(**values)
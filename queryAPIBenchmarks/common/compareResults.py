@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import math
+import random
+
+# Owned
+from .resultsStore import decode_samples
+
+
+# Latency samples are cut down to this many, at random, before testing so that long runs can still be compared quickly
+MAX_SAMPLES = 50000
+
+# Rounds of the permutation test used for throughput
+PERMUTATIONS = 2000
+
+
+def mann_whitney(baseline, current) -> float | None:
+    """
+    One sided Mann-Whitney U test of whether latencies in current tend to be higher than in baseline.
+    Uses the normal approximation with a correction for ties, which is accurate for the number of
+    samples a benchmark makes
+
+    :param baseline - latencies of the baseline run
+    :param current - latencies of the current run
+    :return: p value.  Small when current is slower.  None when either has no samples
+    """
+    n1 = len(current)
+    n2 = len(baseline)
+
+    if n1 == 0 or n2 == 0:
+        return None
+
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+
+    # Rank the samples, giving tied values the average of their ranks
+    current_rank_sum = 0.0
+    tie_correction = 0.0
+    n = n1 + n2
+    i = 0
+
+    while i < n:
+        j = i
+
+        while j + 1 < n and combined[j + 1][0] == combined[i][0]:
+            j += 1
+
+        rank = (i + j) / 2 + 1
+        ties = j - i + 1
+        tie_correction += ties ** 3 - ties
+        current_rank_sum += rank * sum(1 for _, sample in combined[i:j + 1] if sample == 0)
+        i = j + 1
+
+    u = current_rank_sum - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_correction / (n * (n - 1)))
+
+    if variance <= 0:
+        return 1.0
+
+    z = (u - mean) / math.sqrt(variance)
+
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def permutation_test(baseline: list, current: list, rounds: int = PERMUTATIONS, seed: int = 0) -> float | None:
+    """
+    One sided permutation test of whether the mean of current is lower than the mean of baseline
+
+    :param baseline - e.g transactions in each second of the baseline run
+    :param current - the same for the current run
+    :param rounds - the number of random permutations to try
+    :param seed - so that the same runs always give the same p value
+    :return: p value.  Small when current is lower.  None when there are too few values to test
+    """
+    if len(baseline) < 2 or len(current) < 2:
+        return None
+
+    observed = sum(baseline) / len(baseline) - sum(current) / len(current)
+    combined = list(baseline) + list(current)
+    shuffler = random.Random(seed)
+    as_extreme = 0
+
+    for _ in range(rounds):
+        shuffler.shuffle(combined)
+        permuted = sum(combined[:len(baseline)]) / len(baseline) - sum(combined[len(baseline):]) / len(current)
+
+        if permuted >= observed:
+            as_extreme += 1
+
+    return (as_extreme + 1) / (rounds + 1)
+
+
+def per_second(starts) -> list:
+    """
+    The number of transactions started in each whole second.  The last, partial, second is left out
+    """
+    if len(starts) == 0:
+        return []
+
+    counts = [0] * int(max(starts))
+
+    for start in starts:
+        second = int(start)
+
+        if second < len(counts):
+            counts[second] += 1
+
+    return counts
+
+
+def _cut_down(samples, seed: int = 0) -> list:
+    if len(samples) <= MAX_SAMPLES:
+        return list(samples)
+
+    return random.Random(seed).sample(list(samples), MAX_SAMPLES)
+
+
+def _change(baseline: float, current: float) -> float:
+    # Percentage change from baseline to current
+    if baseline == 0:
+        return 0.0
+
+    return (current - baseline) / baseline * 100
+
+
+def compare_runs(baseline: dict, current: dict, threshold: float, alpha: float) -> list:
+    """
+    Compares the throughput and p99 latency of each test that is in both runs.  A test has regressed when
+    throughput has fallen, or p99 latency has risen, by more than threshold percent and the difference is
+    significant at alpha.  When there are no samples to test, for example from a distributed run, or too few
+    seconds of throughput, the threshold alone is used
+
+    :param baseline - run from ResultsStore
+    :param current - run from ResultsStore
+    :param threshold - percentage change allowed
+    :param alpha - significance level e.g 0.05
+    :return: list of dict with test, metric, baseline, current, change, p and regression
+    """
+    comparisons = []
+
+    for name, current_test in current["tests"].items():
+        baseline_test = baseline["tests"].get(name)
+
+        if baseline_test is None:
+            continue
+
+        baseline_samples = baseline_test["samples"]
+        current_samples = current_test["samples"]
+        has_samples = "durations" in baseline_samples and "durations" in current_samples
+
+        # Throughput.  Tested on the number of transactions in each second of the runs
+        throughput_p = None
+        if has_samples:
+            throughput_p = permutation_test(per_second(decode_samples(baseline_samples["starts"])),
+                                            per_second(decode_samples(current_samples["starts"])))
+
+        baseline_rps = baseline_test["summary"]["requests_per_second"]
+        current_rps = current_test["summary"]["requests_per_second"]
+        change = _change(baseline_rps, current_rps)
+
+        comparisons.append({"test": name, "metric": "requests_per_second", "baseline": baseline_rps, "current": current_rps,
+                            "change": change, "p": throughput_p,
+                            "regression": -change > threshold and (throughput_p is None or throughput_p < alpha)})
+
+        # p99 latency.  Tested on every latency, cut down for long runs
+        latency_p = None
+        if has_samples:
+            latency_p = mann_whitney(_cut_down(decode_samples(baseline_samples["durations"])),
+                                     _cut_down(decode_samples(current_samples["durations"])))
+
+        baseline_p99 = baseline_test["summary"]["latency"]["p99"]
+        current_p99 = current_test["summary"]["latency"]["p99"]
+        change = _change(baseline_p99, current_p99)
+
+        comparisons.append({"test": name, "metric": "p99", "baseline": baseline_p99, "current": current_p99,
+                            "change": change, "p": latency_p,
+                            "regression": change > threshold and (latency_p is None or latency_p < alpha)})
+
+    return comparisons
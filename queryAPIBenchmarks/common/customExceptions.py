@@ -10,9 +10,7 @@ __email__ = 'jon.giffard@neo4j.com'
 __status__ = 'Alpha'
 
 
-import inspect
 # Generic/Built-in
-import sys
 
 # Other Libs
 
@@ -20,23 +18,67 @@ import sys
 # Owned
 
 
+# Error classes whose transactions may succeed if they are tried again
+TRANSIENT_CLASSES = ("TransientError", "NetworkError")
+
+# HTTP statuses, of responses that were not from the Query API, that may succeed if tried again
+TRANSIENT_STATUSES = (429, 502, 503, 504)
+
 
 class APIException(Exception):
     """
-    Base exception for API errors that suppresses traceback information.
+    An error from the Query API, or from the network on the way to it.  Tests count these by code and class,
+    see BenchmarkResult.record_error(), and carry on rather than stopping
+
+    code - the Neo4j error code e.g Neo.TransientError.Request.ResourceExhaustion, the httpx exception
+           e.g ConnectTimeout, or HTTP and the status when the response was not from the Query API
+    error_class - the Neo4j classification e.g ClientError or TransientError, NetworkError or HTTPError
+    retries - the times the transaction was tried again before giving up
     """
-    # Extends Exception class 
-    # to stops the traceback information being shown
-    def __init__(self, message):
- 
-        try:
-            ln = sys.exc_info()[-1].tb_lineno
-        except AttributeError:
-            ln = inspect.currentframe().f_back.f_lineno
-        self.args = "{0.__name__} : {1}".format(type(self), message),
 
-        print(f"Error: {self.args}")
-        sys.exit(1)
+    def __init__(self, message, code: str = "", error_class: str = "", status: int = 0):
+        super().__init__(message)
+
+        self.code = code or "Unknown"
+        self.status = status
+        self.retries = 0
+
+        # Neo4j codes are Neo.Classification.Category.Title
+        if not error_class:
+            parts = self.code.split(".")
+            error_class = parts[1] if len(parts) > 2 and parts[0] == "Neo" else "Unknown"
+
+        self.error_class = error_class
+
+
+    @property
+    def transient(self) -> bool:
+        """
+        True when the transaction may succeed if it is tried again
+        """
+        return self.error_class in TRANSIENT_CLASSES or (self.error_class == "HTTPError" and self.status in TRANSIENT_STATUSES)
+
+
+    def __str__(self) -> str:
+        return f"{self.code}: {self.args[0]}"
 
 
-    pass
\ No newline at end of file
+class WorkerAgentError(Exception):
+    """
+    A worker agent of a distributed test could not be reached, refused the test or failed while running it.
+    The other agents have been asked to stop.
+
+    result - what the agents that did report recorded, marked cancelled, or None when none did
+    """
+
+    def __init__(self, message, result=None):
+        super().__init__(message)
+
+        self.result = result
+
+
+class ProcessStartError(Exception):
+    """
+    A process of a test run in more than one process, see MultiProcess, failed to start or was not ready in time.
+    The other processes have been stopped
+    """
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import json
+
+# Owned
+
+
+# The port a worker agent listens on unless told otherwise
+WORKER_PORT = 7690
+
+# Messages between a coordinator and a worker agent are JSON, one per line.  Each has a type:
+#
+#   coordinator -> worker   time       {"token"} asks for the worker's clock so that the start time can be given in it.
+#                                      Always the first message.  The worker closes the connection when the token is not its own
+#   worker -> coordinator   time       {"time": time.time() of the worker}
+#   coordinator -> worker   run        {"test", "start_at", "args", "load_profile", "parameters", "processes"}.  The user
+#                                      and password in args are None, each worker uses its own
+#   coordinator -> worker   stop       stops the test running, as Ctrl-C would.  Sent when another worker fails
+#   worker -> coordinator   progress   {"done": transactions finished so far}
+#   worker -> coordinator   result     {"report": BenchmarkResult.histograms()}.  Marked cancelled when stopped
+#   worker -> coordinator   stopped    stopped before the test had a result
+#   worker -> coordinator   error      {"message"}
+
+
+def send_message(stream, message_type: str, **values):
+    """
+    Sends a message
+
+    :param stream - binary file from socket.makefile("rwb")
+    :param message_type - the type of message
+    :param values - the rest of the message
+    :return: None
+    """
+    stream.write(json.dumps({"type": message_type, **values}).encode() + b"\n")
+    stream.flush()
+
+
+def receive_message(stream) -> dict:
+    """
+    Waits for the next message
+
+    :param stream - binary file from socket.makefile("rwb")
+    :return: dict with the type of message and its values
+    """
+    line = stream.readline()
+
+    if not line:
+        raise ConnectionError("Connection closed")
+
+    return json.loads(line)
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    """
+    Splits host:port into its parts.  The port is WORKER_PORT when not given
+    """
+    host, _, port = address.strip().rpartition(":")
+
+    if not host:
+        return port, WORKER_PORT
+
+    return host, int(port)
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+
+# Owned
+from .latencyHistogram import LatencyHistogram
+from .profiler import Profiler
+from .resourceSampler import ResourceSampler
+
+
+class HistogramResult:
+    """
+    The outcome of a test run on several machines at once, merged from the BenchmarkResult.histograms()
+    each of them sent back.  Has the same summary() as BenchmarkResult so is shown in the same way.
+
+    The machines start together so the test takes as long as the slowest of them.  Throughput is
+    every transaction from every machine over that time
+    """
+
+    def __init__(self, num_requests: int, target_rate: float = 0.0):
+        self.num_requests = num_requests
+        self.target_rate = target_rate
+        self.total_time: float = 0.0
+        self._measured_time: float = 0.0
+        self.latencies = LatencyHistogram()
+        self.phases: dict[str, LatencyHistogram] = {}
+        self.classes: dict[str, LatencyHistogram] = {}
+        self.http: dict[str, LatencyHistogram] = {}
+        self.errors: dict[str, dict] = {}
+        self.retries = 0
+        self.failed = LatencyHistogram()
+        self.retried = LatencyHistogram()
+        self.cancelled = False
+        self.resources: list[dict] = []
+        self.profile: dict = None
+        self.steps: list[dict] = []
+        self.search_trials: list[dict] = []
+        self.batch: dict = None
+
+
+    def merge(self, report: dict):
+        """
+        Adds the result of one machine
+
+        :param report - from BenchmarkResult.histograms()
+        :return: None
+        """
+        self.total_time = max(self.total_time, report["total_time"])
+        self._measured_time = max(self._measured_time, report["measured_time"])
+        self.latencies.merge(LatencyHistogram.from_dict(report["latency"]))
+
+        for name, histogram in report["phases"].items():
+            self.phases.setdefault(name, LatencyHistogram()).merge(LatencyHistogram.from_dict(histogram))
+
+        for name, histogram in report.get("classes", {}).items():
+            self.classes.setdefault(name, LatencyHistogram()).merge(LatencyHistogram.from_dict(histogram))
+
+        for name, histogram in report.get("http", {}).items():
+            self.http.setdefault(name, LatencyHistogram()).merge(LatencyHistogram.from_dict(histogram))
+
+        for code, error in report.get("errors", {}).items():
+            self.errors.setdefault(code, {"class": error["class"], "count": 0})["count"] += error["count"]
+
+        self.retries += report.get("retries", 0)
+        self.cancelled = self.cancelled or report.get("cancelled", False)
+        self.resources.extend(report.get("resources", []))
+        self.profile = Profiler.merge(self.profile, report.get("profile"))
+
+        if "failed" in report:
+            self.failed.merge(LatencyHistogram.from_dict(report["failed"]))
+            self.retried.merge(LatencyHistogram.from_dict(report["retried"]))
+
+        for index, step in enumerate(report["steps"]):
+            if index == len(self.steps):
+                self.steps.append({"step": step["step"], "start": step["start"], "workers": 0, "target_rate": 0.0,
+                                   "time": 0.0, "latency": LatencyHistogram()})
+
+            merged = self.steps[index]
+            merged["workers"] += step["workers"]
+            merged["target_rate"] += step["target_rate"]
+            merged["time"] = max(merged["time"], step["time"])
+            merged["latency"].merge(LatencyHistogram.from_dict(step["latency"]))
+
+
+    def samples(self) -> dict:
+        """
+        Only the histogram of latencies is sent back by the workers so it stands in for the samples
+        """
+        return {"histogram": self.latencies.to_dict(),
+                "resources": [report["samples"] for report in self.resources]}
+
+
+    def measured_time(self) -> float:
+        return self._measured_time
+
+
+    def requests_per_second(self) -> float:
+        if self._measured_time <= 0:
+            return 0.0
+
+        return self.latencies.count / self._measured_time
+
+
+    def error_rate(self) -> float:
+        if self.failed.count + self.latencies.count == 0:
+            return 0.0
+
+        return self.failed.count / (self.failed.count + self.latencies.count)
+
+
+    def summary(self) -> dict:
+        """
+        Machine readable summary of the test in the same form as BenchmarkResult.summary().  Latencies are in seconds
+
+        :return: dict
+        """
+        summary = {
+            "num_requests": self.num_requests,
+            "total_time": self.total_time,
+            "measured_time": self._measured_time,
+            "requests_per_second": self.requests_per_second(),
+            "target_rate": self.target_rate,
+            "latency": self.latencies.summary()
+        }
+
+        if self.phases:
+            summary["phases"] = {name: histogram.summary() for name, histogram in self.phases.items()}
+
+        if self.classes:
+            summary["classes"] = {name: {"requests_per_second": histogram.count / self._measured_time if self._measured_time > 0 else 0.0,
+                                         "latency": histogram.summary()}
+                                  for name, histogram in self.classes.items()}
+
+        if any(histogram.count for histogram in self.http.values()):
+            summary["http"] = {name: histogram.summary() for name, histogram in self.http.items()}
+
+        if self.errors or self.retries:
+            summary["errors"] = {"failed": self.failed.count,
+                                 "error_rate": self.error_rate(),
+                                 "retries": self.retries,
+                                 "by_code": self.errors,
+                                 "failed_latency": self.failed.summary(),
+                                 "retried_latency": self.retried.summary()}
+
+        if self.search_trials:
+            summary["search"] = self.search_trials
+
+        if self.cancelled:
+            summary["cancelled"] = True
+
+        if self.resources:
+            summary["resources"] = ResourceSampler.combine(self.resources)
+
+        if self.profile:
+            summary["profile"] = Profiler.summarise(self.profile)
+
+        if self.batch:
+            summary["batch"] = self.batch | {"rows_per_second": summary["requests_per_second"] * self.batch["rows_per_transaction"]}
+
+        if self.steps:
+            summary["steps"] = [{"step": step["step"],
+                                 "start": step["start"],
+                                 "workers": step["workers"],
+                                 "target_rate": step["target_rate"],
+                                 "requests_per_second": step["latency"].count / step["time"] if step["time"] > 0 else 0.0,
+                                 "latency": step["latency"].summary()}
+                                for step in self.steps]
+
+        return summary
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import math
+
+# Owned
+from .latencyRecorder import PERCENTILES
+
+
+# Durations below this, in seconds, all go in the first bucket
+LOWEST = 1e-6
+
+# Each bucket is this much wider than the one before, so any duration is reported to within 1%
+GROWTH = 1.02
+_LOG_GROWTH = math.log(GROWTH)
+
+
+class LatencyHistogram:
+    """
+    Counts durations in buckets that grow in size by 2% each time, from 1 microsecond upwards.
+    Only buckets with something in them are kept so a histogram of a million transactions is a
+    few hundred numbers, small enough to send over a network, and histograms from different
+    machines can be merged by adding their counts together.
+
+    Count, total, min and max are exact.  Percentiles are the middle of the bucket they fall in.
+    All values are in seconds
+    """
+
+    def __init__(self):
+        self._counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.sum_squares = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+
+    @staticmethod
+    def _bucket(duration: float) -> int:
+        if duration <= LOWEST:
+            return 0
+
+        return int(math.log(duration / LOWEST) / _LOG_GROWTH) + 1
+
+
+    @staticmethod
+    def _middle(bucket: int) -> float:
+        if bucket == 0:
+            return LOWEST
+
+        return LOWEST * GROWTH ** (bucket - 0.5)
+
+
+    @classmethod
+    def from_durations(cls, durations):
+        """
+        A histogram of every duration in durations
+
+        :param durations - durations in seconds e.g from LatencyRecorder.window()
+        :return: LatencyHistogram
+        """
+        histogram = cls()
+
+        for duration in durations:
+            histogram.record(duration)
+
+        return histogram
+
+
+    def record(self, duration: float):
+        """
+        Adds one duration, in seconds, to the histogram
+        """
+        bucket = LatencyHistogram._bucket(duration)
+        self._counts[bucket] = self._counts.get(bucket, 0) + 1
+
+        self.count += 1
+        self.total += duration
+        self.sum_squares += duration * duration
+        self.min = min(self.min, duration)
+        self.max = max(self.max, duration)
+
+
+    def merge(self, other):
+        """
+        Adds the counts of another histogram to this one
+
+        :param other - LatencyHistogram
+        :return: None
+        """
+        for bucket, count in other._counts.items():
+            self._counts[bucket] = self._counts.get(bucket, 0) + count
+
+        self.count += other.count
+        self.total += other.total
+        self.sum_squares += other.sum_squares
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+
+    def percentile(self, pct: float) -> float:
+        """
+        Nearest rank percentile, to within the width of a bucket
+
+        :param pct - the percentile to find e.g 99.9
+        :return: the duration at that percentile
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = max(math.ceil(pct / 100.0 * self.count), 1)
+        seen = 0
+
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+
+            if seen >= rank:
+                # The exact min and max are better than the middle of their buckets
+                return min(max(LatencyHistogram._middle(bucket), self.min), self.max)
+
+        return self.max
+
+
+    def summary(self) -> dict:
+        """
+        Summarises the histogram with the same keys as LatencyRecorder.summary()
+
+        :return: dict with count, total, mean, stddev, min, max and a pNN entry for each of PERCENTILES
+        """
+        summary = {"count": self.count, "total": 0.0, "mean": 0.0, "stddev": 0.0, "min": 0.0, "max": 0.0}
+        summary.update({f"p{pct:g}": 0.0 for pct in PERCENTILES})
+
+        if self.count == 0:
+            return summary
+
+        mean = self.total / self.count
+
+        summary["total"] = self.total
+        summary["mean"] = mean
+        summary["stddev"] = math.sqrt(max(self.sum_squares / self.count - mean * mean, 0.0))
+        summary["min"] = self.min
+        summary["max"] = self.max
+
+        for pct in PERCENTILES:
+            summary[f"p{pct:g}"] = self.percentile(pct)
+
+        return summary
+
+
+    def to_dict(self) -> dict:
+        """
+        The histogram as plain values that can be sent as JSON.  See from_dict()
+        """
+        return {"buckets": sorted(self._counts.items()),
+                "count": self.count,
+                "total": self.total,
+                "sum_squares": self.sum_squares,
+                "min": self.min if self.count else 0.0,
+                "max": self.max}
+
+
+    @classmethod
+    def from_dict(cls, values: dict):
+        """
+        Rebuilds a histogram from to_dict()
+        """
+        histogram = cls()
+        histogram._counts = {int(bucket): int(count) for bucket, count in values["buckets"]}
+        histogram.count = values["count"]
+        histogram.total = values["total"]
+        histogram.sum_squares = values["sum_squares"]
+        histogram.min = values["min"] if values["count"] else math.inf
+        histogram.max = values["max"]
+
+        return histogram
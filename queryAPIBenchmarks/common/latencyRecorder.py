@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import math
+import threading
+from array import array
+
+# Owned
+
+
+# Percentiles reported for every test
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyRecorder:
+    """
+    Records the start time and duration, in seconds, of every transaction in a test.
+
+    Samples are kept in two arrays of C doubles rather than a list of Python objects
+    so that recording a million transactions costs 16MB and no per sample allocation.
+    Start times come from time.perf_counter() and so are monotonic.
+    """
+
+    def __init__(self):
+        self._starts = array('d')
+        self._durations = array('d')
+        # Threads benchmarks record from many threads at once.  The lock keeps
+        # the start and duration of a sample at the same index in both arrays
+        self._lock = threading.Lock()
+
+
+    def __len__(self) -> int:
+        return len(self._durations)
+
+
+    def record(self, start: float, duration: float):
+        """
+        Records a single transaction
+
+        :param start - the perf_counter() value when the transaction started
+        :param duration - how long the transaction took in seconds
+        :return: None
+        """
+        with self._lock:
+            self._starts.append(start)
+            self._durations.append(duration)
+
+
+    def dump(self) -> tuple[bytes, bytes]:
+        """
+        The raw bytes of the start and duration arrays.  Used to send every sample
+        to another process in one go rather than pickling each of them
+
+        :return: tuple of starts, durations
+        """
+        with self._lock:
+            return self._starts.tobytes(), self._durations.tobytes()
+
+
+    def load(self, starts: bytes, durations: bytes):
+        """
+        Adds samples from dump(), perhaps made in another process.  perf_counter() is
+        system wide on the platforms we support so start times can be compared across processes
+
+        :param starts - bytes of the start times
+        :param durations - bytes of the durations
+        :return: None
+        """
+        with self._lock:
+            self._starts.frombytes(starts)
+            self._durations.frombytes(durations)
+
+
+    @property
+    def starts(self) -> array:
+        return self._starts
+
+
+    @property
+    def durations(self) -> array:
+        return self._durations
+
+
+    @staticmethod
+    def percentile(sorted_durations, pct: float) -> float:
+        """
+        Nearest rank percentile of an already sorted sequence
+
+        :param sorted_durations - durations sorted in ascending order
+        :param pct - the percentile to find e.g 99.9
+        :return: the duration at that percentile
+        """
+        if len(sorted_durations) == 0:
+            return 0.0
+
+        rank = math.ceil(pct / 100.0 * len(sorted_durations))
+        return sorted_durations[max(rank, 1) - 1]
+
+
+    def window(self, start_from: float = None, start_to: float = None):
+        """
+        The durations of the transactions that started inside a window of time
+
+        :param start_from - ( optional ) perf_counter() time the window starts
+        :param start_to - ( optional ) perf_counter() time the window ends
+        :return: the durations, as an array when there is no window
+        """
+        if start_from is None and start_to is None:
+            return self._durations
+
+        start_from = float("-inf") if start_from is None else start_from
+        start_to = float("inf") if start_to is None else start_to
+
+        return [duration for start, duration in zip(self._starts, self._durations) if start_from <= start < start_to]
+
+
+    def summary(self, start_from: float = None, start_to: float = None) -> dict:
+        """
+        Summarises the recorded durations.  All values are in seconds
+
+        :param start_from - ( optional ) only include transactions that started at or after this perf_counter() time
+        :param start_to - ( optional ) only include transactions that started before this perf_counter() time
+        :return: dict with count, total, mean, stddev, min, max and a pNN entry for each of PERCENTILES
+        """
+        sorted_durations = sorted(self.window(start_from, start_to))
+
+        count = len(sorted_durations)
+        summary = {"count": count, "total": 0.0, "mean": 0.0, "stddev": 0.0, "min": 0.0, "max": 0.0}
+        summary.update({f"p{pct:g}": 0.0 for pct in PERCENTILES})
+
+        if count == 0:
+            return summary
+
+        total = math.fsum(sorted_durations)
+        mean = total / count
+
+        summary["total"] = total
+        summary["mean"] = mean
+        summary["stddev"] = math.sqrt(math.fsum((d - mean) ** 2 for d in sorted_durations) / count)
+        summary["min"] = sorted_durations[0]
+        summary["max"] = sorted_durations[-1]
+
+        for pct in PERCENTILES:
+            summary[f"p{pct:g}"] = LatencyRecorder.percentile(sorted_durations, pct)
+
+        return summary
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import math
+import time
+
+# Owned
+
+
+class LoadProfile:
+    """
+    Decides when each transaction in a test is sent, how many can be in flight and for how long the test runs.
+
+    By default tests are closed loop: a worker starts its next transaction as soon as
+    the previous one has finished, so a slow server slows down the load.
+
+    When a rate is given the test is open loop: transactions are sent on a fixed timetable
+    of rate per second regardless of how long the server takes to respond.  Latency is then
+    measured from when a transaction should have been sent rather than when it was, so time
+    spent waiting for a free worker is counted ( corrects for coordinated omission ).
+
+    A test either sends a fixed number of transactions or, when a duration is given, runs for
+    warm_up + duration + cool_down seconds.  Transactions started during the warm up and cool down
+    are not included in the results.  Every step_every seconds the number of workers can be raised
+    by step_workers and the rate by step_rate, or with ramp the rate rises smoothly instead of in steps.
+    All times are in seconds and measured from the start of the test
+    """
+
+    def __init__(self, rate: float = 0.0, duration: float = 0.0, warm_up: float = 0.0, cool_down: float = 0.0,
+                 step_every: float = 0.0, step_workers: int = 0, step_rate: float = 0.0, ramp: bool = False):
+        self.rate = rate
+        self.duration = duration
+        self.warm_up = warm_up
+        self.cool_down = cool_down
+        self.step_every = step_every
+        self.step_workers = step_workers
+        self.step_rate = step_rate
+        self.ramp = ramp
+
+
+    def for_process(self, processes: int):
+        """
+        The profile for one of a number of processes running the same test at the same time.
+        Each process sends its share of the rate.  Workers are per process so are unchanged
+
+        :param processes - the number of processes
+        :return: LoadProfile
+        """
+        return LoadProfile(self.rate / processes, self.duration, self.warm_up, self.cool_down,
+                           self.step_every, self.step_workers, self.step_rate / processes, self.ramp)
+
+
+    @property
+    def open_loop(self) -> bool:
+        return self.rate > 0
+
+
+    @property
+    def timed(self) -> bool:
+        return self.duration > 0
+
+
+    @property
+    def stepped(self) -> bool:
+        # Steps only happen during a timed test so that we know when the last one is
+        return self.timed and self.step_every > 0 and (self.step_workers > 0 or self.step_rate > 0)
+
+
+    @property
+    def run_time(self) -> float:
+        """
+        How long a timed test runs for, including the warm up and cool down
+        """
+        return self.warm_up + self.duration + self.cool_down
+
+
+    def expected_tests(self, number_tests: int):
+        """
+        The number of transactions the test will send, or None when the test runs for a duration
+        """
+        return None if self.timed else number_tests
+
+
+    def phases(self, tx_phases: tuple = ()) -> tuple:
+        """
+        The phases to record for each transaction.  Open loop tests add a queue phase
+        for the time between when a transaction should have been sent and when it was
+
+        :param tx_phases - the phases of the transaction itself e.g MANAGED_TX_PHASES
+        :return: tuple of phase names
+        """
+        if self.open_loop:
+            return ("queue",) + (tx_phases or ("run",))
+
+        return tx_phases
+
+
+    def _step(self, elapsed: float) -> int:
+        # Which step of the profile we are in.  The first step is 0
+        if not self.stepped:
+            return 0
+
+        return int(elapsed // self.step_every)
+
+
+    def rate_at(self, elapsed: float) -> float:
+        """
+        The target rate at elapsed seconds into the test
+        """
+        if self.ramp and self.step_every > 0:
+            return self.rate + self.step_rate * elapsed / self.step_every
+
+        return self.rate + self.step_rate * self._step(elapsed)
+
+
+    def workers_at(self, elapsed: float, workers: int) -> int:
+        """
+        The number of transactions that may be in flight at elapsed seconds into the test
+        """
+        return workers + self.step_workers * self._step(elapsed)
+
+
+    def max_workers(self, workers: int) -> int:
+        """
+        The largest number of workers the test will need
+        """
+        if self.stepped:
+            return self.workers_at(self.run_time, workers)
+
+        return workers
+
+
+    def worker_start(self, worker_number: int, workers: int) -> float:
+        """
+        How many seconds into the test a worker joins in.  Workers added by
+        later steps wait until their step starts
+
+        :param worker_number - the worker, counting from 0
+        :param workers - the number of workers at the start of the test
+        :return: seconds from the start of the test
+        """
+        if worker_number < workers:
+            return 0.0
+
+        return self.step_every * math.ceil((worker_number - workers + 1) / self.step_workers)
+
+
+    def intended_times(self, number_tests: int, start_time: float = None):
+        """
+        Generator giving the perf_counter() time each transaction should be sent at.
+        Gives None for each transaction when closed loop as they are sent as soon as possible.
+        Does not wait for the time to arrive, see schedule() for that
+
+        :param number_tests - the number of transactions to send.  Ignored for a timed test
+        :param start_time - ( optional ) perf_counter() time the test started.  Defaults to now
+        """
+        if start_time is None:
+            start_time = time.perf_counter()
+
+        end_time = start_time + self.run_time
+        test_number = 0
+
+        # Next time a transaction is due when open loop
+        intended = start_time
+
+        while True:
+            if self.timed:
+                # Closed loop tests stop when time is up.  Open loop once the timetable reaches the end
+                if (intended if self.open_loop else time.perf_counter()) >= end_time:
+                    return
+            elif test_number >= number_tests:
+                return
+
+            test_number += 1
+
+            if not self.open_loop:
+                yield None
+                continue
+
+            yield intended
+
+            # The gap to the next transaction depends on the rate at this point in the test
+            intended += 1.0 / self.rate_at(intended - start_time)
+
+
+    def schedule(self, number_tests: int, start_time: float = None):
+        """
+        Generator giving the same values as intended_times() but, when open loop, sleeps
+        until each transaction is due.  If we have fallen behind the timetable there is no
+        sleep so that we catch up
+
+        :param number_tests - the number of transactions to send.  Ignored for a timed test
+        :param start_time - ( optional ) perf_counter() time the test started.  Defaults to now
+        """
+        for intended in self.intended_times(number_tests, start_time):
+            if intended is not None:
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            yield intended
+
+
+    def measurement_window(self, start_time: float, end_time: float) -> tuple[float, float]:
+        """
+        The part of the test to include in the results, leaving out the warm up and cool down
+
+        :param start_time - perf_counter() time the test started
+        :param end_time - perf_counter() time the test finished
+        :return: tuple of perf_counter() times
+        """
+        return start_time + self.warm_up, max(end_time - self.cool_down, start_time + self.warm_up)
+
+
+    def steps(self, start_time: float, end_time: float, workers: int, step_workers: bool = True) -> list[dict]:
+        """
+        The steps of a stepped test, each with when it starts in seconds from the start of the test,
+        the perf_counter() times it covers and its workers and target rate.
+        Steps are cut to fit inside the measurement window
+
+        :param start_time - perf_counter() time the test started
+        :param end_time - perf_counter() time the test finished
+        :param workers - the number of workers at the start of the test
+        :param step_workers - ( optional ) False for tests that always have the same number of workers
+        :return: list of dict, one per step
+        """
+        if not self.stepped:
+            return []
+
+        measure_from, measure_to = self.measurement_window(start_time, end_time)
+        steps = []
+
+        # Transactions still in flight can take the test a little past its run time.
+        # That is not the start of another step
+        for step in range(math.ceil(min(end_time - start_time, self.run_time) / self.step_every)):
+            step_from = max(start_time + step * self.step_every, measure_from)
+            step_to = min(start_time + (step + 1) * self.step_every, measure_to)
+
+            if step_to <= step_from:
+                continue
+
+            steps.append({"step": step,
+                          "start": step * self.step_every,
+                          "from": step_from,
+                          "to": step_to,
+                          "workers": self.workers_at(step * self.step_every, workers) if step_workers else workers,
+                          "target_rate": self.rate_at(step * self.step_every)})
+
+        return steps
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import collections
+import itertools
+import time
+
+# Owned
+from .benchmarkResult import BenchmarkResult
+from .customExceptions import APIException
+
+# Neo4j rolls back a transaction that has not been used for this many seconds
+TX_LIFETIME = 30
+
+# A transaction kept open for more work is committed once it has been open, or left unused, for this many
+# seconds so that it is never close to being rolled back
+REUSE_FOR = 20
+
+
+class TransactionShape:
+    """
+    How each managed transaction of a test is made up.  By default a transaction is begun, runs one statement
+    and is committed, three round trips for one statement.
+
+    statements - the number of statements, each with its own parameters, to run in each transaction
+    pipeline - send the first statement with the request that begins the transaction and the last one with the commit.
+               The Query API takes one statement per request so this is as far as statements can be pipelined
+    reuse - the number of transactions' worth of statements to run in one transaction before it is committed.
+            It is kept open in between and committed early when it reaches REUSE_FOR seconds
+    """
+
+    def __init__(self, statements: int = 1, pipeline: bool = False, reuse: int = 1):
+        if statements < 1:
+            raise ValueError("A transaction needs at least one statement")
+
+        if reuse < 1:
+            raise ValueError("A transaction must be used at least once")
+
+        self.statements = statements
+        self.pipeline = pipeline
+        self.reuse = reuse
+
+
+    def expected_statements(self, expected_tests: int | None) -> int | None:
+        """
+        The number of statements a test will run, None for a timed test.  See LoadProfile.expected_tests()
+        """
+        if expected_tests is None:
+            return None
+
+        return expected_tests * self.statements
+
+
+class ManagedTransactions:
+    """
+    Runs the managed transactions of a test in the shape given by a TransactionShape.
+
+    Transactions kept open for reuse are shared by every worker of the test.  Only one worker has a transaction
+    at a time, it takes it from a deque and puts it back when finished.  Appending to and popping from a deque
+    are atomic so threads do not need a lock.  Transactions still open at the end of the test are committed by
+    commit_open()
+
+    Each use of a transaction, one transaction's worth of statements, is kept with it and only recorded in the
+    result once the transaction has been committed, as until then nothing it did has been written.  A transaction
+    that fails is not put back.  Neo4j has rolled it back, so every earlier use of it is recorded as failed with
+    the error, and the next worker begins a new one.  The use that failed is left to the caller to try again
+    """
+
+    def __init__(self, result: BenchmarkResult, tx_shape: TransactionShape = None):
+        """
+        :param result - where to record how long each use of a transaction, and each of its phases, took
+        :param tx_shape - ( optional ) how each transaction is made up
+        """
+        self.result = result
+        self.tx_shape = tx_shape or TransactionShape()
+
+        # Open transactions as [ tx id, cluster affinity, when opened, times used, when last used, uses not yet committed ].
+        # Each use is kept as ( begin, run and commit perf_counter() times, when it finished, the use from new_use() )
+        self._open = collections.deque()
+
+
+    def statements(self, tx_statements) -> list:
+        """
+        Takes the statements and parameters of one transaction from the iterator shared by every worker.
+        Do this before the clock starts
+
+        :param tx_statements - from ParameterSource.statements()
+        :return: list of ( cypher, parameters )
+        """
+        return list(itertools.islice(tx_statements, self.tx_shape.statements))
+
+
+    @staticmethod
+    def new_use(intended: float = None) -> dict:
+        """
+        One transaction's worth of statements, given to run() each time it is tried.  Make it just before the first try
+
+        :param intended - ( optional ) for open loop tests, when the transaction should have been sent
+        :return: dict with when it should have been sent, when it was first tried and the times it has been tried
+        """
+        return {"intended": intended, "first_attempt": time.perf_counter(), "tries": 0}
+
+
+    def _take(self) -> tuple[list, list]:
+        # An open transaction to use, or a new one to begin, and any open transactions
+        # left unused for too long.  These are committed rather than left to roll back
+        now = time.monotonic()
+        stale = []
+
+        while self._open:
+            try:
+                tx = self._open.popleft()
+            except IndexError:
+                break
+
+            if now - tx[4] < REUSE_FOR:
+                return tx, stale
+
+            stale.append(tx)
+
+        return [None, "", now, 0, now, []], stale
+
+
+    def _take_all(self) -> list:
+        # Every open transaction
+        taken = []
+
+        while self._open:
+            try:
+                taken.append(self._open.popleft())
+            except IndexError:
+                break
+
+        return taken
+
+
+    def _plan(self, statements: list, tx: list) -> tuple[tuple | None, list, tuple | None, bool]:
+        # Splits the statements between the begin, run and commit requests and works out
+        # whether the transaction is to be committed after them
+        first = last = None
+
+        tx[3] += 1
+        finishing = tx[3] >= self.tx_shape.reuse or time.monotonic() - tx[2] >= REUSE_FOR
+
+        if self.tx_shape.pipeline:
+            if tx[0] is None:
+                first, statements = statements[0], statements[1:]
+
+            if finishing and statements:
+                statements, last = statements[:-1], statements[-1]
+
+        return first, statements, last, finishing
+
+
+    def _committed(self, tx: list):
+        # Records every use of a transaction that has been committed
+        for tx_start, tx_run, tx_commit, tx_end, use in tx[5]:
+            self.result.record_phases(tx_start, tx_run, tx_commit, tx_end, intended=use["intended"],
+                                      retries=use["tries"] - 1, first_attempt=use["first_attempt"])
+
+
+    def _rolled_back(self, tx: list, error: APIException):
+        # Records every use of a transaction that Neo4j has rolled back as failed.  None of their work was written
+        for _, _, _, tx_end, use in tx[5]:
+            self.result.record_error(error, use["first_attempt"], tx_end, intended=use["intended"], retries=use["tries"] - 1)
+
+
+    def _finish(self, tx: list, finishing: bool):
+        # Records the uses of a transaction that has been committed, or puts it back for the next worker when it has more work to do
+        if finishing:
+            self._committed(tx)
+        else:
+            tx[4] = time.monotonic()
+            self._open.append(tx)
+
+
+    def _commit_each(self, txs: list, commit):
+        # Commits transactions taken from those open.  One that fails does not stop the others being committed
+        for tx in txs:
+            try:
+                commit(tx[0], tx[1])
+            except APIException as e:
+                self._rolled_back(tx, e)
+            else:
+                self._committed(tx)
+
+
+    async def _commit_each_async(self, txs: list, commit):
+        # As _commit_each() but commit is a coroutine
+        for tx in txs:
+            try:
+                await commit(tx[0], tx[1])
+            except APIException as e:
+                self._rolled_back(tx, e)
+            else:
+                self._committed(tx)
+
+
+    def run(self, statements: list, begin, run, commit, use: dict):
+        """
+        Runs one transaction's statements, beginning and committing the transaction as its shape needs.
+        Give it to RetryPolicy.run() to try it again on a transient error
+
+        :param statements - from statements()
+        :param begin - begins a transaction e.g TXsession.tx_session_id.  Given cypher and parameters when pipelining
+        :param run - runs a statement in a transaction e.g TXsession.tx_session_cypher
+        :param commit - commits a transaction e.g TXsession.tx_session_commit.  Given cypher and parameters when pipelining
+        :param use - from new_use()
+        :return: None.  How long the use, and each of its phases, took is recorded once its transaction has been committed.
+                 A phase that was not needed takes no time.  The APIException is raised when it fails
+        """
+        use["tries"] += 1
+
+        # Transactions left unused for too long are committed before the clock starts, so that
+        # their commits, and any failures, are not put down to this transaction
+        tx, stale = self._take()
+        self._commit_each(stale, commit)
+
+        tx_start = time.perf_counter()
+
+        first, statements, last, finishing = self._plan(statements, tx)
+
+        try:
+            # Begin our transaction when there is not one open already
+            if tx[0] is None:
+                tx[0], tx[1] = begin(cypher=first[0], parameters=first[1]) if first else begin()
+
+            tx_run = time.perf_counter()
+
+            # In our transaction context, run the cypher statements
+            for tx_cypher, tx_parameters in statements:
+                run(tx[0], tx_cypher, tx[1], tx_parameters)
+
+            tx_commit = time.perf_counter()
+
+            # Commit the transaction once it has done all of its work
+            if finishing:
+                commit(tx[0], tx[1], cypher=last[0], parameters=last[1]) if last else commit(tx[0], tx[1])
+
+        except APIException as e:
+            # Neo4j has rolled the transaction back, and with it the work of its earlier uses
+            self._rolled_back(tx, e)
+            raise
+
+        tx[5].append((tx_start, tx_run, tx_commit, time.perf_counter(), use))
+
+        self._finish(tx, finishing)
+
+
+    async def run_async(self, statements: list, begin, run, commit, use: dict):
+        """
+        As run() but begin, run and commit are coroutines e.g TXasyncSession.tx_async_id.  Give it to RetryPolicy.run_async()
+        """
+        use["tries"] += 1
+
+        tx, stale = self._take()
+        await self._commit_each_async(stale, commit)
+
+        tx_start = time.perf_counter()
+
+        first, statements, last, finishing = self._plan(statements, tx)
+
+        try:
+            # Begin our transaction when there is not one open already
+            if tx[0] is None:
+                tx[0], tx[1] = await (begin(cypher=first[0], parameters=first[1]) if first else begin())
+
+            tx_run = time.perf_counter()
+
+            # In our transaction context, run the cypher statements
+            for tx_cypher, tx_parameters in statements:
+                await run(tx[0], tx_cypher, tx[1], tx_parameters)
+
+            tx_commit = time.perf_counter()
+
+            # Commit the transaction once it has done all of its work
+            if finishing:
+                await (commit(tx[0], tx[1], cypher=last[0], parameters=last[1]) if last else commit(tx[0], tx[1]))
+
+        except APIException as e:
+            # Neo4j has rolled the transaction back, and with it the work of its earlier uses
+            self._rolled_back(tx, e)
+            raise
+
+        tx[5].append((tx_start, tx_run, tx_commit, time.perf_counter(), use))
+
+        self._finish(tx, finishing)
+
+
+    def commit_open(self, commit):
+        """
+        Commits the transactions that are still open at the end of a test, recording their uses.  This is not timed
+
+        :param commit - commits a transaction e.g TXsession.tx_session_commit
+        :return: None
+        """
+        self._commit_each(self._take_all(), commit)
+
+
+    async def commit_open_async(self, commit):
+        """
+        As commit_open() but commit is a coroutine
+        """
+        await self._commit_each_async(self._take_all(), commit)
@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import base64
+import itertools
+import json
+import multiprocessing
+import random
+import re
+import signal
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Owned
+from .requestEncoder import CONTENT_ENCODINGS, RESPONSE_FORMATS, compress
+
+
+# Transactions are rolled back by Neo4j when not used for this many seconds
+TX_TIMEOUT = 30
+
+# Paths of the Query API that are served
+QUERY_PATH = re.compile(r"^/db/(?P<db>[^/]+)/query/v2(?:/tx(?:/(?P<tx_id>[^/]+)(?P<commit>/commit)?)?)?$")
+
+
+class MockQueryAPIHandler(BaseHTTPRequestHandler):
+    """
+    Answers requests for /db/{db}/query/v2, /tx, /tx/{id} and /tx/{id}/commit as the Neo4j Query API would.
+    All of the settings are held on the server, see MockQueryAPIServer
+    """
+
+    # Keep connections open between requests as Neo4j does
+    protocol_version = "HTTP/1.1"
+
+    # Send each response in one write, with Nagle turned off, so that the mock does not add its own delay
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+
+    def log_message(self, format, *args):
+        # Logging every request would slow the server down
+        pass
+
+
+    def _typed(self) -> bool:
+        # Whether the client asked for typed JSON
+        return RESPONSE_FORMATS["typed"] in self.headers.get("Accept", "")
+
+
+    def _encoding(self) -> str:
+        # The first compression in the client's Accept-Encoding that the mock can do, identity when there is none
+        for accepted in self.headers.get("Accept-Encoding", "").split(","):
+            encoding = accepted.split(";")[0].strip()
+
+            if encoding in CONTENT_ENCODINGS:
+                return encoding
+
+        return "identity"
+
+
+    def _send(self, status: int, body: bytes, headers: dict = None):
+        # Sends a JSON response, in the format and with the compression asked for
+
+        encoding = self._encoding()
+        if encoding != "identity":
+            body = self.server.compressed(body, encoding)
+
+        self.send_response(status)
+        self.send_header("Content-Type", RESPONSE_FORMATS["typed"] if self._typed() else RESPONSE_FORMATS["json"])
+
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        self.end_headers()
+        self.wfile.write(body)
+        self.wfile.flush()
+
+
+    def _send_error(self, status: int, code: str, message: str):
+        # Errors are returned in the same shape as Neo4j uses
+        self._send(status, json.dumps({"errors": [{"code": code, "message": message}]}).encode())
+
+
+    def do_POST(self):
+        server = self.server
+
+        # Read the whole request even when it is not going to be used so the connection can be reused
+        body_length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(body_length)
+
+        match = QUERY_PATH.match(self.path)
+        if match is None:
+            self._send_error(404, "Neo.ClientError.Request.Invalid", f"No Query API at {self.path}")
+            return
+
+        if not server.authorised(self.headers.get("Authorization", "")):
+            self._send_error(401, "Neo.ClientError.Security.Unauthorized", "The client is unauthorized due to authentication failure.")
+            return
+
+        # Pretend to do some work
+        server.wait()
+
+        error = server.injected_error()
+        if error:
+            self._send_error(*error)
+            return
+
+        tx_id = match.group("tx_id")
+
+        if tx_id is None and self.path.endswith("/tx"):
+            # Begin a transaction
+            tx_id, expires = server.begin()
+            self._send(202, server.begin_body(tx_id, expires), server.affinity_header())
+
+        elif tx_id is None:
+            # Implicit transaction
+            self._send(202, server.typed_result_body if self._typed() else server.result_body)
+
+        elif not server.in_transaction(tx_id, self.headers.get("neo4j-cluster-affinity", "")):
+            self._send_error(404, "Neo.ClientError.Request.Invalid",
+                             f"Transaction with Id: '{tx_id}' was not found. It may have timed out and therefore rolled back "
+                             f"or the routing header 'neo4j-cluster-affinity' was not provided.")
+
+        elif match.group("commit"):
+            server.end(tx_id)
+            self._send(202, server.commit_body)
+
+        else:
+            # Run cypher in the transaction and extend its life
+            expires = server.extend(tx_id)
+            self._send(202, server.tx_result_body(tx_id, expires, self._typed()))
+
+
+    def do_DELETE(self):
+        server = self.server
+
+        match = QUERY_PATH.match(self.path)
+        tx_id = match.group("tx_id") if match else None
+
+        if tx_id is None or not server.in_transaction(tx_id, self.headers.get("neo4j-cluster-affinity", "")):
+            self._send_error(404, "Neo.ClientError.Request.Invalid", f"Transaction with Id: '{tx_id}' was not found.")
+            return
+
+        # Roll back the transaction
+        server.end(tx_id)
+        self._send(202, json.dumps({"data": {"fields": [], "values": []}, "bookmarks": []}).encode())
+
+
+class MockQueryAPIServer(ThreadingHTTPServer):
+    """
+    A stand in for the Neo4j Query API so that the client and every benchmark can be measured
+    without a Neo4j server.  Latency, jitter, errors and the size of results can all be chosen
+    so that a run can be repeated and give the same results
+    """
+
+    # A benchmark opens a lot of connections at once
+    request_queue_size = 1024
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 7474, usr: str = "", pwd: str = "", latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, error_code: str = "Neo.TransientError.Request.ResourceExhaustion",
+                 rows: int = 1, row_size: int = 8, cluster_affinity: str = "", seed: int = 0):
+        """
+        :param host - address to listen on
+        :param port - port to listen on.  0 picks a free port, see url
+        :param usr - ( optional ) username to expect.  Any credentials are accepted when not given
+        :param pwd - ( optional ) password to expect
+        :param latency - seconds to wait before answering each request
+        :param jitter - up to this many seconds are added to or taken from latency
+        :param error_rate - share of requests, 0 to 1, that fail with error_code
+        :param error_code - Neo4j error code returned for a failed request
+        :param rows - rows in the result of each cypher statement
+        :param row_size - size, in bytes, of the string value in each row.  Use with rows for large results
+        :param cluster_affinity - ( optional ) returned in the neo4j-cluster-affinity header as Aura does.
+                                  It must then be sent with each request in the transaction
+        :param seed - seeds latency, jitter and errors so that runs can be repeated
+        """
+
+        super().__init__((host, port), MockQueryAPIHandler)
+
+        self._latency = latency
+        self._jitter = jitter
+        self._error_rate = error_rate
+        self._error_code = error_code
+        self._cluster_affinity = cluster_affinity
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+        self._authorization = ""
+        if usr or pwd:
+            self._authorization = "Basic " + base64.b64encode(f"{usr}:{pwd}".encode()).decode()
+
+        # Open transactions and when each one expires
+        self._transactions: dict[str, float] = {}
+        self._transactions_lock = threading.Lock()
+        self._tx_ids = itertools.count(1)
+
+        # Results are the same for every request so they are only built once, in both formats
+        result_data = {"fields": ["n", "value"], "values": [[n, "x" * row_size] for n in range(rows)]}
+        self._result_data = json.dumps(result_data)
+        self.result_body = json.dumps({"data": result_data, "bookmarks": [self._bookmark()]}).encode()
+
+        typed_result_data = {"fields": ["n", "value"],
+                             "values": [[{"$type": "Integer", "_value": str(n)}, {"$type": "String", "_value": "x" * row_size}] for n in range(rows)]}
+        self._typed_result_data = json.dumps(typed_result_data)
+        self.typed_result_body = json.dumps({"data": typed_result_data, "bookmarks": [self._bookmark()]}).encode()
+        # Compressed results, by encoding and format.  Only results that are the same every time are kept
+        self._compressed: dict[tuple[str, bool], bytes] = {}
+
+        self.commit_body = json.dumps({"data": {"fields": [], "values": []}, "bookmarks": [self._bookmark()]}).encode()
+
+
+    @property
+    def url(self) -> str:
+        """
+        URL to give to the benchmarks as NEO4J_URL
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+    @staticmethod
+    def _bookmark() -> str:
+        return f"FB:{uuid.uuid4().hex}"
+
+
+    @staticmethod
+    def _expires(expires: float) -> str:
+        # Neo4j gives the time a transaction expires as UTC
+        return (datetime.now(timezone.utc) + timedelta(seconds=expires - time.monotonic())).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+    def authorised(self, authorization: str) -> bool:
+        return not self._authorization or authorization == self._authorization
+
+
+    def wait(self):
+        # Waits for latency plus or minus jitter
+        if self._latency <= 0 and self._jitter <= 0:
+            return
+
+        with self._random_lock:
+            jitter = self._random.uniform(-self._jitter, self._jitter)
+
+        time.sleep(max(0.0, self._latency + jitter))
+
+
+    def injected_error(self) -> tuple[int, str, str] | None:
+        # Returns the status, code and message of an error when this request should fail
+        if self._error_rate <= 0:
+            return None
+
+        with self._random_lock:
+            failed = self._random.random() < self._error_rate
+
+        if not failed:
+            return None
+
+        # Transient errors are returned as service unavailable, all others as bad request
+        status = 503 if ".TransientError." in self._error_code else 400
+
+        return status, self._error_code, f"Error {self._error_code} injected by the mock Query API"
+
+
+    def affinity_header(self) -> dict:
+        if self._cluster_affinity:
+            return {"neo4j-cluster-affinity": self._cluster_affinity}
+
+        return {}
+
+
+    def begin(self) -> tuple[str, float]:
+        # Opens a transaction and returns its id and when it expires
+        tx_id = f"{next(self._tx_ids)}"
+        expires = time.monotonic() + TX_TIMEOUT
+
+        with self._transactions_lock:
+            self._transactions[tx_id] = expires
+
+        return tx_id, expires
+
+
+    def in_transaction(self, tx_id: str, cluster_affinity: str) -> bool:
+        # A transaction can only be used when it has not expired and,
+        # when there is a cluster affinity, the request has sent it
+        if self._cluster_affinity and cluster_affinity != self._cluster_affinity:
+            return False
+
+        with self._transactions_lock:
+            expires = self._transactions.get(tx_id)
+
+            if expires is not None and expires < time.monotonic():
+                del self._transactions[tx_id]
+                expires = None
+
+        return expires is not None
+
+
+    def extend(self, tx_id: str) -> float:
+        # Each request in a transaction resets how long it has left
+        expires = time.monotonic() + TX_TIMEOUT
+
+        with self._transactions_lock:
+            self._transactions[tx_id] = expires
+
+        return expires
+
+
+    def end(self, tx_id: str):
+        # Commit or roll back the transaction
+        with self._transactions_lock:
+            self._transactions.pop(tx_id, None)
+
+
+    @property
+    def open_transactions(self) -> int:
+        with self._transactions_lock:
+            return len(self._transactions)
+
+
+    def compressed(self, body: bytes, encoding: str) -> bytes:
+        # Compresses a response body.  Results of implicit transactions are only compressed once
+        if body is not self.result_body and body is not self.typed_result_body:
+            return compress(body, encoding)
+
+        key = (encoding, body is self.typed_result_body)
+        compressed = self._compressed.get(key)
+
+        if compressed is None:
+            compressed = compress(body, encoding)
+            self._compressed[key] = compressed
+
+        return compressed
+
+
+    def begin_body(self, tx_id: str, expires: float) -> bytes:
+        return (f'{{"data": {{"fields": [], "values": []}}, "bookmarks": [], '
+                f'"transaction": {{"id": "{tx_id}", "expires": "{self._expires(expires)}"}}}}').encode()
+
+
+    def tx_result_body(self, tx_id: str, expires: float, typed: bool = False) -> bytes:
+        # The result is already JSON so only the transaction is added to it
+        return (f'{{"data": {self._typed_result_data if typed else self._result_data}, "bookmarks": [], '
+                f'"transaction": {{"id": "{tx_id}", "expires": "{self._expires(expires)}"}}}}').encode()
+
+
+def _serve(ready, settings: dict):
+    # Runs the mock in its own process and passes its URL back once it is listening.
+    # Ctrl-C is left to the benchmarks, which stop the mock once the transactions running have finished
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    server = MockQueryAPIServer(**settings)
+    ready.send(server.url)
+    ready.close()
+    server.serve_forever()
+
+
+def start_mock_query_api(**settings) -> tuple[multiprocessing.Process, str]:
+    """
+    Starts a MockQueryAPIServer in a process of its own so that it does not share the GIL with the benchmarks.
+
+    :param settings - passed to MockQueryAPIServer.  port defaults to 0, a free port
+    :return: the process, which must be terminated when finished with, and the URL of the mock
+    """
+
+    settings.setdefault("port", 0)
+
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_serve, args=(sender, settings), daemon=True)
+    process.start()
+
+    url = receiver.recv()
+    receiver.close()
+
+    return process, url
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import csv
+import itertools
+import json
+import random
+
+# Owned
+
+
+# Timed tests do not know how many transactions they will send so this many
+# parameters are made up front and used again from the start when they run out
+POOL_SIZE = 100000
+
+# Name of the parameter that holds the rows of a batch, for use as UNWIND $rows AS row
+BATCH_PARAMETER = "rows"
+
+
+def _number(value: str):
+    # Values from CSV files are sent as numbers when they look like one
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+
+    return value
+
+
+def _sequence(args: list, rng: random.Random, count: int, process: int, processes: int) -> list:
+    # sequence[:start[:step]]  start, start + step, ...  Processes take every processes'th value so none are repeated
+    start = int(args[0]) if len(args) > 0 else 1
+    step = int(args[1]) if len(args) > 1 else 1
+
+    return list(range(start + process * step, start + (process + count * processes) * step, step * processes))
+
+
+def _uniform(args: list, rng: random.Random, count: int, process: int, processes: int) -> list:
+    # uniform:low:high  whole numbers from low to high, each as likely as any other
+    low, high = int(args[0]), int(args[1])
+
+    return [rng.randint(low, high) for _ in range(count)]
+
+
+def _zipf(args: list, rng: random.Random, count: int, process: int, processes: int) -> list:
+    # zipf:n[:s]  whole numbers from 1 to n where 1 is the most likely, 2 the next and so on.
+    # The chance of k is proportional to 1 / k ** s.  s is 1 when not given
+    n = int(args[0])
+    s = float(args[1]) if len(args) > 1 else 1.0
+
+    cum_weights = list(itertools.accumulate(1 / k ** s for k in range(1, n + 1)))
+
+    return rng.choices(range(1, n + 1), cum_weights=cum_weights, k=count)
+
+
+def _csv(args: list, rng: random.Random, count: int, process: int, processes: int) -> list:
+    # csv:file:column[:random]  values of a column of a CSV file with a header row, in order or at random
+    path, column = args[0], args[1]
+
+    with open(path, newline="") as f:
+        values = [_number(row[column]) for row in csv.DictReader(f)]
+
+    if not values:
+        raise ValueError(f"{path} has no rows")
+
+    if len(args) > 2 and args[2] == "random":
+        return rng.choices(values, k=count)
+
+    # Each process starts at a different row and takes every processes'th row
+    return [values[(process + index * processes) % len(values)] for index in range(count)]
+
+
+# Kinds of generator and the function that makes count values for each of them.
+# Add to this with register_generator()
+GENERATORS = {
+    "sequence": _sequence,
+    "uniform": _uniform,
+    "zipf": _zipf,
+    "csv": _csv
+}
+
+
+def register_generator(kind: str, generator):
+    """
+    Adds a kind of generator that can then be used in a parameter spec as kind:arg:arg...
+
+    :param kind - the name of the generator
+    :param generator - function(args, rng, count, process, processes) returning a list of count values
+    :return: None
+    """
+    GENERATORS[kind] = generator
+
+
+class ParameterSource:
+    """
+    Makes the parameters sent with the cypher statement of each transaction, so that transactions
+    do not all run with the same literal values.  Each parameter has a spec of kind:arg:arg e.g
+
+        id=sequence:1          1, 2, 3, ...
+        id=uniform:1:1000000   random whole numbers between 1 and 1000000
+        id=zipf:1000000:1.1    random whole numbers between 1 and 1000000 where low numbers are most likely
+        name=csv:people.csv:name[:random]   values of the name column of people.csv, in order or at random
+
+    Values are made in bulk before a test starts so that making them does not add to its latency.
+    Random values are seeded so the same parameters are sent every time a test is run.  When a test
+    is shared between processes or worker agents, each has its own share of a sequence and its own seed.
+
+    With a batch size, the specs are the fields of a row instead and each statement is sent one
+    parameter, rows, holding a list of that many rows e.g for UNWIND $rows AS row CREATE (:Person {id: row.id})
+    """
+
+    def __init__(self, specs: dict, seed: int = 0, process: int = 0, processes: int = 1, batch: int = 0):
+        """
+        :param specs - spec of each parameter, or of each field of a row when batch is given, by name
+        :param seed - seeds the random generators
+        :param process - which of processes this source is for
+        :param processes - the number of processes sharing the test
+        :param batch - ( optional ) rows to send with each statement as the rows parameter
+        """
+        self.specs = specs
+        self.seed = seed
+        self.process = process
+        self.processes = processes
+        self.batch = batch
+
+        for name, spec in specs.items():
+            kind = spec.split(":")[0]
+            if kind not in GENERATORS:
+                raise ValueError(f"Unknown generator {kind} for parameter {name}.  Use one of {', '.join(GENERATORS)}")
+
+
+    @staticmethod
+    def parse(param_options: tuple, seed: int = 0):
+        """
+        A ParameterSource from name=spec strings e.g from the command line.  None when there are none
+
+        :param param_options - name=spec strings
+        :param seed - seeds the random generators
+        :return: ParameterSource or None
+        """
+        if not param_options:
+            return None
+
+        specs = {}
+        for option in param_options:
+            name, separator, spec = option.partition("=")
+            if not separator or not name or not spec:
+                raise ValueError(f"{option} is not name=spec")
+            specs[name] = spec
+
+        return ParameterSource(specs, seed)
+
+
+    def for_process(self, process: int, processes: int):
+        """
+        The source for one of a number of processes running the same test.
+        Processes can themselves be shared again, e.g by a worker agent running several processes
+        """
+        return ParameterSource(self.specs, self.seed, self.process * processes + process, self.processes * processes, self.batch)
+
+
+    def for_batch(self, batch: int):
+        """
+        The same source sending batch rows with each statement
+        """
+        return ParameterSource(self.specs, self.seed, self.process, self.processes, batch)
+
+
+    def to_dict(self) -> dict:
+        return {"specs": self.specs, "seed": self.seed, "process": self.process, "processes": self.processes, "batch": self.batch}
+
+
+    @staticmethod
+    def from_dict(values: dict):
+        return ParameterSource(values["specs"], values["seed"], values["process"], values["processes"], values.get("batch", 0))
+
+
+    @property
+    def pool_size(self) -> int:
+        """
+        The number of parameter sets made for a timed test.  Fewer when batching so the rows made stay about POOL_SIZE
+        """
+        return max(POOL_SIZE // self.batch, 1) if self.batch else POOL_SIZE
+
+
+    def generate(self, count: int) -> dict:
+        """
+        Makes count values for each parameter.  When batching, count batches of rows
+
+        :param count - the number of values to make
+        :return: list of values by the name of each parameter
+        """
+        columns = {}
+        rows = count * self.batch if self.batch else count
+
+        for name, spec in self.specs.items():
+            kind, *args = spec.split(":")
+            # Seeded from the name as well so that parameters with the same spec do not get the same values
+            rng = random.Random(f"{self.seed}:{name}:{self.process}")
+            columns[name] = GENERATORS[kind](args, rng, rows, self.process, self.processes)
+
+        if not self.batch:
+            return columns
+
+        # Make every row and then cut them up into batches
+        names = list(columns)
+        all_rows = [dict(zip(names, row)) for row in zip(*columns.values())]
+
+        return {BATCH_PARAMETER: [all_rows[start:start + self.batch] for start in range(0, rows, self.batch)]}
+
+
+    def request_size(self, cypher: str) -> int:
+        """
+        Size, in bytes, of the JSON body of a request sending cypher with one set of parameters.
+        Values differ between sets so this is a guide to the size of every request
+
+        :param cypher - the cypher statement
+        :return: int
+        """
+        parameters = {name: values[0] for name, values in self.generate(1).items()}
+
+        return len(json.dumps({"statement": cypher, "parameters": parameters}).encode())
+
+
+    @staticmethod
+    def statements(cypher: str, source, count: int = None):
+        """
+        The cypher statement and parameters to send for each transaction of a test.  The iterator is made
+        from C iterators so can be shared by threads without a lock.  Each parameter dict is built as it is
+        taken, from values made up front
+
+        :param cypher - the cypher statement
+        :param source - ParameterSource, or None when the statement has no parameters
+        :param count - the number of transactions, None for a timed test
+        :return: iterator of ( cypher, parameters ).  parameters is None when there is no source
+        """
+        if source is None:
+            return itertools.repeat((cypher, None))
+
+        columns = source.generate(count if count is not None else source.pool_size)
+        names = list(columns)
+
+        # A timed test goes back to the start when the values run out
+        values = [iter(column) if count is not None else itertools.cycle(column) for column in columns.values()]
+
+        return map(lambda *row: (cypher, dict(zip(names, row))), *values)
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+# Owned
+
+
+# What can be profiled
+#   cpu - where the client's threads spend their CPU time, by sampling the stack of every thread
+#   alloc - where the memory still held at the end of the test was allocated, with tracemalloc
+PROFILE_MODES = ("cpu", "alloc")
+
+# How often, in seconds, the stack of every thread is sampled when profiling CPU
+PROFILE_EVERY = 0.01
+
+# The most frames kept for each allocation when profiling memory
+ALLOC_FRAMES = 32
+
+# Sites, or functions, shown for each test
+PROFILE_TOP = 20
+
+# Numbers in thread names, so that the threads of a pool are counted together
+_THREAD_NUMBER = re.compile(r"[-_]\d+")
+
+
+def _package(label: str) -> str:
+    """
+    PRIVATE
+    The top level package of a frame label from _frame_label() or _file_label() e.g httpx for httpx._client:send
+    """
+    return label.split(":", 1)[0].split(".", 1)[0]
+
+
+def _frame_label(code, module: str, labels: dict) -> str:
+    """
+    PRIVATE
+    module:function of a frame.  Kept in labels by code object as the same frames are seen again and again
+    """
+    label = labels.get(code)
+
+    if label is None:
+        # co_qualname, with the class of a method, is only there from Python 3.11
+        label = labels[code] = f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+    return label
+
+
+def _file_label(filename: str, lineno: int, modules: dict) -> str:
+    """
+    PRIVATE
+    module:line of an allocation, or the file name when it is not the file of a module that is loaded
+    """
+    return f"{modules.get(filename, os.path.basename(filename) or filename)}:{lineno}"
+
+
+class Profiler:
+    """
+    Profiles the timed part of a test, between start() and stop(), when asked to with enable().
+    Does nothing otherwise so every test can always start and stop one.
+
+    The cpu mode samples the stack of every thread every PROFILE_EVERY seconds.  Only threads whose CPU
+    time has gone up since the last sample are counted, where the CPU time of a thread can be read, so
+    workers waiting on Neo4j do not show.  Unlike cProfile it sees every thread, not just the one it was
+    started in, and adds little to the time each call takes.
+
+    The alloc mode traces memory allocations with tracemalloc.  Tracing slows the client down a lot so
+    the throughput and latency of a test profiled in this way should not be compared with those of others.
+
+    Both make collapsed stacks, one line per stack of frames separated by ; and its count, that flame
+    graph tools such as flamegraph.pl and speedscope read.  See write_folded()
+    """
+
+    # Set by enable().  In worker processes too, see MultiProcess and queryAPIWorker
+    mode: str = None
+    top: int = PROFILE_TOP
+
+    @staticmethod
+    def enable(mode: str = None, top: int = PROFILE_TOP):
+        """
+        Profiles every test started after this
+
+        :param mode - one of PROFILE_MODES, or None to stop profiling
+        :param top - the sites, or functions, to show for each test
+        :return: None
+        """
+        Profiler.mode = mode
+        Profiler.top = top
+
+
+    @staticmethod
+    def settings() -> dict:
+        """
+        The arguments to enable() with, in another process, to profile in the same way
+        """
+        return {"mode": Profiler.mode, "top": Profiler.top}
+
+
+    def __init__(self):
+        self._mode = Profiler.mode
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+        self._stacks = Counter()
+        self._samples = 0
+        self._cpu_clock = True
+
+
+    def _sample_stacks(self):
+        # Adds the stack of every thread that has used CPU since the last time, until stopped
+        own = threading.get_ident()
+        labels = {}
+        names = {}
+        last_cpu = {}
+
+        while not self._stop.wait(PROFILE_EVERY):
+            self._samples += 1
+
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+
+                try:
+                    cpu = time.clock_gettime(time.pthread_getcpuclockid(ident))
+                except (AttributeError, OSError):
+                    # Not known on this platform so every thread is counted, busy or not
+                    self._cpu_clock = False
+                else:
+                    idle = cpu <= last_cpu.get(ident, cpu)
+                    last_cpu[ident] = cpu
+
+                    if idle:
+                        continue
+
+                if ident not in names:
+                    names.update((thread.ident, _THREAD_NUMBER.sub("", thread.name)) for thread in threading.enumerate())
+
+                stack = []
+
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code, frame.f_globals.get("__name__", "?"), labels))
+                    frame = frame.f_back
+
+                stack.append(names.get(ident, "Thread"))
+                stack.reverse()
+
+                self._stacks[";".join(stack)] += 1
+
+
+    def start(self):
+        """
+        Starts profiling, when enabled.  Call just before the timed part of a test
+
+        :return: self
+        """
+        if self._mode == "cpu":
+            self._thread = threading.Thread(target=self._sample_stacks, name="Profiler", daemon=True)
+            self._thread.start()
+
+        elif self._mode == "alloc":
+            tracemalloc.start(ALLOC_FRAMES)
+
+        return self
+
+
+    def stop(self) -> dict:
+        """
+        Stops profiling.  Call just after the timed part of a test
+
+        :return: dict with the mode and collapsed stacks, counted in samples for cpu and in bytes for alloc.
+                 For alloc also the size and count of what was allocated at each site and the peak traced memory.
+                 None when not enabled
+        """
+        if self._mode == "cpu":
+            self._stop.set()
+            self._thread.join()
+
+            return {"mode": "cpu", "interval": PROFILE_EVERY, "samples": self._samples,
+                    "clock": "cpu" if self._cpu_clock else "wall", "stacks": dict(self._stacks)}
+
+        if self._mode == "alloc":
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            # Leave out allocations made by tracemalloc itself and anything allocated while importing, such as
+            # the modules a library only imports when first used
+            snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),
+                                               tracemalloc.Filter(False, "<frozen importlib._bootstrap>", all_frames=True),
+                                               tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>", all_frames=True),
+                                               tracemalloc.Filter(False, "<unknown>")))
+
+            modules = {module.__file__: name for name, module in list(sys.modules.items())
+                       if isinstance(getattr(module, "__file__", None), str)}
+
+            sites = {}
+            stacks = Counter()
+
+            for stat in snapshot.statistics("lineno"):
+                frame = stat.traceback[0]
+                sites[_file_label(frame.filename, frame.lineno, modules)] = [stat.size, stat.count]
+
+            # Frames are oldest first, as collapsed stacks need them
+            for stat in snapshot.statistics("traceback"):
+                stacks[";".join(_file_label(frame.filename, frame.lineno, modules) for frame in stat.traceback)] += stat.size
+
+            return {"mode": "alloc", "peak": peak, "sites": sites, "stacks": dict(stacks)}
+
+        return None
+
+
+    @staticmethod
+    def merge(profile: dict, other: dict) -> dict:
+        """
+        Adds together the profiles of two processes that ran the same test
+
+        :param profile - from stop(), or None
+        :param other - from stop(), or None
+        :return: dict in the same form as stop()
+        """
+        if not profile or not other:
+            return profile or other
+
+        merged = dict(profile)
+        merged["stacks"] = dict(Counter(profile["stacks"]) + Counter(other["stacks"]))
+
+        if profile["mode"] == "cpu":
+            merged["samples"] = profile["samples"] + other["samples"]
+            merged["clock"] = "cpu" if profile["clock"] == other["clock"] == "cpu" else "wall"
+        else:
+            merged["peak"] = max(profile["peak"], other["peak"])
+            merged["sites"] = {site: list(value) for site, value in profile["sites"].items()}
+
+            for site, (size, count) in other["sites"].items():
+                merged_site = merged["sites"].setdefault(site, [0, 0])
+                merged_site[0] += size
+                merged_site[1] += count
+
+        return merged
+
+
+    @staticmethod
+    def summarise(profile: dict, top: int = None) -> dict:
+        """
+        The packages and the sites, or functions, that used the most of a profile
+
+        :param profile - from stop() or merge()
+        :param top - ( optional ) the sites, or functions, to keep.  Profiler.top when not given
+        :return: dict with the mode, the share of the top packages as a %, and the top sites or functions.
+                 For cpu each function has the samples it was running in itself and those it was anywhere on the stack.
+                 For alloc each site has the bytes and blocks allocated there and the peak traced memory is given
+        """
+        top = top or Profiler.top
+        packages = Counter()
+
+        if profile["mode"] == "cpu":
+            own = Counter()
+            total = Counter()
+
+            for stack, count in profile["stacks"].items():
+                frames = stack.split(";")[1:]
+
+                if not frames:
+                    continue
+
+                own[frames[-1]] += count
+                packages[_package(frames[-1])] += count
+
+                for frame in set(frames):
+                    total[frame] += count
+
+            counted = sum(own.values())
+            summary = {"mode": "cpu", "samples": counted, "clock": profile["clock"],
+                       "top": [{"function": function, "self": 100 * count / counted, "total": 100 * total[function] / counted}
+                               for function, count in own.most_common(top)]}
+        else:
+            for site, (size, _) in profile["sites"].items():
+                packages[_package(site)] += size
+
+            counted = sum(packages.values())
+            summary = {"mode": "alloc", "peak": profile["peak"], "allocated": counted,
+                       "top": [{"site": site, "size": size, "count": count}
+                               for site, (size, count) in sorted(profile["sites"].items(), key=lambda item: -item[1][0])[:top]]}
+
+        summary["packages"] = {package: 100 * value / counted for package, value in packages.most_common(top)} if counted else {}
+
+        return summary
+
+
+    @staticmethod
+    def write_folded(profile: dict, filename: str):
+        """
+        Writes the collapsed stacks of a profile, the heaviest first, for a flame graph tool
+
+        :param profile - from stop() or merge()
+        :param filename - the file to write
+        :return: None
+        """
+        with open(filename, "w") as f:
+            for stack, count in sorted(profile["stacks"].items(), key=lambda item: -item[1]):
+                f.write(f"{stack} {count}\n")
@@ -11,6 +11,8 @@ __email__ = 'jon.giffard@neo4j.com'
 __status__ = 'Alpha'
 
 # Generic / built in
+import time
+
 from tqdm import tqdm
 
 # Owned
@@ -20,13 +22,56 @@ from tqdm import tqdm
 class ProgressBar:
     """
     A progress bar wrapper using tqdm for tracking the progress of test executions.
+
+    When a test is run in more than one process, each worker process calls share() so that
+    its progress is added to a counter the parent process shows as a single progress bar
     """
+
+    # Set in worker processes.  See share()
+    _shared_counter = None
+
+    # How often, in seconds, a worker process adds its progress to the shared counter
+    SHARE_EVERY = 0.2
+
     def __init__(self, test_name:str, num_tests: int):
-        self._progress_bar = tqdm(total=num_tests, desc=test_name, unit=" transactions", position=0, leave=True)
+        self._progress_bar = None
+        self._unshared = 0
+        self._shared_at = time.monotonic()
+
+        if ProgressBar._shared_counter is None:
+            self._progress_bar = tqdm(total=num_tests, desc=test_name, unit=" transactions", position=0, leave=True)
+
+    @staticmethod
+    def share(counter):
+        """
+        Sends the progress of every ProgressBar in this process to counter instead of showing it
+
+        :param counter - a multiprocessing.Value shared with the parent process
+        :return: None
+        """
+        ProgressBar._shared_counter = counter
+
+    def _share_progress(self):
+        # Taking the counter's lock for every transaction would slow the test down so progress is added in batches
+        with ProgressBar._shared_counter.get_lock():
+            ProgressBar._shared_counter.value += self._unshared
+
+        self._unshared = 0
+        self._shared_at = time.monotonic()
+
+    def add_progress_entry(self, count: int = 1):
+        if self._progress_bar is not None:
+            self._progress_bar.update(count)
+            return
+
+        self._unshared += count
 
-    def add_progress_entry(self):
-        self._progress_bar.update(1)
+        if time.monotonic() - self._shared_at >= ProgressBar.SHARE_EVERY:
+            self._share_progress()
 
     def __del__(self):
-        self._progress_bar.close()
+        if self._progress_bar is not None:
+            self._progress_bar.close()
+        elif self._unshared:
+            self._share_progress()
 
@@ -10,58 +10,19 @@ __maintainer__ = 'Jonathan Giffard'
 __email__ = 'jon.giffard@neo4j.com'
 __status__ = 'Alpha'
 
-# Generic / built in
-import sys
-
 # Owned
 from .customExceptions import APIException
 
 
-def query_api_errors(response_errors: dict):
+def query_api_errors(response_errors: list, status: int = 0):
     """
-    Handles and prints error messages from a Neo4j Query API response.
-
-    Args:
-        response_errors (dict): A list of error entries returned by the API, 
-                                where each entry is expected to be a dictionary 
-                                containing at least 'code' and 'message' keys.
+    Raises the first error of a Neo4j Query API response as an APIException with its code, e.g
+    Neo.TransientError.Request.ResourceExhaustion, so that the test can count it and carry on
 
-    Raises:
-        ConnectionError: If there are any connection-related errors.
+    :param response_errors - the errors of the response, each a dict with at least code and message
+    :param status - ( optional ) the HTTP status of the response
+    :return: None.  Always raises APIException
     """
+    error_entry = response_errors[0] if response_errors else {}
 
-    try:
-        for error_entry in response_errors:
-            error_code = error_entry['code']
-            match error_code:
-                case "Neo.ClientError.Database.DatabaseNotFound":
-                    print(f"{error_entry['message']}")
-                    sys.exit(1)
-
-                case "Neo.ClientError.Security.Unauthorized":
-                    print(f"{error_entry['message']}")
-                    sys.exit(1)
-
-                case "Neo.ClientError.Request.Invalid":
-                    print(f"{error_entry['message']}")
-                    sys.exit(1)
-
-                case "Neo.TransientError.Request.ResourceExhaustion":
-                    print(f"{error_entry['message']}")
-                    sys.exit(1)
-
-                case "Neo.ClientError.Security.AuthenticationRateLimit":
-                    print(f"{error_entry['message']}")
-                    sys.exit(1)
-
-                case _:
-                    print(f"Error from Query API: {error_entry}")
-                    sys.exit(1)
-
-            raise APIException(error_entry['message'])
-    
-    
-    except Exception as e:
-            raise APIException(e) from e
-    
-
+    raise APIException(error_entry.get("message", "Error from Query API"), error_entry.get("code", ""), status=status)
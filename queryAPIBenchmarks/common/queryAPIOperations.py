@@ -14,10 +14,15 @@ __status__ = 'Alpha'
 import os
 import dotenv
 import logging
+import time
 import httpx
 
 # Owned
 from . import query_api_errors
+from .customExceptions import APIException
+from .clientOptions import ClientOptions
+from .requestEncoder import RequestEncoder, ResponseSkimmer, decode_json
+from .requestTracer import RequestTracer
 
 
 class TXrequest:
@@ -26,165 +31,164 @@ class TXrequest:
     cypher execution within a transaction, and transaction commit, with support for cluster affinity.
     """
 
-    def __init__(self, url: str, usr: str, pwd: str, db: str, t_out:int ):
+    def __init__(self, url: str, usr: str, pwd: str, db: str, t_out:int, client_options: ClientOptions = None):
         dotenv.load_dotenv()
         # Configure logging
         logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         self._logger = logging.getLogger(__name__)
         self._query_api = f"{url}/db/{db}/query/v2"
-        self._query_auth = httpx.BasicAuth(usr, pwd)
+        self._options = client_options or ClientOptions()
+        # Headers, with the Authorization header, and request bodies are built once rather than for every request
+        self._encoder = RequestEncoder(usr, pwd, self._options.response_format, self._options.accept_encoding, self._options.request_encoding)
         self._query_db = db
-        self._timeout = t_out
+        self._timeout = self._options.timeout(t_out)
 
+        # A RequestTracer, set by a test, timing the parts of each request
+        self.tracer = None
 
-    def _make_request(self, url_path: str ="", cluster_affinity: str = "", cypher: str = "") -> httpx.Response:
-        # Makesd the request to Query API , send response back and deals with any errors
 
-        query_headers =  {"Content-Type": "application/json", "Accept": "application/json"}
+    def _extensions(self) -> dict:
+        """
+        PRIVATE
+        httpx request extensions.  A trace call back when there is a tracer
+        """
+        return {"trace": self.tracer.trace()} if self.tracer else {}
+
 
-        if len(cypher) > 0:
-            query_cypher = {'statement': cypher}
-        else:
-            query_cypher = {}
+    def _make_request(self, url_path: str ="", cluster_affinity: str = "", cypher: str = "", parameters: dict = None, need_body: bool = False) -> tuple[httpx.Response, dict]:
+        # Makesd the request to Query API , send response and its decoded body back and deals with any errors
+        # The decoded body is empty when ClientOptions.skip_body is set, unless need_body is
 
-        if len(cluster_affinity) > 0:
-            # If we have a cluster affinity, we need to add it to the headers
-            # This is used with Aura DBs to ensure the transaction stays with the same server
-            query_headers =  {"Content-Type": "application/json", "Accept": "application/json", "neo4j-cluster-affinity": cluster_affinity}
+        # If we have a cluster affinity, it is added to the headers
+        # This is used with Aura DBs to ensure the transaction stays with the same server
+        query_headers = self._encoder.headers(cluster_affinity)
+
+        # The statement and values for its $ parameters, encoded to JSON once
+        query_body = self._encoder.body(cypher, parameters)
 
         try:
             # Make request to query api at url
-            response = httpx.post(f"{self._query_api}{url_path}", headers=query_headers, auth=self._query_auth, json=query_cypher, timeout=self._timeout)
-            
-            # If this key is present in the response headers
-            # we are talking to aura and need to use this in further TX requests
-            # to ensure the TX stays with the initial server in a cluster
-            # Similar to sticky sessions
-            # Save as a property of the object
+            if self._options.skip_body and not need_body:
+                # Only the status and start of the response are looked at.  The rest is read and thrown away
+                # A client for this request only, as httpx.stream() would make, so that it can be traced
+                with httpx.Client(event_hooks=RequestTracer.event_hooks()) as client, client.stream("POST", f"{self._query_api}{url_path}", headers=query_headers, content=query_body, timeout=self._timeout, extensions=self._extensions()) as response:
+                    skimmer = ResponseSkimmer(response.status_code)
+                    for chunk in response.iter_bytes():
+                        skimmer.feed(chunk)
+
+                response_json = skimmer.result()
+
+            else:
+                # A new connection for every request.  The client is only for this request, as httpx.post() would make, so that it can be traced
+                with httpx.Client(event_hooks=RequestTracer.event_hooks()) as client:
+                    response = client.post(f"{self._query_api}{url_path}", headers=query_headers, content=query_body, timeout=self._timeout, extensions=self._extensions())
+
+                # Decode the response once.  Everything else uses what is returned
+                response_json = decode_json(response.content)
 
             # We need to check for errors in the response
-            if 'errors' in response.json():
-                query_api_errors(response.json()['errors'])
+            if 'errors' in response_json:
+                query_api_errors(response_json['errors'], response.status_code)
 
-        except httpx.RequestError as e:
-            self._logger.error(f"Request error: {str(e)}")
-            print(f"Connection error {e.request.url}")
-            exit()
+        except httpx.TransportError as e:
+            # Connecting, timing out or the connection being closed.  The transaction may succeed if tried again
+            self._logger.debug(f"Request error: {str(e)}")
+            raise APIException(str(e) or type(e).__name__, type(e).__name__, "NetworkError") from e
 
         except httpx.HTTPError as e:
-            self._logger.error(f"HTTP error: {str(e)}")
-            print(f"HTTP Error  {e.request.url}")
-            exit()
-
-        except httpx.ConnectTimeout as e:
-            self._logger.error(f"Connection timed out error: {str(e)}")
-            print(f"Connection timed out {e.request.url}")
-            exit()
+            self._logger.debug(f"HTTP error: {str(e)}")
+            raise APIException(str(e) or type(e).__name__, type(e).__name__, "HTTPError") from e
 
-        except ConnectionError as e:
-            self._logger.error(f"Connection error: {str(e)}")
-            print(f"Connection error")
-            exit()
+        except ValueError as e:
+            # The response was not JSON so did not come from the Query API e.g a proxy or load balancer in front of it
+            raise APIException(f"Response is not from the Query API: {e}", f"HTTP {response.status_code}", "HTTPError", response.status_code) from e
 
-        return response
+        return response, response_json
 
 
-    def tx_request_id(self) -> tuple[str, str]:
+    def tx_request_id(self, cypher: str = "", parameters: dict = None) -> tuple[str, str]:
         """
         Obtains a TX id from a neo4j server query api.  TX id is valid for 30 seconds
         Also returns neo4j-cluster-affinity value when used with Aura
         Both of these must be used with the transaction
 
+        :param cypher - ( optional ) a first cypher statement to run in the transaction, saving a round trip
+        :param parameters - ( optional ) values for the $ parameters of the statement
         :return: str - tx id as a string
         """
 
-        tx_id: str = ""
         tx_cluster_affinity: str = ""
 
-        try:
-            
-            # Make request to query api at url
-            response = self._make_request("/tx")
-            
-            # If this key is present in the response headers
-            # we are talking to aura and need to use this in further TX requests
-            # to ensure the TX stays with the initial server in a cluster
-            # Similar to sticky sessions
-            # Save as a property of the object
-
-            # Extract the transaction id.  This will be added to the end of the URI
-            # to associate database operations with the transaction
-            if 'transaction' in response.json():
-                tx_id = response.json()['transaction']['id']
-            else:
-                tx_id = ""
-
-            # Add tx_id and it's associated cluster affinity to our map to track them
-            # for when an instance of this class is being shared amongst multiple threads
-            # This allows us to use them as a matched pair in the correct transaction
-            # We only need to do this for Aura
-            if 'neo4j-cluster-affinity' in response.headers:
-                tx_cluster_affinity = response.headers['neo4j-cluster-affinity']
-
-        except Exception as e:
-            print(f"Exception when obtaining a tx id  {e}")
+        # Make request to query api at url
+        response, response_json = self._make_request("/tx", "", cypher, parameters, need_body=True)
+        
+        # If this key is present in the response headers
+        # we are talking to aura and need to use this in further TX requests
+        # to ensure the TX stays with the initial server in a cluster
+        # Similar to sticky sessions
+        # Save as a property of the object
+
+        # Extract the transaction id.  This will be added to the end of the URI
+        # to associate database operations with the transaction.  Without one, later requests would go to
+        # /tx/None and fail with a 404 that hides why
+        tx_id = (response_json.get('transaction') or {}).get('id')
+
+        if not tx_id:
+            raise APIException("Beginning the transaction did not return a transaction id", "NoTransactionId", "HTTPError", response.status_code)
+
+        # Add tx_id and it's associated cluster affinity to our map to track them
+        # for when an instance of this class is being shared amongst multiple threads
+        # This allows us to use them as a matched pair in the correct transaction
+        # We only need to do this for Aura
+        if 'neo4j-cluster-affinity' in response.headers:
+            tx_cluster_affinity = response.headers['neo4j-cluster-affinity']
 
         return tx_id, tx_cluster_affinity
 
     
-    def tx_request_cypher(self, tx_id: str, cypher: str, cluster_affinity: str = ""):
+    def tx_request_cypher(self, tx_id: str, cypher: str, cluster_affinity: str = "", parameters: dict = None):
         """
         Runs the cypher statement within the transaction, tx_id
 
         :param tx_id -  the transaction id
         :param cluster_affinity - ( optional ) the cluster affinity to use with Aura DBs
         :param cypher -  the cypher statement to execute in the transaction
+        :param parameters - ( optional ) values for the $ parameters of the statement
 
         :return: None
         """
 
-        try:
-            # Make request to query api at url
-            response = self._make_request(f"/tx/{tx_id}", cluster_affinity, cypher)
-
-        except Exception as e:
-            print(f"Error with Cypher request {e}")
-            exit()
+        # Make request to query api at url
+        self._make_request(f"/tx/{tx_id}", cluster_affinity, cypher, parameters)
 
         pass
 
 
-    def tx_request_commit(self, tx_id: str, cluster_affinity: str = ""):
+    def tx_request_commit(self, tx_id: str, cluster_affinity: str = "", cypher: str = "", parameters: dict = None):
         """
         Commits the transaction identified by tx_id
         :param tx_id -  the transaction id
         :param cluster_affinity - ( optional ) the cluster affinity to use with an Aura DB
+        :param cypher - ( optional ) a last cypher statement to run in the transaction before it is committed
+        :param parameters - ( optional ) values for the $ parameters of the statement
         :return: None
         """
 
-        try:
-            # Make request to query api at url
-            esponse = self._make_request(f"/tx/{tx_id}/commit", cluster_affinity)
-
-        except Exception as e:
-            print(f"Error commiting tx {tx_id}:  {e}")
-            exit()
+        # Make request to query api at url
+        self._make_request(f"/tx/{tx_id}/commit", cluster_affinity, cypher, parameters)
 
     pass
 
-    def tx_request_implicit(self, cypher: str):
+    def tx_request_implicit(self, cypher: str, parameters: dict = None):
         """
    
         :param cypher -  the cypher statement to execute
+        :param parameters - ( optional ) values for the $ parameters of the statement
         :return: str - tx id as a string
         """
 
-        try:
-            # Make request to query api at url
-            response = self._make_request("","",cypher)
-
-        except Exception as e:
-            print(f"Error with implicit tx {e}")
+        # Make request to query api at url
+        self._make_request("","",cypher, parameters)
 
         pass
 
@@ -197,167 +201,345 @@ class TXsession:
     cypher execution, and commit operations, with optional HTTP/2 and cluster affinity support.
     """
      
-    def __init__(self, url: str, usr: str, pwd: str, db: str, t_out: int, http2_support: bool = False):
+    def __init__(self, url: str, usr: str, pwd: str, db: str, t_out: int, http2_support: bool = False, client_options: ClientOptions = None):
         # Configure logging
         logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         self._logger = logging.getLogger(__name__)
-        self._session = httpx.Client(http2=http2_support)
+        self._options = client_options or ClientOptions()
+        self._session = httpx.Client(http2=http2_support, limits=self._options.limits(), event_hooks=RequestTracer.event_hooks())
         self._query_api = f"{url}/db/{db}/query/v2"
-        self._query_auth = httpx.BasicAuth(usr, pwd)
-        self._timeout = t_out
+        # Headers, with the Authorization header, and request bodies are built once rather than for every request
+        self._encoder = RequestEncoder(usr, pwd, self._options.response_format, self._options.accept_encoding, self._options.request_encoding)
+        self._timeout = self._options.timeout(t_out)
+
+        # A RequestTracer, set by a test, timing the parts of each request
+        self.tracer = None
+
+        # Size, in bytes, of the last response, the bytes of it that were downloaded, less when it was compressed, and
+        # how many seconds decoding it took.  Only meaningful when one request is made at a time, see BenchmarkResponseFormats
+        self.last_response: tuple[int, int, float] = (0, 0, 0.0)
  
 
     def __del__(self):
         self._session.close()
         
 
-    def _make_session_request(self, url_path: str ="", cluster_affinity: str = "", cypher: str = "") -> httpx.Response:
+    def _extensions(self) -> dict:
         """
-        Makes a session based request , handles any erorrs and returns the response
+        PRIVATE
+        httpx request extensions.  A trace call back when there is a tracer
         """
+        return {"trace": self.tracer.trace()} if self.tracer else {}
 
-        query_headers =  {"Content-Type": "application/json", "Accept": "application/json"}
 
-        if len(cypher) > 0:
-            query_cypher = {'statement': cypher}
-        else:
-            query_cypher = {}
-        
-        if len(cluster_affinity) > 0:
-            # If we have a cluster affinity, we need to add it to the headers
-            # This is used with Aura DBs to ensure the transaction stays with the same server
-            query_headers =  {"Content-Type": "application/json", "Accept": "application/json", "neo4j-cluster-affinity": cluster_affinity}
+    def _make_session_request(self, url_path: str ="", cluster_affinity: str = "", cypher: str = "", parameters: dict = None, access_mode: str = "", need_body: bool = False) -> tuple[httpx.Response, dict]:
+        """
+        Makes a session based request , handles any erorrs and returns the response and its decoded body
+        The decoded body is empty when ClientOptions.skip_body is set, unless need_body is
+        """
+
+        # If we have a cluster affinity, it is added to the headers
+        # This is used with Aura DBs to ensure the transaction stays with the same server
+        query_headers = self._encoder.headers(cluster_affinity)
+
+        # The statement, values for its $ parameters and access mode, encoded to JSON once.
+        # READ lets a cluster send the request to a server that is not the leader
+        query_body = self._encoder.body(cypher, parameters, access_mode)
 
         try:
             # Make request to query api at url
-            response = self._session.post(f"{self._query_api}{url_path}", headers=query_headers, auth=self._query_auth, json=query_cypher, timeout=self._timeout)
+            if self._options.skip_body and not need_body:
+                # Only the status and start of the response are looked at.  The rest is read and thrown away
+                with self._session.stream("POST", f"{self._query_api}{url_path}", headers=query_headers, content=query_body, timeout=self._timeout, extensions=self._extensions()) as response:
+                    skimmer = ResponseSkimmer(response.status_code)
+                    for chunk in response.iter_bytes():
+                        skimmer.feed(chunk)
 
-            # We need to check for errors in the response
-            if 'errors' in response.json():
-                query_api_errors(response.json()['errors'])
+                response_json = skimmer.result()
 
+            else:
+                response = self._session.post(f"{self._query_api}{url_path}", headers=query_headers, content=query_body, timeout=self._timeout, extensions=self._extensions())
 
-        except httpx.RequestError as e:
-            self._logger.error(f"Request error: {str(e)}")
-            print(f"Connection error {e.request.url}")
-            exit()
+                # Decode the response once.  Everything else uses what is returned
+                decode_start = time.perf_counter()
+                response_json = decode_json(response.content)
+                self.last_response = (len(response.content), response.num_bytes_downloaded, time.perf_counter() - decode_start)
 
-        except httpx.HTTPError as e:
-            self._logger.error(f"HTTP error: {str(e)}")
-            print(f"HTTP Error  {e.request.url}")
-            exit()
+            # We need to check for errors in the response
+            if 'errors' in response_json:
+                query_api_errors(response_json['errors'], response.status_code)
 
-        except httpx.ConnectTimeout as e:
-            self._logger.error(f"Connection timed out error: {str(e)}")
-            print(f"Connection timed out {e.request.url}")
-            exit()
 
-        except ConnectionError as e:
-            self._logger.error(f"Connection error: {str(e)}")
-            print(f"Connection error")
-            exit()
+        except httpx.TransportError as e:
+            # Connecting, timing out or the connection being closed.  The transaction may succeed if tried again
+            self._logger.debug(f"Request error: {str(e)}")
+            raise APIException(str(e) or type(e).__name__, type(e).__name__, "NetworkError") from e
 
+        except httpx.HTTPError as e:
+            self._logger.debug(f"HTTP error: {str(e)}")
+            raise APIException(str(e) or type(e).__name__, type(e).__name__, "HTTPError") from e
+
+        except ValueError as e:
+            # The response was not JSON so did not come from the Query API e.g a proxy or load balancer in front of it
+            raise APIException(f"Response is not from the Query API: {e}", f"HTTP {response.status_code}", "HTTPError", response.status_code) from e
 
-        return response
+        return response, response_json
      
-    def tx_session_id(self) -> tuple[str, str]:
+    def tx_session_id(self, access_mode: str = "", cypher: str = "", parameters: dict = None) -> tuple[str, str]:
         """
         Obtains a TX id from a neo4j server query api.  TX id is valid for 30 seconds
 
+        :param access_mode - ( optional ) READ or WRITE for every statement in the transaction
+        :param cypher - ( optional ) a first cypher statement to run in the transaction, saving a round trip
+        :param parameters - ( optional ) values for the $ parameters of the statement
+
         :return: str - tx id as a string
         :return: str - cluster affinity as a string
         """
 
-        tx_id = ""
         tx_cluster_affinity = ""
 
-        try:
-            # Make request to query api at url
-            response = self._make_session_request("/tx")
+        # Make request to query api at url
+        response, response_json = self._make_session_request("/tx", "", cypher, parameters, access_mode, need_body=True)
 
-            # Extract the transaction id from the response.  This will be added to the end of the URI
-            # to associate database operations with the transaction
-            if 'transaction' in response.json():
-                tx_id = response.json()['transaction']['id']
-            else:
-                tx_id = None
+        # Extract the transaction id.  This will be added to the end of the URI
+        # to associate database operations with the transaction.  Without one, later requests would go to
+        # /tx/None and fail with a 404 that hides why
+        tx_id = (response_json.get('transaction') or {}).get('id')
 
-            # Add tx_id and it's associated cluster affinity to our map to track them
-            # for when an instance of this class is being shared amongst multiple threads
-            # This allows us to use them as a matched pair in the correct transaction
-            # We only need to do this for Aura
-            if 'neo4j-cluster-affinity' in response.headers:
-                tx_cluster_affinity = response.headers['neo4j-cluster-affinity']
+        if not tx_id:
+            raise APIException("Beginning the transaction did not return a transaction id", "NoTransactionId", "HTTPError", response.status_code)
 
-        except Exception as e:
-            print(f"Exception when obtaining a tx id  {e}")  
-            exit()
+        # Add tx_id and it's associated cluster affinity to our map to track them
+        # for when an instance of this class is being shared amongst multiple threads
+        # This allows us to use them as a matched pair in the correct transaction
+        # We only need to do this for Aura
+        if 'neo4j-cluster-affinity' in response.headers:
+            tx_cluster_affinity = response.headers['neo4j-cluster-affinity']
 
         return tx_id, tx_cluster_affinity
 
      
-    def tx_session_cypher(self, tx_id: str, cypher: str, cluster_affinity: str = ""):
+    def tx_session_cypher(self, tx_id: str, cypher: str, cluster_affinity: str = "", parameters: dict = None):
         """
         Runs the cypher statement within the transaction, tx_id
 
         :param tx_id -  the transaction id
         :param cypher -  the cypher statement to execute in the transaction
+        :param parameters - ( optional ) values for the $ parameters of the statement
         :return None
         """
        
-        try:
-            # Make request to query api
-            response = self._make_session_request(f"/tx/{tx_id}", cluster_affinity, cypher)
-            
-        except Exception as e:
-            print(f"Error with Cypher request {e}")
-            exit()
+        # Make request to query api
+        self._make_session_request(f"/tx/{tx_id}", cluster_affinity, cypher, parameters)
 
         pass
 
      
-    def tx_session_commit(self, tx_id: str, cluster_affinity: str = ""):
+    def tx_session_commit(self, tx_id: str, cluster_affinity: str = "", cypher: str = "", parameters: dict = None):
         """
         Commits the transaction identified by tx_id
         :param tx_id -  the transaction id
         :param cluster_affinity - (optional)
+        :param cypher - ( optional ) a last cypher statement to run in the transaction before it is committed
+        :param parameters - ( optional ) values for the $ parameters of the statement
 
         :return: None
         """
              
 
-        try:
-            # Make request to query api at url
-            response = self._make_session_request(f"/tx/{tx_id}/commit", cluster_affinity)
-            
-
-            # We need to check for errors in the response
-            if 'errors' in response.json():
-                query_api_errors(response.json()['errors'])
-
-        except Exception as e:
-            print(f"Error commiting tx {tx_id}:  {e}")
-            exit()
+        # Make request to query api at url.  Errors in the response are dealt with there
+        self._make_session_request(f"/tx/{tx_id}/commit", cluster_affinity, cypher, parameters)
 
         pass
 
     def __delete__(self):
         self._session.close()
 
-    def tx_session_implicit(self, cypher: str):
+    def tx_session_implicit(self, cypher: str, parameters: dict = None, access_mode: str = ""):
             """
             Runs the cypher statement within an implicit transaction
 
             :param cypher -  the cypher statement to execute in the transaction
+            :param parameters - ( optional ) values for the $ parameters of the statement
+            :param access_mode - ( optional ) READ or WRITE
             :return None
             """
 
-            try:
-                # Make request to query api
-                response = self._make_session_request("","",cypher)
+            # Make request to query api
+            self._make_session_request("","",cypher, parameters, access_mode)
+
+            pass
+
+
+
+class TXasyncSession:
+    """
+    Async counterpart of TXsession.  Uses a single httpx.AsyncClient so that many transactions can be
+    in flight at the same time from one event loop, without needing a thread for each of them.
+    """
+
+    def __init__(self, url: str, usr: str, pwd: str, db: str, t_out: int, http2_support: bool = False, max_connections: int = 100, client_options: ClientOptions = None):
+        # Configure logging
+        logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        self._logger = logging.getLogger(__name__)
+
+        self._options = client_options or ClientOptions()
+
+        # The default httpx pool only allows 100 connections.  When we want thousands of requests
+        # in flight, the pool needs to be at least as large otherwise requests queue inside httpx.
+        # Limits given in the client options take precedence
+        session_limits = self._options.limits(max_connections, max_connections)
+        self._session = httpx.AsyncClient(http2=http2_support, limits=session_limits, event_hooks=RequestTracer.async_event_hooks())
+        self._query_api = f"{url}/db/{db}/query/v2"
+        # Headers, with the Authorization header, and request bodies are built once rather than for every request
+        self._encoder = RequestEncoder(usr, pwd, self._options.response_format, self._options.accept_encoding, self._options.request_encoding)
+        self._timeout = self._options.timeout(t_out)
+
+        # A RequestTracer, set by a test, timing the parts of each request
+        self.tracer = None
+
+        # The HTTP version of the last response e.g HTTP/2 when HTTP/2 was asked for and the server agreed to it
+        self.http_version = ""
+
+
+    async def aclose(self):
+        """
+        Closes the underlying httpx.AsyncClient.  Must be awaited from the event loop that used it
+        """
+        await self._session.aclose()
+
 
-            except Exception as e:
-                print(f"Error with implicit tx {e}")
-                exit()
+    def _extensions(self) -> dict:
+        """
+        PRIVATE
+        httpx request extensions.  A trace call back when there is a tracer
+        """
+        return {"trace": self.tracer.atrace()} if self.tracer else {}
+
+
+    async def _make_async_request(self, url_path: str ="", cluster_affinity: str = "", cypher: str = "", parameters: dict = None, need_body: bool = False) -> tuple[httpx.Response, dict]:
+        """
+        Makes an async session based request , handles any errors and returns the response and its decoded body
+        The decoded body is empty when ClientOptions.skip_body is set, unless need_body is
+        """
+
+        # If we have a cluster affinity, it is added to the headers
+        # This is used with Aura DBs to ensure the transaction stays with the same server
+        query_headers = self._encoder.headers(cluster_affinity)
+
+        # The statement and values for its $ parameters, encoded to JSON once
+        query_body = self._encoder.body(cypher, parameters)
+
+        try:
+            # Make request to query api at url
+            if self._options.skip_body and not need_body:
+                # Only the status and start of the response are looked at.  The rest is read and thrown away
+                async with self._session.stream("POST", f"{self._query_api}{url_path}", headers=query_headers, content=query_body, timeout=self._timeout, extensions=self._extensions()) as response:
+                    skimmer = ResponseSkimmer(response.status_code)
+                    async for chunk in response.aiter_bytes():
+                        skimmer.feed(chunk)
+
+                response_json = skimmer.result()
+
+            else:
+                response = await self._session.post(f"{self._query_api}{url_path}", headers=query_headers, content=query_body, timeout=self._timeout, extensions=self._extensions())
+
+                # Decode the response once.  Everything else uses what is returned
+                response_json = decode_json(response.content)
+
+            self.http_version = response.http_version
+
+            # We need to check for errors in the response
+            if 'errors' in response_json:
+                query_api_errors(response_json['errors'], response.status_code)
+
+        except httpx.TransportError as e:
+            # Connecting, timing out or the connection being closed.  The transaction may succeed if tried again
+            self._logger.debug(f"Request error: {str(e)}")
+            raise APIException(str(e) or type(e).__name__, type(e).__name__, "NetworkError") from e
+
+        except httpx.HTTPError as e:
+            self._logger.debug(f"HTTP error: {str(e)}")
+            raise APIException(str(e) or type(e).__name__, type(e).__name__, "HTTPError") from e
+
+        except ValueError as e:
+            # The response was not JSON so did not come from the Query API e.g a proxy or load balancer in front of it
+            raise APIException(f"Response is not from the Query API: {e}", f"HTTP {response.status_code}", "HTTPError", response.status_code) from e
+
+        return response, response_json
+
+
+    async def tx_async_id(self, cypher: str = "", parameters: dict = None) -> tuple[str, str]:
+        """
+        Obtains a TX id from a neo4j server query api.  TX id is valid for 30 seconds
+
+        :param cypher - ( optional ) a first cypher statement to run in the transaction, saving a round trip
+        :param parameters - ( optional ) values for the $ parameters of the statement
+
+        :return: str - tx id as a string
+        :return: str - cluster affinity as a string
+        """
+
+        tx_cluster_affinity = ""
+
+        # Make request to query api at url
+        response, response_json = await self._make_async_request("/tx", "", cypher, parameters, need_body=True)
+
+        # Extract the transaction id.  This will be added to the end of the URI
+        # to associate database operations with the transaction.  Without one, later requests would go to
+        # /tx/None and fail with a 404 that hides why
+        tx_id = (response_json.get('transaction') or {}).get('id')
+
+        if not tx_id:
+            raise APIException("Beginning the transaction did not return a transaction id", "NoTransactionId", "HTTPError", response.status_code)
+
+        # Keep the cluster affinity with the tx id so that the transaction stays
+        # on the same server.  We only need to do this for Aura
+        if 'neo4j-cluster-affinity' in response.headers:
+            tx_cluster_affinity = response.headers['neo4j-cluster-affinity']
+
+        return tx_id, tx_cluster_affinity
+
+
+    async def tx_async_cypher(self, tx_id: str, cypher: str, cluster_affinity: str = "", parameters: dict = None):
+        """
+        Runs the cypher statement within the transaction, tx_id
+
+        :param tx_id -  the transaction id
+        :param cypher -  the cypher statement to execute in the transaction
+        :param parameters - ( optional ) values for the $ parameters of the statement
+        :param cluster_affinity - ( optional ) the cluster affinity to use with Aura DBs
+        :return None
+        """
+
+        # Make request to query api
+        await self._make_async_request(f"/tx/{tx_id}", cluster_affinity, cypher, parameters)
+
+
+    async def tx_async_commit(self, tx_id: str, cluster_affinity: str = "", cypher: str = "", parameters: dict = None):
+        """
+        Commits the transaction identified by tx_id
+
+        :param tx_id -  the transaction id
+        :param cluster_affinity - ( optional ) the cluster affinity to use with Aura DBs
+        :param cypher - ( optional ) a last cypher statement to run in the transaction before it is committed
+        :param parameters - ( optional ) values for the $ parameters of the statement
+        :return: None
+        """
+
+        # Make request to query api at url
+        await self._make_async_request(f"/tx/{tx_id}/commit", cluster_affinity, cypher, parameters)
+
+
+    async def tx_async_implicit(self, cypher: str, parameters: dict = None):
+        """
+        Runs the cypher statement within an implicit transaction
+
+        :param cypher -  the cypher statement to execute in the transaction
+        :param parameters - ( optional ) values for the $ parameters of the statement
+        :return None
+        """
 
-            pass
\ No newline at end of file
+        # Make request to query api
+        await self._make_async_request("", "", cypher, parameters)
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import base64
+import gzip
+import json
+import zlib
+
+# Owned
+
+# orjson is a lot quicker than json at both encoding and decoding.  It is used when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# zstandard is needed for zstd compression.  httpx uses it to decode zstd responses when it is installed
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Which JSON codec requests and responses use.  Kept with results so runs with different codecs are not mistaken for each other
+JSON_CODEC = "orjson" if orjson else "json"
+
+# Formats the Query API can answer in, and the Accept header that asks for each.  Typed JSON gives the
+# Cypher type of every value, e.g {"$type": "Integer", "_value": "1"}, at the cost of larger responses
+RESPONSE_FORMATS = {"json": "application/json", "typed": "application/vnd.neo4j.query"}
+
+# Compression a request body can be sent with, identity being none, and a response can be asked for in
+CONTENT_ENCODINGS = ("identity", "gzip", "deflate") + (("zstd",) if zstandard else ())
+
+# Level of gzip and deflate compression.  zlib's own default, a balance of size and CPU time
+COMPRESS_LEVEL = 6
+
+# Body of a request with no statement e.g to begin or commit a transaction
+EMPTY_BODY = b"{}"
+
+# Bytes at the start of a response that are looked at for errors when the body is being skipped.  The Query API
+# puts errors first, and alone, in the body of a failed request
+SKIM_BYTES = 64
+
+# Looked for in the start of a response.  When found the whole response is decoded to report the errors
+ERRORS_KEY = b'"errors"'
+
+
+def encode_json(value) -> bytes:
+    """
+    Encodes value as JSON bytes with the quickest codec available
+    """
+    if orjson:
+        return orjson.dumps(value)
+
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def decode_json(content: bytes):
+    """
+    Decodes JSON bytes with the quickest codec available.  Raises ValueError when content is not JSON
+    """
+    if orjson:
+        return orjson.loads(content)
+
+    return json.loads(content)
+
+
+def compress(content: bytes, encoding: str) -> bytes:
+    """
+    Compresses content with one of CONTENT_ENCODINGS.  HTTP deflate is zlib's format
+    """
+    if encoding == "gzip":
+        return gzip.compress(content, COMPRESS_LEVEL)
+
+    if encoding == "deflate":
+        return zlib.compress(content, COMPRESS_LEVEL)
+
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor().compress(content)
+
+    return content
+
+
+class RequestEncoder:
+    """
+    Builds the headers and bodies of Query API requests with as little work per request as possible, so
+    that the client adds little to the latency being measured.
+
+    Headers, including the Authorization header, are built once.  Bodies are encoded once, straight to bytes,
+    and the body of a statement without parameters is kept and used again.  One encoder can be shared by threads
+    """
+
+    def __init__(self, usr: str, pwd: str, response_format: str = "json", accept_encoding: str = "", request_encoding: str = "identity"):
+        """
+        :param usr - the user account to use
+        :param pwd  - the password of the user account
+        :param response_format - ( optional ) json or typed, see RESPONSE_FORMATS
+        :param accept_encoding - ( optional ) the Accept-Encoding header e.g gzip or identity.  httpx's own when empty
+        :param request_encoding - ( optional ) one of CONTENT_ENCODINGS to compress request bodies with
+        """
+        credentials = base64.b64encode(f"{usr}:{pwd}".encode()).decode()
+
+        self._headers = {"Content-Type": "application/json", "Accept": RESPONSE_FORMATS[response_format],
+                         "Authorization": f"Basic {credentials}"}
+
+        if accept_encoding:
+            self._headers["Accept-Encoding"] = accept_encoding
+
+        self._request_encoding = request_encoding
+
+        if request_encoding != "identity":
+            self._headers["Content-Encoding"] = request_encoding
+
+        # Headers for each cluster affinity.  Aura only ever gives a few of them
+        self._affinity_headers: dict[str, dict] = {"": self._headers}
+
+        # Bodies of statements that have no parameters, by statement and access mode
+        self._bodies: dict[tuple[str, str], bytes] = {}
+
+
+    def headers(self, cluster_affinity: str = "") -> dict:
+        """
+        Headers for a request.  When there is a cluster affinity it is sent in the neo4j-cluster-affinity header
+        so that a transaction stays on the same server of an Aura DB
+
+        :param cluster_affinity - ( optional ) from the response that began the transaction
+        :return: dict that must not be changed
+        """
+        headers = self._affinity_headers.get(cluster_affinity)
+
+        if headers is None:
+            headers = self._headers | {"neo4j-cluster-affinity": cluster_affinity}
+            self._affinity_headers[cluster_affinity] = headers
+
+        return headers
+
+
+    def body(self, cypher: str = "", parameters: dict = None, access_mode: str = "") -> bytes:
+        """
+        The JSON body of a request
+
+        :param cypher - ( optional ) the cypher statement.  No statement when empty
+        :param parameters - ( optional ) values for the $ parameters of the statement
+        :param access_mode - ( optional ) READ lets a cluster send the request to a server that is not the leader
+        :return: bytes
+        """
+        if parameters:
+            query_body = {"statement": cypher, "parameters": parameters}
+
+            if access_mode:
+                query_body["accessMode"] = access_mode
+
+            return compress(encode_json(query_body), self._request_encoding)
+
+        body = self._bodies.get((cypher, access_mode))
+
+        if body is None:
+            query_body = {"statement": cypher} if cypher else {}
+
+            if access_mode:
+                query_body["accessMode"] = access_mode
+
+            body = compress(encode_json(query_body) if query_body else EMPTY_BODY, self._request_encoding)
+            self._bodies[(cypher, access_mode)] = body
+
+        return body
+
+
+class ResponseSkimmer:
+    """
+    Reads a response body, given to it a chunk at a time as it is streamed, without decoding it unless it failed.
+    A request failed when its status is 400 or more, or the first SKIM_BYTES bytes have an errors key.  Otherwise
+    chunks are thrown away as they arrive so a large result is never held in memory
+    """
+
+    def __init__(self, status_code: int):
+        """
+        :param status_code - HTTP status of the response
+        """
+        self._head = bytearray()
+        self._failed = status_code >= 400
+        self.size = 0
+
+
+    def feed(self, chunk: bytes):
+        """
+        Takes the next chunk of the body
+        """
+        self.size += len(chunk)
+
+        # Failed responses are kept, they are small, so their errors can be reported
+        if self._failed:
+            self._head += chunk
+
+        elif len(self._head) < SKIM_BYTES:
+            self._head += chunk
+
+            # Only the start of the body is kept unless it has an errors key
+            if self._head.find(ERRORS_KEY, 0, SKIM_BYTES + len(ERRORS_KEY)) >= 0:
+                self._failed = True
+            else:
+                del self._head[SKIM_BYTES:]
+
+
+    def result(self) -> dict:
+        """
+        The decoded body of a failed response, or an empty dict
+        """
+        if self._failed and self._head:
+            return decode_json(bytes(self._head))
+
+        return {}
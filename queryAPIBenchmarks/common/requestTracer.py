@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import time
+
+# Owned
+from .latencyRecorder import LatencyRecorder
+
+
+# Parts of each HTTP request that are timed, in the order they happen
+#   pool_wait - from the request being handed to the connection pool, once httpx has built it, until the pool
+#               gave it a connection or began opening a new one for it
+#               Includes the pool's own work and, with many workers, waiting for the GIL or the event loop
+#   connect - looking up the server's address and opening a TCP connection to it.  0 when a connection is reused
+#   tls - the TLS handshake of a new https connection.  0 when a connection is reused or for http
+#   send - sending the request headers and body
+#   ttfb - from the request being sent until the first byte of the response, the time the server took plus a round trip
+#   receive - reading the response body
+HTTP_PHASES = ("pool_wait", "connect", "tls", "send", "ttfb", "receive")
+
+# The httpcore trace events, without .started or .complete, that make up each phase.
+# The address look up happens inside the connect and has no event of its own
+_EVENT_PHASES = {"connection.connect_tcp": "connect",
+                 "connection.connect_unix_socket": "connect",
+                 "connection.start_tls": "tls",
+                 "http11.send_request_headers": "send",
+                 "http11.send_request_body": "send",
+                 "http2.send_request_headers": "send",
+                 "http2.send_request_body": "send",
+                 "http11.receive_response_headers": "ttfb",
+                 "http2.receive_response_headers": "ttfb",
+                 "http11.receive_response_body": "receive",
+                 "http2.receive_response_body": "receive"}
+
+
+class RequestTracer:
+    """
+    Times the parts of each HTTP request a client makes with httpx's trace extension, which calls back
+    as httpcore starts and finishes each step of a request.
+
+    The pool wait is timed from the client's request event hook, see event_hooks(), which httpx calls once it
+    has built the request and added its authentication, just before handing it to the connection pool.  The
+    first call back from httpcore comes once the pool has a connection for the request, or is opening a new
+    one for it, so the time between them is how long the request waited for the pool.  A client without the
+    hooks times the pool wait from when trace() was called, which includes building the request.
+
+    Every phase is recorded for every request once its response is closed, parts that did not happen, such
+    as connecting on a reused connection, as 0.  The phases of a request then add up to close to the time it took.
+
+    Each request needs a call back of its own, from trace() or atrace().  The recorders are shared by
+    every client and worker of a test
+    """
+
+    # Sent to a request's call back by the event hooks, just before the request is handed to the pool
+    POOL_EVENT = "pool.request.started"
+
+    def __init__(self, recorders: dict):
+        """
+        :param recorders - dict, e.g BenchmarkResult.http, that a LatencyRecorder is added to for each of HTTP_PHASES
+        """
+        for phase in HTTP_PHASES:
+            recorders.setdefault(phase, LatencyRecorder())
+
+        self._recorders = {phase: recorders[phase] for phase in HTTP_PHASES}
+
+
+    def trace(self):
+        """
+        A call back for the trace extension of one request.  Make it just before the request is sent
+
+        :return: function
+        """
+        requested = time.perf_counter()
+        durations = dict.fromkeys(HTTP_PHASES, 0.0)
+        started = {}
+        connected = False
+
+        def on_event(event_name: str, info: dict):
+            nonlocal connected, requested
+            now = time.perf_counter()
+
+            # The request has been built and is about to be handed to the pool
+            if event_name == RequestTracer.POOL_EVENT:
+                requested = now
+                return
+
+            # The first event from httpcore comes once the pool has a connection for the request, or is opening one
+            if not connected:
+                connected = True
+                durations["pool_wait"] = now - requested
+
+            name, _, step = event_name.rpartition(".")
+            phase = _EVENT_PHASES.get(name)
+
+            if phase and step == "started":
+                started[phase] = now
+            elif phase and step == "complete":
+                durations[phase] += now - started.pop(phase, now)
+            elif step == "complete" and name.endswith("response_closed"):
+                for closed_phase, recorder in self._recorders.items():
+                    recorder.record(requested, durations[closed_phase])
+
+        return on_event
+
+
+    def atrace(self):
+        """
+        As trace() for an httpx.AsyncClient, which needs a coroutine
+        """
+        on_event = self.trace()
+
+        async def on_async_event(event_name: str, info: dict):
+            on_event(event_name, info)
+
+        return on_async_event
+
+
+    @staticmethod
+    def _on_request(request):
+        # Tells the request's call back, if it has one, that it is about to be handed to the pool
+        trace = request.extensions.get("trace")
+
+        if trace is not None:
+            trace(RequestTracer.POOL_EVENT, {})
+
+
+    @staticmethod
+    async def _on_async_request(request):
+        # As _on_request() for an httpx.AsyncClient, whose call backs are coroutines
+        trace = request.extensions.get("trace")
+
+        if trace is not None:
+            await trace(RequestTracer.POOL_EVENT, {})
+
+
+    @staticmethod
+    def event_hooks() -> dict:
+        """
+        The event_hooks to make an httpx.Client with so that the pool wait of its requests is timed from the pool.
+        They do nothing for a request without a call back
+
+        :return: dict for httpx.Client(event_hooks=)
+        """
+        return {"request": [RequestTracer._on_request]}
+
+
+    @staticmethod
+    def async_event_hooks() -> dict:
+        """
+        As event_hooks() for an httpx.AsyncClient
+        """
+        return {"request": [RequestTracer._on_async_request]}
@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import gc
+import os
+import stat
+import threading
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Owned
+
+
+# How often, in seconds, the client is sampled while a test runs
+SAMPLE_EVERY = 0.5
+
+# A test whose client process used at least this much of one core, on average, was probably limited by the
+# client rather than by Neo4j.  Python code only runs on one core at a time, however many threads there are
+CPU_BOUND = 0.9
+
+# Where the open file descriptors of this process are listed, on Linux then macOS
+_FD_DIRECTORIES = ("/proc/self/fd", "/dev/fd")
+
+
+def _rss() -> int:
+    """
+    PRIVATE
+    Bytes of memory the process is using.  The peak when the current use cannot be read.  0 when neither can
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    if resource is None:
+        return 0
+
+    # Kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def _sockets() -> int:
+    """
+    PRIVATE
+    The number of sockets the process has open.  0 when its file descriptors cannot be listed
+    """
+    for directory in _FD_DIRECTORIES:
+        try:
+            fds = os.listdir(directory)
+        except OSError:
+            continue
+
+        sockets = 0
+
+        for fd in fds:
+            try:
+                if stat.S_ISSOCK(os.stat(os.path.join(directory, fd)).st_mode):
+                    sockets += 1
+            except (OSError, ValueError):
+                # Closed since the directory was listed
+                pass
+
+        return sockets
+
+    return 0
+
+
+def _thread_cpu() -> dict:
+    """
+    PRIVATE
+    CPU seconds used by each live thread, by thread name.  Empty where the CPU time of another thread cannot be read
+    """
+    cpu = {}
+
+    for thread in threading.enumerate():
+        try:
+            cpu[thread.name] = time.clock_gettime(time.pthread_getcpuclockid(thread.ident))
+        except (AttributeError, OSError, TypeError):
+            # Not on this platform, or the thread has just finished
+            pass
+
+    return cpu
+
+
+class ResourceSampler:
+    """
+    Samples the client process while a test runs, so that a test limited by the client rather than by Neo4j can
+    be told apart.  A thread takes a sample every SAMPLE_EVERY seconds of
+
+        cpu - CPU time used by the process, as a % of one core
+        busiest_thread - CPU time used by its busiest thread, as a % of one core
+        rss - bytes of memory in use
+        sockets - open sockets
+        gc_pauses, gc_time - garbage collections, and the CPU seconds they took, since the last sample
+        in_flight - ( when given a queue_depth ) transactions submitted but not finished
+        loop_lag - ( when given an event loop ) seconds a call back waited to be run by the loop
+
+    Only the timed part of a test is sampled, between start() and stop().  Per thread CPU needs
+    pthread_getcpuclockid, so is not known on every platform
+    """
+
+    def __init__(self, queue_depth=None, loop=None, interval: float = SAMPLE_EVERY):
+        """
+        :param queue_depth - ( optional ) function giving the transactions in flight e.g BoundedProducer.in_flight
+        :param loop - ( optional ) the asyncio event loop of an async test
+        :param interval - ( optional ) seconds between samples
+        """
+        self._queue_depth = queue_depth
+        self._loop = loop
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+        self.samples: list[dict] = []
+
+        # Garbage collections since the last sample, as [ count, seconds, longest ], and when the one running started
+        self._gc = [0, 0.0, 0.0]
+        self._gc_started: float = None
+
+        # The latest event loop lag seen
+        self._loop_lag = 0.0
+
+        # CPU seconds used by each thread when sampling started, and when it was last sampled
+        self._started_thread_cpu: dict = {}
+        self._thread_cpu: dict = {}
+
+
+    def _on_gc(self, phase: str, info: dict):
+        # Called by the garbage collector before and after each collection, in whichever thread it runs in.
+        # Timed by the CPU of that thread as finalizers run by the collection can let other threads run
+        if phase == "start":
+            self._gc_started = time.thread_time()
+        elif self._gc_started is not None:
+            pause = time.thread_time() - self._gc_started
+            self._gc_started = None
+            self._gc[0] += 1
+            self._gc[1] += pause
+            self._gc[2] = max(self._gc[2], pause)
+
+
+    def _probe_loop(self):
+        # Asks the event loop to run a call back as soon as it can and records how long that took
+        asked = time.perf_counter()
+
+        def answered():
+            self._loop_lag = time.perf_counter() - asked
+
+        try:
+            self._loop.call_soon_threadsafe(answered)
+        except RuntimeError:
+            # The loop has closed
+            pass
+
+
+    def _sample(self, at: float, elapsed: float, cpu_used: float, thread_cpu: dict, last_thread_cpu: dict):
+        # Adds one sample covering the elapsed seconds since the last one
+        busiest = max((used - last_thread_cpu.get(name, 0.0) for name, used in thread_cpu.items()), default=0.0)
+        gc_pauses, gc_time, _ = self._gc
+        self._gc[0] = 0
+        self._gc[1] = 0.0
+
+        sample = {"at": at,
+                  "cpu": 100 * cpu_used / elapsed,
+                  "busiest_thread": 100 * busiest / elapsed,
+                  "rss": _rss(),
+                  "sockets": _sockets(),
+                  "gc_pauses": gc_pauses,
+                  "gc_time": gc_time}
+
+        if self._queue_depth is not None:
+            sample["in_flight"] = self._queue_depth()
+
+        if self._loop is not None:
+            sample["loop_lag"] = self._loop_lag
+
+        self.samples.append(sample)
+
+
+    def _run(self):
+        # Takes a sample every interval until stopped, and a last one when it is
+        started = last_at = time.perf_counter()
+        last_cpu = time.process_time()
+        last_thread_cpu = self._started_thread_cpu
+
+        while True:
+            stopping = self._stop.wait(self._interval)
+
+            now = time.perf_counter()
+            cpu = time.process_time()
+            thread_cpu = _thread_cpu()
+
+            if now > last_at:
+                self._sample(now - started, now - last_at, cpu - last_cpu, thread_cpu, last_thread_cpu)
+
+            # Threads that have finished keep the CPU time they used
+            for name, used in thread_cpu.items():
+                self._thread_cpu[name] = used
+
+            if stopping:
+                return
+
+            if self._loop is not None:
+                self._probe_loop()
+
+            last_at, last_cpu, last_thread_cpu = now, cpu, thread_cpu
+
+
+    def start(self):
+        """
+        Starts sampling.  Call just before the timed part of a test
+
+        :return: self
+        """
+        gc.callbacks.append(self._on_gc)
+
+        self._started_thread_cpu = _thread_cpu()
+        self._thread_cpu = self._started_thread_cpu.copy()
+
+        self._thread = threading.Thread(target=self._run, name="ResourceSampler", daemon=True)
+        self._thread.start()
+
+        return self
+
+
+    def stop(self) -> dict:
+        """
+        Stops sampling.  Call just after the timed part of a test, before its threads are shut down
+
+        :return: dict with the samples and a summary of them, see summarise()
+        """
+        self._stop.set()
+        self._thread.join()
+        gc.callbacks.remove(self._on_gc)
+
+        # CPU seconds each thread used while sampling, leaving out this sampler
+        threads = {name: used - self._started_thread_cpu.get(name, 0.0) for name, used in self._thread_cpu.items()
+                   if name != self._thread.name}
+
+        return {"pid": os.getpid(), "samples": self.samples,
+                "summary": ResourceSampler.summarise(self.samples, self._gc[2], threads)}
+
+
+    @staticmethod
+    def summarise(samples: list, gc_max_pause: float = 0.0, threads: dict = None) -> dict:
+        """
+        Summarises the samples of one process
+
+        :param samples - from a ResourceSampler
+        :param gc_max_pause - ( optional ) the longest garbage collection, in seconds
+        :param threads - ( optional ) CPU seconds used by each thread
+        :return: dict with the mean and most CPU, the most of everything else, the garbage collection totals
+                 and cpu_bound, True when the mean CPU was at least CPU_BOUND of one core
+        """
+        cpu = [sample["cpu"] for sample in samples]
+        cpu_mean = sum(cpu) / len(cpu) if cpu else 0.0
+
+        summary = {"cpu_mean": cpu_mean,
+                   "cpu_max": max(cpu, default=0.0),
+                   "busiest_thread_max": max((sample["busiest_thread"] for sample in samples), default=0.0),
+                   "rss_max": max((sample["rss"] for sample in samples), default=0),
+                   "sockets_max": max((sample["sockets"] for sample in samples), default=0),
+                   "gc_pauses": sum(sample["gc_pauses"] for sample in samples),
+                   "gc_time": sum(sample["gc_time"] for sample in samples),
+                   "gc_max_pause": gc_max_pause,
+                   "cpu_bound": cpu_mean >= CPU_BOUND * 100,
+                   "threads": threads or {}}
+
+        if any("in_flight" in sample for sample in samples):
+            summary["in_flight_max"] = max(sample["in_flight"] for sample in samples)
+
+        if any("loop_lag" in sample for sample in samples):
+            summary["loop_lag_max"] = max(sample["loop_lag"] for sample in samples)
+
+        return summary
+
+
+    @staticmethod
+    def combine(reports: list) -> dict:
+        """
+        Summarises the reports of every process that ran a test.  CPU and memory are those of the busiest
+        process, as each process is limited to its own core, and the garbage collection totals are added up
+
+        :param reports - from stop()
+        :return: dict with the same keys as summarise(), less threads, and the number of processes
+        """
+        summaries = [report["summary"] for report in reports]
+
+        combined = {"processes": len(summaries),
+                    "cpu_mean": max(summary["cpu_mean"] for summary in summaries),
+                    "cpu_max": max(summary["cpu_max"] for summary in summaries),
+                    "busiest_thread_max": max(summary["busiest_thread_max"] for summary in summaries),
+                    "rss_max": max(summary["rss_max"] for summary in summaries),
+                    "sockets_max": max(summary["sockets_max"] for summary in summaries),
+                    "gc_pauses": sum(summary["gc_pauses"] for summary in summaries),
+                    "gc_time": sum(summary["gc_time"] for summary in summaries),
+                    "gc_max_pause": max(summary["gc_max_pause"] for summary in summaries),
+                    "cpu_bound": any(summary["cpu_bound"] for summary in summaries)}
+
+        for key in ("in_flight_max", "loop_lag_max"):
+            if any(key in summary for summary in summaries):
+                combined[key] = max(summary.get(key, 0) for summary in summaries)
+
+        # With one process, the CPU of each of its threads
+        if len(summaries) == 1:
+            combined["threads"] = summaries[0]["threads"]
+
+        return combined
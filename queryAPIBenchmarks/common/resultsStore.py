@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import base64
+import json
+import os
+import platform
+import socket
+import uuid
+from array import array
+from datetime import datetime
+
+import httpx
+
+# Owned
+from queryAPIBenchmarks.version import __version__ as benchmarks_version
+
+
+def new_run_id(started: datetime) -> str:
+    """
+    An id for a run that sorts by when it was started e.g 20250301-142501-1a2b3c
+    """
+    return f"{started:%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+
+def decode_samples(encoded: str) -> array:
+    """
+    The array of doubles from BenchmarkResult.samples()
+    """
+    samples = array('d')
+    samples.frombytes(base64.b64decode(encoded))
+
+    return samples
+
+
+class ResultsStore:
+    """
+    Keeps the result of every run in a JSON Lines file, one run per line, so that runs can be
+    compared later on.  A run has its id, an optional label, when it was run, the settings it was
+    run with, the machine it was run on and, for each test, its summary and raw samples
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+
+
+    @staticmethod
+    def environment() -> dict:
+        """
+        The machine and versions a run was made with
+        """
+        return {"hostname": socket.gethostname(),
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+                "cpus": os.cpu_count(),
+                "httpx": httpx.__version__,
+                "queryAPIBenchmarks": benchmarks_version}
+
+
+    def add(self, run_id: str, started: datetime, label: str, config: dict, test_results: dict) -> dict:
+        """
+        Adds a run to the end of the store
+
+        :param run_id - from new_run_id()
+        :param started - when the run was started
+        :param label - ( optional ) a name for the run e.g neo4j-5.26 to find it by later
+        :param config - the settings the run was made with.  Must not include passwords
+        :param test_results - BenchmarkResult or HistogramResult of each test, by name
+        :return: the run as it was stored
+        """
+        run = {"run_id": run_id,
+               "label": label,
+               "started": started.isoformat(),
+               "config": config,
+               "environment": ResultsStore.environment(),
+               "tests": {name: {"summary": result.summary(), "samples": result.samples()}
+                         for name, result in test_results.items()}}
+
+        with open(self._path, "a") as f:
+            f.write(json.dumps(run) + "\n")
+
+        print(f"\n Run {run_id} added to {self._path}\n")
+
+        return run
+
+
+    def runs(self) -> list:
+        """
+        Every run in the store, oldest first
+        """
+        if not os.path.exists(self._path):
+            return []
+
+        with open(self._path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+    def find(self, reference: str) -> dict | None:
+        """
+        Finds a run by its id, its label or its position e.g -1 for the latest run.
+        When more than one run has the label, the latest is returned
+
+        :param reference - run id, label or position
+        :return: the run or None when not found
+        """
+        runs = self.runs()
+
+        for run in reversed(runs):
+            if reference in (run["run_id"], run["label"]):
+                return run
+
+        try:
+            return runs[int(reference)]
+        except (ValueError, IndexError):
+            return None
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import asyncio
+import random
+import time
+
+# Owned
+from .customExceptions import APIException
+
+
+class RetryPolicy:
+    """
+    Tries a transaction again when it fails with a transient error, see APIException.transient, up to a number of times.
+    Between tries it waits a random time, up to a backoff that doubles with each try ( full jitter ), so that workers
+    that failed together do not all try again at the same moment.
+
+    The whole transaction is tried again rather than the request that failed as Neo4j rolls back a transaction
+    when one of its statements fails.  No retries by default, so a test measures each transaction once
+    """
+
+    def __init__(self, retries: int = 0, backoff: float = 0.05, max_backoff: float = 2.0):
+        """
+        :param retries - the most times to try a transaction again
+        :param backoff - seconds the first wait can be up to.  Doubled for each try after it
+        :param max_backoff - the most seconds any wait can be up to
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+
+    def delay(self, attempt: int) -> float:
+        """
+        Seconds to wait before trying again for the attempt'th time, counting from 0
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+    def run(self, transaction, *args, **kwargs) -> tuple:
+        """
+        Runs transaction, trying it again on a transient error
+
+        :param transaction - makes the transaction e.g TXsession.tx_session_implicit.  Given args and kwargs
+        :return: tuple of what transaction returned and the times it was tried again.
+                 The last APIException is raised, with retries set, when it does not succeed
+        """
+        attempt = 0
+
+        while True:
+            try:
+                return transaction(*args, **kwargs), attempt
+
+            except APIException as e:
+                if not e.transient or attempt >= self.retries:
+                    e.retries = attempt
+                    raise
+
+            time.sleep(self.delay(attempt))
+            attempt += 1
+
+
+    async def run_async(self, transaction, *args, **kwargs) -> tuple:
+        """
+        As run() but transaction is a coroutine function e.g TXasyncSession.tx_async_implicit
+        """
+        attempt = 0
+
+        while True:
+            try:
+                return await transaction(*args, **kwargs), attempt
+
+            except APIException as e:
+                if not e.transient or attempt >= self.retries:
+                    e.retries = attempt
+                    raise
+
+            await asyncio.sleep(self.delay(attempt))
+            attempt += 1
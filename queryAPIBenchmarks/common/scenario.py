@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import itertools
+import json
+import random
+
+# Owned
+from .parameterSource import POOL_SIZE, ParameterSource
+
+
+# Kinds of transaction a statement class can use
+TRANSACTIONS = ("managed", "implicit")
+
+# Access modes the Query API accepts
+ACCESS_MODES = ("READ", "WRITE")
+
+
+def alias_table(weights: list) -> tuple[list, list]:
+    """
+    Vose's alias table for weights.  Picking from it takes one random column and one
+    random number whatever the number of weights, rather than a search of the cumulative weights
+
+    :param weights - weight of each choice.  They need not add up to anything in particular
+    :return: tuple of the probability of keeping each column and the choice to use instead
+    """
+    count = len(weights)
+    total = sum(weights)
+    scaled = [weight * count / total for weight in weights]
+
+    probability = [1.0] * count
+    alias = list(range(count))
+
+    small = [index for index, weight in enumerate(scaled) if weight < 1.0]
+    large = [index for index, weight in enumerate(scaled) if weight >= 1.0]
+
+    while small and large:
+        less, more = small.pop(), large.pop()
+
+        probability[less] = scaled[less]
+        alias[less] = more
+
+        # The large column gives what the small one was short of
+        scaled[more] -= 1.0 - scaled[less]
+        (small if scaled[more] < 1.0 else large).append(more)
+
+    # Anything left over is 1 give or take rounding
+    return probability, alias
+
+
+def pick(probability: list, alias: list, rng: random.Random, count: int) -> list:
+    """
+    count random choices from an alias table
+
+    :return: list of the index of each choice
+    """
+    columns = len(probability)
+    choices = []
+
+    for _ in range(count):
+        column = int(rng.random() * columns)
+        choices.append(column if rng.random() < probability[column] else alias[column])
+
+    return choices
+
+
+class StatementClass:
+    """
+    One kind of transaction in a Scenario.  Its statements run in one transaction, with the same parameters
+    """
+
+    def __init__(self, name: str, weight: float, statements: list, transaction: str = "managed",
+                 access_mode: str = "", parameters: dict = None):
+        """
+        :param name - reported with the results of this class
+        :param weight - how often this class is picked compared with the others
+        :param statements - the cypher statements to run in each transaction
+        :param transaction - managed or implicit.  An implicit transaction has only one statement
+        :param access_mode - ( optional ) READ or WRITE.  Lets a cluster route reads to a secondary
+        :param parameters - ( optional ) spec of each parameter by name, see ParameterSource
+        """
+        if transaction not in TRANSACTIONS:
+            raise ValueError(f"{name}: transaction must be one of {', '.join(TRANSACTIONS)}")
+
+        if access_mode and access_mode not in ACCESS_MODES:
+            raise ValueError(f"{name}: access_mode must be one of {', '.join(ACCESS_MODES)}")
+
+        if not statements:
+            raise ValueError(f"{name}: has no statements")
+
+        if transaction == "implicit" and len(statements) > 1:
+            raise ValueError(f"{name}: an implicit transaction can only have one statement")
+
+        if weight <= 0:
+            raise ValueError(f"{name}: weight must be more than 0")
+
+        self.name = name
+        self.weight = weight
+        self.statements = statements
+        self.transaction = transaction
+        self.access_mode = access_mode
+        self.parameters = parameters or {}
+
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "weight": self.weight, "statements": self.statements, "transaction": self.transaction,
+                "access_mode": self.access_mode, "parameters": self.parameters}
+
+
+    @staticmethod
+    def from_dict(values: dict):
+        # A class with one statement can give it as cypher instead of statements
+        statements = values.get("statements") or ([values["cypher"]] if "cypher" in values else [])
+
+        return StatementClass(values["name"], float(values.get("weight", 1)), statements, values.get("transaction", "managed"),
+                              values.get("access_mode", ""), values.get("parameters"))
+
+
+class Scenario:
+    """
+    A weighted mix of statement classes, loaded from a JSON scenario file e.g
+
+        {
+          "seed": 1,
+          "classes": [
+            {"name": "read person", "weight": 80, "transaction": "implicit", "access_mode": "READ",
+             "cypher": "MATCH (p:Person {id: $id}) RETURN p", "parameters": {"id": "zipf:100000"}},
+            {"name": "add order", "weight": 20, "transaction": "managed", "access_mode": "WRITE",
+             "statements": ["MATCH (p:Person {id: $id}) CREATE (p)-[:PLACED]->(:Order {id: $order})",
+                            "MATCH (p:Person {id: $id}) SET p.orders = coalesce(p.orders, 0) + 1"],
+             "parameters": {"id": "uniform:1:100000", "order": "sequence"}}
+          ]
+        }
+
+    Which class each transaction uses, and its parameters, are picked before a test starts.  Classes
+    are picked from an alias table and are seeded, so a run sends the same mix every time
+    """
+
+    def __init__(self, classes: list, seed: int = 0, process: int = 0, processes: int = 1):
+        """
+        :param classes - the StatementClass of each kind of transaction
+        :param seed - seeds which class is picked and random parameters
+        :param process - which of processes this scenario is for
+        :param processes - the number of processes sharing the test
+        """
+        if not classes:
+            raise ValueError("A scenario needs at least one class")
+
+        names = [statement_class.name for statement_class in classes]
+        if len(set(names)) != len(names):
+            raise ValueError("Every class in a scenario needs its own name")
+
+        self.classes = classes
+        self.seed = seed
+        self.process = process
+        self.processes = processes
+        self._probability, self._alias = alias_table([statement_class.weight for statement_class in classes])
+
+        # Check the parameter specs now rather than when a test starts
+        self._parameters = [ParameterSource(statement_class.parameters, seed, process, processes) for statement_class in classes]
+
+
+    @staticmethod
+    def load(path: str, seed: int = 0):
+        """
+        Loads a scenario file.  The seed in the file is used in preference to seed
+
+        :param path - the JSON scenario file
+        :param seed - seeds which class is picked and random parameters
+        :return: Scenario
+        """
+        with open(path) as f:
+            values = json.load(f)
+
+        return Scenario([StatementClass.from_dict(statement_class) for statement_class in values.get("classes", [])],
+                        values.get("seed", seed))
+
+
+    @property
+    def names(self) -> tuple:
+        return tuple(statement_class.name for statement_class in self.classes)
+
+
+    def for_process(self, process: int, processes: int):
+        """
+        The scenario for one of a number of processes running the same test.  Each picks with its own seed
+        """
+        return Scenario(self.classes, self.seed, self.process * processes + process, self.processes * processes)
+
+
+    def to_dict(self) -> dict:
+        return {"classes": [statement_class.to_dict() for statement_class in self.classes],
+                "seed": self.seed, "process": self.process, "processes": self.processes}
+
+
+    @staticmethod
+    def from_dict(values: dict):
+        return Scenario([StatementClass.from_dict(statement_class) for statement_class in values["classes"]],
+                        values["seed"], values["process"], values["processes"])
+
+
+    def transactions(self, count: int = None):
+        """
+        The class and parameters of each transaction of a test.  Like ParameterSource.statements(), everything is
+        made up front and the iterator is made from C iterators so can be shared by threads without a lock
+
+        :param count - the number of transactions, None for a timed test
+        :return: iterator of ( StatementClass, parameters ).  parameters is None when the class has none
+        """
+        make = count if count is not None else POOL_SIZE
+
+        rng = random.Random(f"{self.seed}:scenario:{self.process}")
+        picks = pick(self._probability, self._alias, rng, make)
+
+        # Only as many parameters as each class was picked are needed
+        class_parameters = []
+        for index, statement_class in enumerate(self.classes):
+            picked = picks.count(index)
+            parameters = ParameterSource.statements("", self._parameters[index] if statement_class.parameters else None, picked)
+
+            if count is None and statement_class.parameters:
+                parameters = itertools.cycle(list(parameters))
+
+            class_parameters.append(parameters)
+
+        if count is None:
+            picks = itertools.cycle(picks)
+
+        return map(lambda index: (self.classes[index], next(class_parameters[index])[1]), picks)
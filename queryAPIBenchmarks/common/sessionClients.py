@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+# Generic / built in
+import itertools
+import threading
+
+# Owned
+from .clientOptions import ClientOptions
+from .customExceptions import APIException
+from .queryAPIOperations import TXsession
+from .requestTracer import RequestTracer
+
+
+class SessionClients:
+    """
+    The TXsession clients the workers of a threaded session test share, in the way the client options ask for
+        shared - one client, and its connection pool, for every worker.  What the tests have always done
+        per-thread - a client for each worker thread, made the first time the thread sends a request
+        round-robin - client_options.clients clients, each transaction using the next of them in turn
+
+    Every request of a managed transaction uses the client that began it, until it is committed or fails, as an
+    application's client would.  Its begin, run and commit then go over the same pool and are timed together.
+
+    Has the same tx_session_* methods as TXsession so it can be used in place of one.  The clients' connections
+    are closed once it is deleted
+    """
+
+    def __init__(self, url: str, usr: str, pwd: str, db: str, t_out: int, http2: bool = False, client_options: ClientOptions = None):
+        """
+        :param url - the URL of the Neo4j Query API
+        :param usr - the user account to use
+        :param pwd  - the password of the user account
+        :param db - the database to use
+        :param t_out - the network timeout
+        :param http2 - ( optional ) use HTTP/2
+        :param client_options - ( optional ) how the clients make their requests and which strategy to use
+        """
+        self._options = client_options or ClientOptions()
+        self._new_client = lambda: TXsession(url, usr, pwd, db, t_out, http2, self._options)
+        self._tracer: RequestTracer = None
+
+        # Every client made, so the tracer can be set on all of them
+        self._clients: list[TXsession] = []
+        self._lock = threading.Lock()
+
+        # The client that began each transaction still open, by transaction id
+        self._tx_clients: dict[str, TXsession] = {}
+
+        if self._options.client_strategy == "per-thread":
+            self._local = threading.local()
+            self._client = self._thread_client
+        elif self._options.client_strategy == "round-robin":
+            for _ in range(self._options.clients):
+                self._add_client()
+            turns = itertools.cycle(self._clients)
+            # next() on a cycle is not thread safe
+            self._client = lambda: self._next_client(turns)
+        else:
+            shared = self._add_client()
+            self._client = lambda: shared
+
+
+    def _add_client(self) -> TXsession:
+        """
+        PRIVATE
+        Makes a client and keeps it with the others
+        """
+        client = self._new_client()
+
+        with self._lock:
+            client.tracer = self._tracer
+            self._clients.append(client)
+
+        return client
+
+
+    def _thread_client(self) -> TXsession:
+        """
+        PRIVATE
+        The client of the calling thread
+        """
+        client = getattr(self._local, "client", None)
+
+        if client is None:
+            client = self._local.client = self._add_client()
+
+        return client
+
+
+    def _next_client(self, turns) -> TXsession:
+        """
+        PRIVATE
+        The client whose turn it is
+        """
+        with self._lock:
+            return next(turns)
+
+
+    def _tx_client(self, tx_id: str, finished: bool = False) -> TXsession:
+        """
+        PRIVATE
+        The client that began a transaction.  Forgotten once the transaction is finished
+        """
+        with self._lock:
+            client = self._tx_clients.pop(tx_id, None) if finished else self._tx_clients.get(tx_id)
+
+        return client or self._client()
+
+
+    @property
+    def tracer(self) -> RequestTracer:
+        return self._tracer
+
+
+    @tracer.setter
+    def tracer(self, tracer: RequestTracer):
+        # Clients made later, by new threads, take the tracer as they are made
+        with self._lock:
+            self._tracer = tracer
+
+            for client in self._clients:
+                client.tracer = tracer
+
+
+    def tx_session_id(self, access_mode: str = "", cypher: str = "", parameters: dict = None) -> tuple[str, str]:
+        client = self._client()
+        tx_id, cluster_affinity = client.tx_session_id(access_mode, cypher, parameters)
+
+        with self._lock:
+            self._tx_clients[tx_id] = client
+
+        return tx_id, cluster_affinity
+
+
+    def tx_session_cypher(self, tx_id: str, cypher: str, cluster_affinity: str = "", parameters: dict = None):
+        try:
+            return self._tx_client(tx_id).tx_session_cypher(tx_id, cypher, cluster_affinity, parameters)
+        except APIException:
+            # Neo4j has rolled the transaction back
+            self._tx_client(tx_id, finished=True)
+            raise
+
+
+    def tx_session_commit(self, tx_id: str, cluster_affinity: str = "", cypher: str = "", parameters: dict = None):
+        return self._tx_client(tx_id, finished=True).tx_session_commit(tx_id, cluster_affinity, cypher, parameters)
+
+
+    def tx_session_implicit(self, cypher: str, parameters: dict = None, access_mode: str = ""):
+        return self._client().tx_session_implicit(cypher, parameters, access_mode)
+
@@ -11,20 +11,25 @@ __email__ = 'jon.giffard@neo4j.com'
 __status__ = 'Alpha'
 
 # Generic / built in
+import json
+import re
 import seaborn as sns
 import matplotlib.pyplot as plt
 import texttable as tt
-import uuid
 
+# Owned
+from .latencyRecorder import PERCENTILES
+from .profiler import Profiler
 
 
-def generate_graph(test_results:dict):
+
+def generate_graph(test_results:dict, image_filename: str):
 
     names = []
     values = []
     for k, v in test_results.items():
         names.append(k)
-        values.append(v)
+        values.append(v.total_time)
 
     ax = sns.barplot(x=names, y=values)
     ax.set(ylabel='seconds')
@@ -36,8 +41,6 @@ def generate_graph(test_results:dict):
     plt.tight_layout()
 
     # Save the image file and inform user of the filename
-    image_filename = f"{uuid.uuid4().hex}.png"
-
     # Using bbox_inches='tight' makes sure that there is a min
     # of whitespace around the image
     plt.savefig(image_filename, bbox_inches='tight')
@@ -47,31 +50,649 @@ def generate_graph(test_results:dict):
     pass
 
 
-def generate_table(test_results:dict, num_requests: int):
+def generate_http_graph(test_results:dict, image_filename: str):
+    # This creates a stacked bar for each test of the mean time its requests spent in each part
+    # e.g connect, tls, send, ttfb and receive, so tests can be compared part by part
+
+    http_results = {name: result.summary()["http"] for name, result in test_results.items() if "http" in result.summary()}
+
+    plt.figure()
+
+    bottoms = [0.0] * len(http_results)
+
+    for part in next(iter(http_results.values())):
+        means = [http[part]["mean"] * 1000 for http in http_results.values()]
+        plt.bar(list(http_results), means, bottom=bottoms, label=part)
+        bottoms = [bottom + mean for bottom, mean in zip(bottoms, means)]
+
+    plt.ylabel('ms per request')
+    plt.legend()
+    plt.xticks(rotation=45, ha='right')
+    plt.tight_layout()
+
+    plt.savefig(image_filename, bbox_inches='tight')
+
+    print(f"\n Request parts graph saved as {image_filename}\n\n")
+
+    pass
+
+
+def generate_table(test_results:dict):
     # This creates a formatted table using texttable
 
     pretty_table = ''
 
     results_table = tt.Texttable(900)
 
-    # Set alignment for our 3 columns
-    results_table.set_cols_align(["l","l","l"])
+    percentile_headings = [f"p{pct:g} (ms)" for pct in PERCENTILES]
+
+    # Left align every column and show the values exactly as they have been formatted
+    results_table.set_cols_align(["l"] * (8 + len(percentile_headings)))
+    results_table.set_cols_dtype(["t"] * (8 + len(percentile_headings)))
 
     # Characters used for horizontal & vertical lines
     # You can have different horizontal line for the header if wanted
     results_table.set_chars(['-', '|', '-', '-'])
 
-    table_heading = ["Test","Time taken (s)","Requests/sec"]
+    table_heading = ["Test","Time taken (s)","Requests/sec","Target/sec","Min (ms)","Mean (ms)","StdDev (ms)"] + percentile_headings + ["Max (ms)"]
 
     table_rows = []
 
-    for name, value in test_results.items():
-        request_per_second = num_requests / value
-        table_rows.append([name, f"{value:.2f}", f"{request_per_second:.0f}"])
+    for name, result in test_results.items():
+        # Latencies are recorded in seconds but shown in milliseconds
+        latency = result.summary()["latency"]
+        percentile_values = [f"{latency[f'p{pct:g}'] * 1000:.2f}" for pct in PERCENTILES]
+
+        # Open loop tests have a target rate.  Closed loop go as fast as they can
+        target_rate = f"{result.target_rate:.0f}" if result.target_rate > 0 else "closed loop"
+
+        # A test stopped early with Ctrl-C is of the transactions made until then
+        shown_name = f"{name} ( stopped early )" if result.cancelled else name
+
+        table_rows.append([shown_name, f"{result.total_time:.2f}", f"{result.requests_per_second():.0f}", target_rate,
+                           f"{latency['min'] * 1000:.2f}", f"{latency['mean'] * 1000:.2f}", f"{latency['stddev'] * 1000:.2f}"]
+                          + percentile_values + [f"{latency['max'] * 1000:.2f}"])
 
     results_table.add_rows([table_heading] + table_rows)
 
     print (results_table.draw())
 
+    # Managed transaction tests also show how long each phase took
+    if any(result.phases for result in test_results.values()):
+        generate_phase_table(test_results)
+
+    # Scenario tests show each class of transaction in the mix
+    if any(result.classes for result in test_results.values()):
+        generate_classes_table(test_results)
+
+    # Transactions that failed, or were tried again, and why
+    if any("errors" in result.summary() for result in test_results.values()):
+        generate_errors_table(test_results)
+
+    # Parts of each HTTP request, such as the wait for a connection from the pool, timed by a RequestTracer
+    if any("http" in result.summary() for result in test_results.values()):
+        generate_http_table(test_results)
+
+    # What the client used while each test ran, and a warning for any test it may have held back
+    if any("resources" in result.summary() for result in test_results.values()):
+        generate_resources_table(test_results)
+
+    # Where the client spent its CPU, or memory, when profiled with --profile
+    if any(result.profile for result in test_results.values()):
+        generate_profile_table(test_results)
+
+    # Stepped tests show each step so the point where throughput stops rising can be found
+    if any(result.steps for result in test_results.values()):
+        generate_steps_table(test_results)
+
+    # A concurrency search shows each trial it ran
+    if any(result.search_trials for result in test_results.values()):
+        generate_search_table(test_results)
+
+    # A batch size sweep shows the rows per second of each batch size
+    if any(result.batch for result in test_results.values()):
+        generate_batch_table(test_results)
+
+    pass
+
+
+def generate_phase_table(test_results:dict):
+    # This creates a table with the latency of each phase of a transaction
+    # for those tests that record them e.g begin, run and commit for managed transactions
+
+    phases_table = tt.Texttable(900)
+
+    percentile_headings = [f"p{pct:g} (ms)" for pct in PERCENTILES]
+
+    phases_table.set_cols_align(["l"] * (6 + len(percentile_headings)))
+    phases_table.set_cols_dtype(["t"] * (6 + len(percentile_headings)))
+    phases_table.set_chars(['-', '|', '-', '-'])
+
+    table_heading = ["Test","Phase","Share of tx (%)","Mean (ms)","StdDev (ms)"] + percentile_headings + ["Max (ms)"]
+
+    table_rows = []
+
+    for name, result in test_results.items():
+        summary = result.summary()
+        tx_time = summary["latency"]["total"]
+
+        for phase, latency in summary.get("phases", {}).items():
+            percentile_values = [f"{latency[f'p{pct:g}'] * 1000:.2f}" for pct in PERCENTILES]
+
+            # How much of the total transaction time was spent in this phase
+            phase_share = 100 * latency["total"] / tx_time if tx_time > 0 else 0.0
+
+            table_rows.append([name, phase, f"{phase_share:.1f}", f"{latency['mean'] * 1000:.2f}", f"{latency['stddev'] * 1000:.2f}"]
+                              + percentile_values + [f"{latency['max'] * 1000:.2f}"])
+
+    phases_table.add_rows([table_heading] + table_rows)
+
+    print (phases_table.draw())
+
+    pass
+
+
+def generate_classes_table(test_results:dict):
+    # This creates a table with the throughput and latency of each class of transaction in a scenario
+
+    classes_table = tt.Texttable(900)
+
+    percentile_headings = [f"p{pct:g} (ms)" for pct in PERCENTILES]
+
+    classes_table.set_cols_align(["l"] * (6 + len(percentile_headings)))
+    classes_table.set_cols_dtype(["t"] * (6 + len(percentile_headings)))
+    classes_table.set_chars(['-', '|', '-', '-'])
+
+    table_heading = ["Test","Class","Share of tx (%)","Requests/sec","Mean (ms)"] + percentile_headings + ["Max (ms)"]
+
+    table_rows = []
+
+    for name, result in test_results.items():
+        summary = result.summary()
+        tx_count = summary["latency"]["count"]
+
+        for statement_class, class_result in summary.get("classes", {}).items():
+            latency = class_result["latency"]
+            percentile_values = [f"{latency[f'p{pct:g}'] * 1000:.2f}" for pct in PERCENTILES]
+
+            # How many of the transactions were of this class
+            class_share = 100 * latency["count"] / tx_count if tx_count > 0 else 0.0
+
+            table_rows.append([name, statement_class, f"{class_share:.1f}", f"{class_result['requests_per_second']:.0f}", f"{latency['mean'] * 1000:.2f}"]
+                              + percentile_values + [f"{latency['max'] * 1000:.2f}"])
+
+    classes_table.add_rows([table_heading] + table_rows)
+
+    print (classes_table.draw())
+
+    pass
+
+
+def generate_errors_table(test_results:dict):
+    # This creates a table with how many transactions of each test failed and were tried again, and the latency of each,
+    # followed by one with the number of failures of each error code
+
+    errors_table = tt.Texttable(900)
+
+    errors_table.set_cols_align(["l"] * 9)
+    errors_table.set_cols_dtype(["t"] * 9)
+    errors_table.set_chars(['-', '|', '-', '-'])
+
+    table_heading = ["Test","Failed","Error rate (%)","Retries","Retried tx","Failed p50 (ms)","Failed p99 (ms)","Retried p50 (ms)","Retried p99 (ms)"]
+
+    table_rows = []
+    code_rows = []
+
+    for name, result in test_results.items():
+        errors = result.summary().get("errors")
+
+        if not errors:
+            continue
+
+        failed = errors["failed_latency"]
+        retried = errors["retried_latency"]
+
+        table_rows.append([name, f"{errors['failed']}", f"{errors['error_rate'] * 100:.2f}", f"{errors['retries']}", f"{retried['count']}",
+                           f"{failed['p50'] * 1000:.2f}", f"{failed['p99'] * 1000:.2f}", f"{retried['p50'] * 1000:.2f}", f"{retried['p99'] * 1000:.2f}"])
+
+        for code, error in sorted(errors["by_code"].items(), key=lambda item: -item[1]["count"]):
+            code_rows.append([name, error["class"], code, f"{error['count']}"])
+
+    errors_table.add_rows([table_heading] + table_rows)
+
+    print (errors_table.draw())
+
+    if code_rows:
+        codes_table = tt.Texttable(900)
+
+        codes_table.set_cols_align(["l"] * 4)
+        codes_table.set_cols_dtype(["t"] * 4)
+        codes_table.set_chars(['-', '|', '-', '-'])
+
+        codes_table.add_rows([["Test","Class","Code","Failed"]] + code_rows)
+
+        print (codes_table.draw())
+
     pass
 
+
+def generate_http_table(test_results:dict):
+    # This creates a table with the latency of each timed part of the HTTP requests a test made, in the order they happen
+    # e.g pool_wait, connect, tls, send, ttfb and receive, and the share of the request time spent in each
+
+    http_table = tt.Texttable(900)
+
+    percentile_headings = [f"p{pct:g} (ms)" for pct in PERCENTILES]
+
+    http_table.set_cols_align(["l"] * (6 + len(percentile_headings)))
+    http_table.set_cols_dtype(["t"] * (6 + len(percentile_headings)))
+    http_table.set_chars(['-', '|', '-', '-'])
+
+    table_heading = ["Test","Part","Requests","Share of request (%)","Mean (ms)"] + percentile_headings + ["Max (ms)"]
+
+    table_rows = []
+
+    for name, result in test_results.items():
+        http = result.summary().get("http", {})
+        request_time = sum(latency["total"] for latency in http.values())
+
+        for part, latency in http.items():
+            percentile_values = [f"{latency[f'p{pct:g}'] * 1000:.2f}" for pct in PERCENTILES]
+
+            # How much of the time of all the requests was spent in this part
+            part_share = 100 * latency["total"] / request_time if request_time > 0 else 0.0
+
+            table_rows.append([name, part, f"{latency['count']}", f"{part_share:.1f}", f"{latency['mean'] * 1000:.2f}"]
+                              + percentile_values + [f"{latency['max'] * 1000:.2f}"])
+
+    http_table.add_rows([table_heading] + table_rows)
+
+    print (http_table.draw())
+
+    pass
+
+
+def generate_resources_table(test_results:dict):
+    # This creates a table with the CPU, memory, sockets and garbage collection of the client while each test ran, sampled
+    # by a ResourceSampler, then warns about any test where the client used close to all of a core.  With more than one
+    # process the CPU and memory are of the busiest of them
+
+    resources_table = tt.Texttable(900)
+
+    resources_table.set_cols_align(["l"] * 13)
+    resources_table.set_cols_dtype(["t"] * 13)
+    resources_table.set_chars(['-', '|', '-', '-'])
+
+    table_heading = ["Test","Processes","CPU mean (%)","CPU max (%)","Busiest thread max (%)","Memory max (MB)","Sockets max",
+                     "GC pauses","GC time (ms)","GC max pause (ms)","In flight max","Loop lag max (ms)","Client bound"]
+
+    table_rows = []
+    client_bound = []
+
+    for name, result in test_results.items():
+        resources = result.summary().get("resources")
+
+        if not resources:
+            continue
+
+        # Only thread tests know what is in flight and only async tests have an event loop
+        in_flight = f"{resources['in_flight_max']}" if "in_flight_max" in resources else "-"
+        loop_lag = f"{resources['loop_lag_max'] * 1000:.2f}" if "loop_lag_max" in resources else "-"
+
+        table_rows.append([name, f"{resources['processes']}", f"{resources['cpu_mean']:.0f}", f"{resources['cpu_max']:.0f}",
+                           f"{resources['busiest_thread_max']:.0f}", f"{resources['rss_max'] / 1048576:.1f}", f"{resources['sockets_max']}",
+                           f"{resources['gc_pauses']}", f"{resources['gc_time'] * 1000:.2f}", f"{resources['gc_max_pause'] * 1000:.2f}",
+                           in_flight, loop_lag, "yes" if resources["cpu_bound"] else "no"])
+
+        if resources["cpu_bound"]:
+            client_bound.append((name, resources["cpu_mean"]))
+
+    resources_table.add_rows([table_heading] + table_rows)
+
+    print (resources_table.draw())
+
+    for name, cpu_mean in client_bound:
+        print (f"Warning: {name} used {cpu_mean:.0f}% of a core on the client.  Its results may show the limit of the client rather "
+               f"than of Neo4j.  Try again with more --processes or machines")
+
+    pass
+
+
+def generate_steps_table(test_results:dict):
+    # This creates a table with the throughput and latency of each step of a stepped test
+
+    steps_table = tt.Texttable(900)
+
+    steps_table.set_cols_align(["l"] * 9)
+    steps_table.set_cols_dtype(["t"] * 9)
+    steps_table.set_chars(['-', '|', '-', '-'])
+
+    table_heading = ["Test","Step","Start (s)","Workers","Target/sec","Requests/sec","p50 (ms)","p99 (ms)","Max (ms)"]
+
+    table_rows = []
+
+    for name, result in test_results.items():
+        for step in result.summary().get("steps", []):
+            latency = step["latency"]
+            target_rate = f"{step['target_rate']:.0f}" if step["target_rate"] > 0 else "closed loop"
+
+            table_rows.append([name, f"{step['step']}", f"{step['start']:.0f}", f"{step['workers']}", target_rate,
+                               f"{step['requests_per_second']:.0f}", f"{latency['p50'] * 1000:.2f}",
+                               f"{latency['p99'] * 1000:.2f}", f"{latency['max'] * 1000:.2f}"])
+
+    steps_table.add_rows([table_heading] + table_rows)
+
+    print (steps_table.draw())
+
+    pass
+
+
+def generate_json(test_results:dict, json_filename: str):
+    # Writes the results of each test to a file as JSON so they can be used by other tools
+    # All latencies are in seconds
+
+    json_results = {name: result.summary() for name, result in test_results.items()}
+
+    with open(json_filename, "w") as f:
+        json.dump(json_results, f, indent=2)
+
+    print(f"\n Results saved as {json_filename}\n\n")
+
+    pass
+
+
+def generate_profile_files(test_results:dict, file_prefix: str):
+    # Writes the collapsed stacks of each profiled test to a file of its own, one line per stack, for a flame graph tool
+    # such as flamegraph.pl or speedscope.  Counted in samples for a cpu profile and in bytes for an alloc profile
+
+    for name, result in test_results.items():
+        if not result.profile:
+            continue
+
+        # Test names, such as those of a batch size sweep, can have spaces in them
+        folded_filename = f"{file_prefix}_{re.sub(r'[^A-Za-z0-9_.-]+', '_', name)}_{result.profile['mode']}.folded"
+
+        Profiler.write_folded(result.profile, folded_filename)
+
+        print(f"\n Profile of {name} saved as {folded_filename}")
+
+    pass
+
+
+def generate_profile_table(test_results:dict):
+    # This creates a table with the share of each package e.g httpx, json, tqdm or queryAPIBenchmarks, in the CPU samples or the
+    # memory of each profiled test, followed by one with its top functions, by the samples they were running in themselves,
+    # or its top allocation sites
+
+    packages_table = tt.Texttable(900)
+
+    packages_table.set_cols_align(["l"] * 4)
+    packages_table.set_cols_dtype(["t"] * 4)
+    packages_table.set_chars(['-', '|', '-', '-'])
+
+    package_rows = []
+    cpu_rows = []
+    alloc_rows = []
+
+    for name, result in test_results.items():
+        profile = result.summary().get("profile")
+
+        if not profile:
+            continue
+
+        for package, share in profile["packages"].items():
+            package_rows.append([name, profile["mode"], package, f"{share:.1f}"])
+
+        if profile["mode"] == "cpu":
+            for function in profile["top"]:
+                cpu_rows.append([name, function["function"], f"{function['self']:.1f}", f"{function['total']:.1f}"])
+        else:
+            for site in profile["top"]:
+                alloc_rows.append([name, site["site"], f"{site['size'] / 1024:.1f}", f"{site['count']}"])
+
+    packages_table.add_rows([["Test","Profile","Package","Share (%)"]] + package_rows)
+
+    print (packages_table.draw())
+
+    if cpu_rows:
+        cpu_table = tt.Texttable(900)
+
+        cpu_table.set_cols_align(["l"] * 4)
+        cpu_table.set_cols_dtype(["t"] * 4)
+        cpu_table.set_chars(['-', '|', '-', '-'])
+
+        cpu_table.add_rows([["Test","Function","Self (%)","Total (%)"]] + cpu_rows)
+
+        print (cpu_table.draw())
+
+    if alloc_rows:
+        alloc_table = tt.Texttable(900)
+
+        alloc_table.set_cols_align(["l"] * 4)
+        alloc_table.set_cols_dtype(["t"] * 4)
+        alloc_table.set_chars(['-', '|', '-', '-'])
+
+        alloc_table.add_rows([["Test","Allocated at","Size (KB)","Blocks"]] + alloc_rows)
+
+        print (alloc_table.draw())
+
+    pass
+
+
+def generate_search_table(test_results:dict):
+    # This creates a table with each trial of a concurrency search.  The best trial is marked
+
+    search_table = tt.Texttable(900)
+
+    search_table.set_cols_align(["l"] * 8)
+    search_table.set_cols_dtype(["t"] * 8)
+    search_table.set_chars(['-', '|', '-', '-'])
+
+    table_heading = ["Test","Trial","Workers","Target/sec","Requests/sec","p99 (ms)","Errors (%)","Inside bound"]
+
+    table_rows = []
+
+    for name, result in test_results.items():
+        for trial in result.search_trials:
+            target_rate = f"{trial['rate']:.0f}" if trial["rate"] > 0 else "closed loop"
+            inside_bound = "yes" if trial["within_bound"] else "no"
+
+            if trial.get("best"):
+                inside_bound += " ( best )"
+
+            table_rows.append([name, f"{trial['trial']}", f"{trial['workers']}", target_rate,
+                               f"{trial['requests_per_second']:.0f}", f"{trial['p99'] * 1000:.2f}", f"{trial.get('error_rate', 0.0) * 100:.2f}", inside_bound])
+
+    search_table.add_rows([table_heading] + table_rows)
+
+    print (search_table.draw())
+
+    pass
+
+
+def generate_batch_table(test_results:dict):
+    # This creates a table of the throughput in rows and latency of each batch size of a batch size sweep
+
+    batch_table = tt.Texttable(900)
+
+    batch_table.set_cols_align(["l"] * 8)
+    batch_table.set_cols_dtype(["t"] * 8)
+    batch_table.set_chars(['-', '|', '-', '-'])
+
+    table_heading = ["Test","Batch size","Request size (KB)","Requests/sec","Rows/sec","Mean (ms)","p50 (ms)","p99 (ms)"]
+
+    table_rows = []
+
+    for name, result in test_results.items():
+        summary = result.summary()
+
+        if "batch" not in summary:
+            continue
+
+        batch = summary["batch"]
+        latency = summary["latency"]
+
+        table_rows.append([name, f"{batch['batch_size']}", f"{batch['request_bytes'] / 1024:.1f}", f"{summary['requests_per_second']:.0f}",
+                           f"{batch['rows_per_second']:.0f}", f"{latency['mean'] * 1000:.2f}", f"{latency['p50'] * 1000:.2f}", f"{latency['p99'] * 1000:.2f}"])
+
+    batch_table.add_rows([table_heading] + table_rows)
+
+    print (batch_table.draw())
+
+    pass
+
+
+def generate_decode_table(costs: list):
+    # This creates a table of how long each way of reading a response took, for each size of response
+
+    readers = list(costs[0]["seconds"]) if costs else []
+
+    decode_table = tt.Texttable(900)
+
+    decode_table.set_cols_align(["l"] * (2 + 2 * len(readers)))
+    decode_table.set_cols_dtype(["t"] * (2 + 2 * len(readers)))
+    decode_table.set_chars(['-', '|', '-', '-'])
+
+    table_heading = ["Rows", "Response (KB)"] + [f"{reader} (ms)" for reader in readers] + [f"{reader} (MB/s)" for reader in readers]
+
+    table_rows = []
+
+    for cost in costs:
+        seconds = cost["seconds"]
+
+        table_rows.append([f"{cost['rows']}", f"{cost['response_bytes'] / 1024:.1f}"] +
+                          [f"{seconds[reader] * 1000:.3f}" for reader in readers] +
+                          [f"{cost['response_bytes'] / seconds[reader] / 1e6:.0f}" for reader in readers])
+
+    decode_table.add_rows([table_heading] + table_rows)
+
+    print (decode_table.draw())
+
+    pass
+
+
+def generate_format_table(comparison: list):
+    # This creates a table of the response size, server time and decode time of each response format for each result shape
+
+    format_table = tt.Texttable(900)
+
+    format_table.set_cols_align(["l"] * 9)
+    format_table.set_cols_dtype(["t"] * 9)
+    format_table.set_chars(['-', '|', '-', '-'])
+
+    table_heading = ["Shape", "Format", "Response (KB)", "Server mean (ms)", "Server p99 (ms)", "Decode mean (ms)", "Decode p99 (ms)",
+                     "Decode (MB/s)", "Decode (% of total)"]
+
+    table_rows = []
+
+    for entry in comparison:
+        server = entry["server"]
+        decode = entry["decode"]
+
+        decode_rate = entry["response_bytes"] / decode["mean"] / 1e6 if decode["mean"] else 0.0
+        decode_share = 100 * decode["mean"] / (server["mean"] + decode["mean"]) if server["mean"] + decode["mean"] else 0.0
+
+        table_rows.append([entry["shape"], entry["response_format"], f"{entry['response_bytes'] / 1024:.1f}",
+                           f"{server['mean'] * 1000:.2f}", f"{server['p99'] * 1000:.2f}",
+                           f"{decode['mean'] * 1000:.3f}", f"{decode['p99'] * 1000:.3f}", f"{decode_rate:.0f}", f"{decode_share:.1f}"])
+
+    format_table.add_rows([table_heading] + table_rows)
+
+    print (format_table.draw())
+
+    pass
+
+
+def generate_compression_table(sweep: list):
+    # This creates a table of the bytes downloaded, client CPU time and latency of each encoding for each result size
+
+    compression_table = tt.Texttable(900)
+
+    compression_table.set_cols_align(["l"] * 9)
+    compression_table.set_cols_dtype(["t"] * 9)
+    compression_table.set_chars(['-', '|', '-', '-'])
+
+    table_heading = ["Rows", "Encoding", "Response (KB)", "On the wire (KB)", "Ratio", "Client CPU (ms)", "Mean (ms)", "p50 (ms)", "p99 (ms)"]
+
+    table_rows = []
+
+    for entry in sweep:
+        latency = entry["latency"]
+        ratio = entry["response_bytes"] / entry["wire_bytes"] if entry["wire_bytes"] else 0.0
+
+        table_rows.append([f"{entry['rows']}", entry["encoding"], f"{entry['response_bytes'] / 1024:.1f}", f"{entry['wire_bytes'] / 1024:.1f}",
+                           f"{ratio:.1f}", f"{entry['cpu'] * 1000:.3f}", f"{latency['mean'] * 1000:.2f}", f"{latency['p50'] * 1000:.2f}",
+                           f"{latency['p99'] * 1000:.2f}"])
+
+    compression_table.add_rows([table_heading] + table_rows)
+
+    print (compression_table.draw())
+
+    pass
+
+
+def generate_multiplex_table(sweep: list):
+    # This creates a table comparing HTTP/2 multiplexing with HTTP/1.1 connections for each number of connections and streams.
+    # p99 / p50 growing with the streams on each connection shows requests held up behind others on the same connection
+
+    multiplex_table = tt.Texttable(900)
+
+    multiplex_table.set_cols_align(["l"] * 12)
+    multiplex_table.set_cols_dtype(["t"] * 12)
+    multiplex_table.set_chars(['-', '|', '-', '-'])
+
+    table_heading = ["Protocol", "Agreed", "Connections", "In flight", "Peak streams", "Streams/conn", "Requests/sec",
+                     "p50 (ms)", "p99 (ms)", "p99 / p50", "Max (ms)", "Pool wait p99 (ms)"]
+
+    table_rows = []
+
+    for entry in sweep:
+        latency = entry["latency"]
+        spread = latency["p99"] / latency["p50"] if latency["p50"] > 0 else 0.0
+
+        table_rows.append([entry["protocol"], entry["http_version"], f"{entry['connections']}", f"{entry['concurrency']}",
+                           f"{entry['peak_streams']}", f"{entry['streams_per_connection']:.1f}", f"{entry['requests_per_second']:.0f}",
+                           f"{latency['p50'] * 1000:.2f}", f"{latency['p99'] * 1000:.2f}", f"{spread:.1f}",
+                           f"{latency['max'] * 1000:.2f}", f"{entry['pool_wait']['p99'] * 1000:.2f}"])
+
+    multiplex_table.add_rows([table_heading] + table_rows)
+
+    print (multiplex_table.draw())
+
+    pass
+
+
+def generate_compare_table(comparisons: list, baseline: dict, current: dict):
+    # This creates a table comparing the throughput and p99 latency of two runs from a ResultsStore
+
+    compare_table = tt.Texttable(900)
+
+    compare_table.set_cols_align(["l"] * 7)
+    compare_table.set_cols_dtype(["t"] * 7)
+    compare_table.set_chars(['-', '|', '-', '-'])
+
+    table_heading = ["Test", "Metric", f"Baseline {baseline['label'] or baseline['run_id']}", f"Current {current['label'] or current['run_id']}",
+                     "Change (%)", "p value", "Regression"]
+
+    table_rows = []
+
+    for comparison in comparisons:
+        if comparison["metric"] == "p99":
+            metric = "p99 (ms)"
+            baseline_value = f"{comparison['baseline'] * 1000:.2f}"
+            current_value = f"{comparison['current'] * 1000:.2f}"
+        else:
+            metric = "Requests/sec"
+            baseline_value = f"{comparison['baseline']:.0f}"
+            current_value = f"{comparison['current']:.0f}"
+
+        p_value = "n/a" if comparison["p"] is None else f"{comparison['p']:.4f}"
+
+        table_rows.append([comparison["test"], metric, baseline_value, current_value, f"{comparison['change']:+.1f}",
+                           p_value, "YES" if comparison["regression"] else "no"])
+
+    compare_table.add_rows([table_heading] + table_rows)
+
+    print (compare_table.draw())
+
+    pass
@@ -15,22 +15,34 @@ __status__ = 'Alpha'
 import logging
 # Generic / built in
 import os
-from datetime import timedelta
+from datetime import datetime
 
 import click
 from dotenv import load_dotenv
 
 # Owned
-from queryAPIBenchmarks.benchmarks import (BenchmarkSync,
+from queryAPIBenchmarks.benchmarks import (BatchSweep,
+                                           BenchmarkAsyncSessions,
+                                           BenchmarkAsyncSessionsImplicit,
+                                           BenchmarkSync,
                                            BenchmarkSyncImplicit,
                                            BenchmarkSyncSessions,
                                            BenchmarkSyncSessionsImplicit,
                                            BenchmarkThreads,
                                            BenchmarkThreadsImplicit,
                                            BenchmarkThreadsSessions,
-                                           BenchmarkThreadsSessionsImplicit)
+                                           BenchmarkThreadsSessionsImplicit,
+                                           ConcurrencySearch,
+                                           Distributed,
+                                           BenchmarkScenario,
+                                           MultiProcess)
+from queryAPIBenchmarks.common import BATCH_PARAMETER, CLIENT_STRATEGIES, CONTENT_ENCODINGS, JSON_CODEC, PROFILE_MODES, RESPONSE_FORMATS, ClientOptions, LoadProfile, ParameterSource, ProcessStartError, Profiler, ResultsStore, Scenario, TransactionShape, WorkerAgentError, new_run_id, start_mock_query_api
 from queryAPIBenchmarks.common.showResults import (generate_graph,
+                                                   generate_http_graph,
+                                                   generate_json,
+                                                   generate_profile_files,
                                                    generate_table)
+from queryAPIBenchmarks.queryAPIMockServer import mock_settings
 
 # Configure logging
 logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -45,11 +57,48 @@ NEO4J_USR = os.getenv('NEO4J_USERNAME')
 NEO4J_PWD = os.getenv('NEO4J_PASSWORD')
 NEO4J_DB = os.getenv('NEO4J_DATABASE')
 NEO4J_CYPHER = os.getenv('NEO4J_CYPHER')
-OUTPUT_GRAPH = int(os.getenv('OUTPUT_GRAPH',0))
-OUTPUT_TABLE = int(os.getenv('OUTPUT_TABLE',1))
+# Switches are left as strings, e.g 0, 1, true or false, for click to turn into a bool
+OUTPUT_GRAPH = os.getenv('OUTPUT_GRAPH', '0')
+OUTPUT_TABLE = os.getenv('OUTPUT_TABLE', '1')
+OUTPUT_JSON = os.getenv('OUTPUT_JSON', '')
 NETWORK_TIMEOUT = int(os.getenv('NETWORK_TIMEOUT',30))
 MAX_WORKERS = int(os.getenv('MAX_WORKERS', 5))
-NETWORK_HTTP2 = bool(os.getenv('NETWORK_HTTP2',0))
+NETWORK_HTTP2 = os.getenv('NETWORK_HTTP2', '0')
+RATE = float(os.getenv('RATE', 0))
+DURATION = float(os.getenv('DURATION', 0))
+WARM_UP = float(os.getenv('WARM_UP', 0))
+COOL_DOWN = float(os.getenv('COOL_DOWN', 0))
+STEP_EVERY = float(os.getenv('STEP_EVERY', 0))
+STEP_WORKERS = int(os.getenv('STEP_WORKERS', 0))
+STEP_RATE = float(os.getenv('STEP_RATE', 0))
+SEARCH_LATENCY_BOUND = float(os.getenv('SEARCH_LATENCY_BOUND', 100))
+SEARCH_TRIAL_TIME = float(os.getenv('SEARCH_TRIAL_TIME', 10))
+SEARCH_MAX_TRIALS = int(os.getenv('SEARCH_MAX_TRIALS', 12))
+SEARCH_ERROR_BOUND = float(os.getenv('SEARCH_ERROR_BOUND', 1))
+PROCESSES = int(os.getenv('PROCESSES', 1))
+DISTRIBUTE = os.getenv('DISTRIBUTE', '')
+WORKER_TOKEN = os.getenv('WORKER_TOKEN', '')
+RESULTS_STORE = os.getenv('RESULTS_STORE', '')
+PROFILE = os.getenv('PROFILE', '')
+PROFILE_TOP = int(os.getenv('PROFILE_TOP', 20))
+NEO4J_PARAMETERS = os.getenv('NEO4J_PARAMETERS', '')
+PARAMETER_SEED = int(os.getenv('PARAMETER_SEED', 0))
+SCENARIO = os.getenv('SCENARIO', '')
+STATEMENTS_PER_TX = int(os.getenv('STATEMENTS_PER_TX', 1))
+TX_REUSE = int(os.getenv('TX_REUSE', 1))
+BATCH_SIZES = os.getenv('BATCH_SIZES', '')
+RESPONSE_FORMAT = os.getenv('RESPONSE_FORMAT', 'json')
+ACCEPT_ENCODING = os.getenv('ACCEPT_ENCODING', '')
+REQUEST_ENCODING = os.getenv('REQUEST_ENCODING', 'identity')
+MAX_CONNECTIONS = int(os.getenv('MAX_CONNECTIONS', 0))
+MAX_KEEPALIVE = int(os.getenv('MAX_KEEPALIVE', 0))
+KEEPALIVE_EXPIRY = float(os.getenv('KEEPALIVE_EXPIRY', 5))
+POOL_TIMEOUT = float(os.getenv('POOL_TIMEOUT', 0))
+CLIENT_STRATEGY = os.getenv('CLIENT_STRATEGY', 'shared')
+CLIENTS = int(os.getenv('CLIENTS', 4))
+RETRIES = int(os.getenv('RETRIES', 0))
+RETRY_BACKOFF = float(os.getenv('RETRY_BACKOFF', 0.05))
+RETRY_MAX_BACKOFF = float(os.getenv('RETRY_MAX_BACKOFF', 2))
 
 benchmark_test_map = {
     "Sync": BenchmarkSync,
@@ -59,9 +108,18 @@ benchmark_test_map = {
     "SyncImplicit": BenchmarkSyncImplicit,
     "SyncSessionsImplicit": BenchmarkSyncSessionsImplicit,
     "ThreadsImplicit": BenchmarkThreadsImplicit,
-    "ThreadsSessionsImplicit": BenchmarkThreadsSessionsImplicit
+    "ThreadsSessionsImplicit": BenchmarkThreadsSessionsImplicit,
+    "AsyncSessions": BenchmarkAsyncSessions,
+    "AsyncSessionsImplicit": BenchmarkAsyncSessionsImplicit,
+    "Scenario": BenchmarkScenario
 }
 
+# Tests that use managed transactions and so can have more than one statement in each
+managed_tests = ["Sync", "SyncSessions", "Threads", "ThreadsSessions", "AsyncSessions"]
+
+# Tests that use more than one worker and so can have their concurrency searched
+searchable_tests = ["Threads", "ThreadsSessions", "ThreadsImplicit", "ThreadsSessionsImplicit", "AsyncSessions", "AsyncSessionsImplicit", "Scenario"]
+
 @click.command()
 @click.option("--tests", "-t", required=True, type=click.Choice(list(benchmark_test_map.keys())), multiple=True)
 @click.option("--num-requests", "-n", default=NUM_REQUESTS, type=int)
@@ -70,30 +128,238 @@ benchmark_test_map = {
 @click.option("--neo4j-pwd", "-pwd", default=NEO4J_PWD, type=str)
 @click.option("--neo4j-db", "-db", default=NEO4J_DB, type=str)
 @click.option("--neo4j-cypher", "-cypher", default=NEO4J_CYPHER, type=str)
+@click.option("--param", "-param", "params", multiple=True, default=NEO4J_PARAMETERS.split(), help="Parameter for the cypher statement as name=spec e.g id=sequence:1, id=uniform:1:1000, id=zipf:1000:1.1 or name=csv:file.csv:column. Can be given more than once")
+@click.option("--param-seed", default=PARAMETER_SEED, type=int, help="Seed for random parameters so that the same values are sent every run")
+@click.option("--scenario", "-scenario", default=SCENARIO, type=str, help="JSON file with the weighted mix of transactions for the Scenario test")
+@click.option("--statements-per-tx", "-statements", default=STATEMENTS_PER_TX, type=int, help="Statements, each with their own parameters, to run in each managed transaction")
+@click.option("--pipeline", is_flag=True, default=False, help="Send the first statement of a managed transaction with its begin and the last one with its commit")
+@click.option("--tx-reuse", default=TX_REUSE, type=int, help="Run this many transactions' worth of statements in one managed transaction, kept open for up to 20 seconds, before committing it")
+@click.option("--batch-sizes", "-batch", default=BATCH_SIZES, type=str, help=f"Comma separated batch sizes e.g 1,10,100,1000,10000 to run each test with, sending that many rows as ${BATCH_PARAMETER}. --param gives the fields of each row")
 @click.option("--output-graph", "-graph", default=OUTPUT_GRAPH, type=bool)
 @click.option("--output-table", "-table", default=OUTPUT_TABLE, type=bool)
+@click.option("--output-json", "-json", default=OUTPUT_JSON, type=str, help="Write the results, including latency percentiles, to this file as JSON")
 @click.option("--network-timeout", "-timeout", default=NETWORK_TIMEOUT, type=int)
 @click.option("--max-workers", "-workers", default=MAX_WORKERS, type=int)
 @click.option("--network-http2", "-http2", default=NETWORK_HTTP2, type=bool)
-def run_benchmark_tests(tests: dict, num_requests: int, neo4j_url: str, neo4j_usr: str, neo4j_pwd: str, neo4j_cypher: str, neo4j_db: str, output_graph: bool, output_table: bool, max_workers: int, network_timeout, network_http2: bool) -> None:
+@click.option("--response-format", "-format", default=RESPONSE_FORMAT, type=click.Choice(list(RESPONSE_FORMATS)), help="Ask the Query API to answer in plain JSON or typed JSON")
+@click.option("--accept-encoding", default=ACCEPT_ENCODING, type=str, help="Accept-Encoding header, the compression responses may use e.g gzip, zstd or identity for none. httpx asks for gzip and deflate when not given")
+@click.option("--request-encoding", default=REQUEST_ENCODING, type=click.Choice(list(CONTENT_ENCODINGS)), help="Compress request bodies with this. identity is no compression")
+@click.option("--max-connections", default=MAX_CONNECTIONS, type=int, help="Most connections in each client's pool. 0 for httpx's 100, or the workers of an async test")
+@click.option("--max-keepalive", default=MAX_KEEPALIVE, type=int, help="Most idle connections each client's pool keeps open. 0 for httpx's 20, or the workers of an async test")
+@click.option("--keepalive-expiry", default=KEEPALIVE_EXPIRY, type=float, help="Seconds an idle connection is kept open for")
+@click.option("--pool-timeout", default=POOL_TIMEOUT, type=float, help="Seconds a request waits for a connection from the pool before failing. 0 for --network-timeout")
+@click.option("--client-strategy", default=CLIENT_STRATEGY, type=click.Choice(list(CLIENT_STRATEGIES)), help="How the threads of ThreadsSessions, ThreadsSessionsImplicit and Scenario share clients: one shared client, one per thread or --clients in turn")
+@click.option("--clients", default=CLIENTS, type=int, help="Clients to take turns with, a transaction at a time, for --client-strategy round-robin")
+@click.option("--retries", default=RETRIES, type=int, help="Times to try a transaction again when it fails with a transient error. 0 counts every failure")
+@click.option("--retry-backoff", default=RETRY_BACKOFF, type=float, help="Seconds the wait before the first retry can be up to. Doubled for each retry after it")
+@click.option("--retry-max-backoff", default=RETRY_MAX_BACKOFF, type=float, help="Most seconds the wait before any retry can be up to")
+@click.option("--skip-body", is_flag=True, default=False, help="Only check each response for errors, reading and throwing away the rest of it undecoded. For the most requests per second from the client")
+@click.option("--rate", "-rate", default=RATE, type=float, help="Open loop: send this many transactions per second on a fixed timetable. 0 is closed loop")
+@click.option("--duration", "-duration", default=DURATION, type=float, help="Run each test for this many seconds instead of --num-requests transactions")
+@click.option("--warm-up", "-warmup", default=WARM_UP, type=float, help="Seconds at the start of each test to leave out of the results")
+@click.option("--cool-down", "-cooldown", default=COOL_DOWN, type=float, help="Seconds at the end of each test to leave out of the results")
+@click.option("--step-every", "-step", default=STEP_EVERY, type=float, help="Raise the workers and / or rate every this many seconds. Needs --duration")
+@click.option("--step-workers", default=STEP_WORKERS, type=int, help="Workers to add at each step")
+@click.option("--step-rate", default=STEP_RATE, type=float, help="Transactions per second to add to --rate at each step")
+@click.option("--ramp", is_flag=True, default=False, help="Raise the rate smoothly rather than in steps")
+@click.option("--search", "-search", default=None, type=click.Choice(["workers", "rate"]), help="Search for the workers or rate that give the most transactions per second inside --search-latency-bound")
+@click.option("--search-latency-bound", default=SEARCH_LATENCY_BOUND, type=float, help="Highest p99 latency, in ms, a search trial may have")
+@click.option("--search-trial-time", default=SEARCH_TRIAL_TIME, type=float, help="Seconds to run each search trial for")
+@click.option("--search-max-trials", default=SEARCH_MAX_TRIALS, type=int, help="Most trials a search will run")
+@click.option("--search-error-bound", default=SEARCH_ERROR_BOUND, type=float, help="Most of a search trial's transactions, in %, that may fail")
+@click.option("--processes", "-processes", default=PROCESSES, type=int, help="Run each test in this many processes at once, each with its own client and MAX_WORKERS workers")
+@click.option("--distribute", "-distribute", default=DISTRIBUTE, type=str, help="Comma separated host:port of worker agents to run each test on instead of here")
+@click.option("--worker-token", default=WORKER_TOKEN, type=str, help="Token the worker agents were started with")
+@click.option("--results-store", "-store", default=RESULTS_STORE, type=str, help="Add the results, with the settings used and raw samples, to this JSON Lines file")
+@click.option("--profile", "-profile", default=PROFILE or None, type=click.Choice(list(PROFILE_MODES)), help="Profile the timed part of each test: cpu samples the stacks of every thread, alloc traces memory allocations. Writes collapsed stacks for a flame graph")
+@click.option("--profile-top", default=PROFILE_TOP, type=int, help="Functions, or allocation sites, to show for each profiled test")
+@click.option("--label", "-label", default="", type=str, help="Name for this run in the results store, to compare against later")
+@click.option("--mock", "-mock", is_flag=True, default=False, help="Run against a local mock of the Query API, set up with the MOCK_ environment variables, instead of Neo4j")
+def run_benchmark_tests(tests: dict, num_requests: int, neo4j_url: str, neo4j_usr: str, neo4j_pwd: str, neo4j_cypher: str, neo4j_db: str, params: tuple, param_seed: int, scenario: str, statements_per_tx: int, pipeline: bool, tx_reuse: int, batch_sizes: str, output_graph: bool, output_table: bool, output_json: str, max_workers: int, network_timeout, network_http2: bool, response_format: str, accept_encoding: str, request_encoding: str, max_connections: int, max_keepalive: int, keepalive_expiry: float, pool_timeout: float, client_strategy: str, clients: int, retries: int, retry_backoff: float, retry_max_backoff: float, skip_body: bool, rate: float, duration: float, warm_up: float, cool_down: float, step_every: float, step_workers: int, step_rate: float, ramp: bool, search: str, search_latency_bound: float, search_trial_time: float, search_max_trials: int, search_error_bound: float, processes: int, distribute: str, worker_token: str, results_store: str, profile: str, profile_top: int, label: str, mock: bool) -> None:
 
     results = {}
-    total_time: timedelta
 
-    for test_name in tests:
-        test = benchmark_test_map[test_name]
-  
-        total_time = test.run(num_requests, neo4j_cypher, neo4j_url, neo4j_usr, neo4j_pwd, neo4j_db, network_timeout, max_workers, network_http2)
+    started = datetime.now()
+    run_id = new_run_id(started)
+
+    # Settings for the results store.  The password is left out
+    config = {"tests": list(tests), "num_requests": num_requests, "neo4j_url": neo4j_url, "neo4j_db": neo4j_db,
+              "neo4j_cypher": neo4j_cypher, "parameters": list(params), "parameter_seed": param_seed, "scenario": scenario, "statements_per_tx": statements_per_tx, "pipeline": pipeline, "tx_reuse": tx_reuse, "batch_sizes": batch_sizes, "max_workers": max_workers, "network_timeout": network_timeout,
+              "network_http2": network_http2, "response_format": response_format, "accept_encoding": accept_encoding, "request_encoding": request_encoding,
+              "max_connections": max_connections, "max_keepalive": max_keepalive, "keepalive_expiry": keepalive_expiry, "pool_timeout": pool_timeout, "client_strategy": client_strategy, "clients": clients, "retries": retries, "retry_backoff": retry_backoff, "retry_max_backoff": retry_max_backoff, "skip_body": skip_body, "rate": rate, "duration": duration, "warm_up": warm_up, "cool_down": cool_down,
+              "step_every": step_every, "step_workers": step_workers, "step_rate": step_rate, "ramp": ramp, "search": search, "search_error_bound": search_error_bound,
+              "processes": processes, "distribute": distribute, "profile": profile, "mock": mock_settings() if mock else None, "json_codec": JSON_CODEC}
+
+    mock_process = None
+
+    if mock:
+        # The mock runs in its own process so that it does not compete with the benchmarks for the GIL
+        mock_process, neo4j_url = start_mock_query_api(**mock_settings())
+        neo4j_db = neo4j_db or "neo4j"
+        neo4j_usr = neo4j_usr or "neo4j"
+        neo4j_pwd = neo4j_pwd or "neo4j"
+
+    if step_every > 0 and duration <= 0:
+        raise click.UsageError("--step-every needs --duration so that the number of steps is known")
+
+    # Parameters for the cypher statement of each transaction
+    try:
+        parameters = ParameterSource.parse(params, param_seed)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--param")
+
+    # How each managed transaction is made up
+    try:
+        tx_shape = TransactionShape(statements_per_tx, pipeline, tx_reuse)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--statements-per-tx / --tx-reuse")
+
+    # Rows to send with each statement, one run of each test for each of them
+    if batch_sizes:
+        try:
+            batch_sweep = tuple(int(batch_size) for batch_size in batch_sizes.split(","))
+        except ValueError:
+            raise click.BadParameter(f"{batch_sizes} is not a comma separated list of whole numbers", param_hint="--batch-sizes")
+
+        if parameters is None:
+            raise click.UsageError("--batch-sizes needs --param for the fields of each row")
+
+        if search or "Scenario" in tests:
+            raise click.UsageError("--batch-sizes cannot be used with --search or the Scenario test")
+
+    # The mix of transactions for the Scenario test
+    tx_scenario = None
+
+    if "Scenario" in tests and not scenario:
+        raise click.UsageError("The Scenario test needs --scenario")
+
+    if scenario:
+        try:
+            tx_scenario = Scenario.load(scenario, param_seed)
+        except (OSError, ValueError, KeyError) as e:
+            raise click.BadParameter(str(e), param_hint="--scenario")
+
+        # Keep the whole mix, not only where it came from, so the run can be repeated
+        config["scenario"] = tx_scenario.to_dict()
+
+    # How the clients make their requests and read the responses
+    try:
+        client_options = ClientOptions(skip_body, response_format, accept_encoding, request_encoding,
+                                       max_connections, max_keepalive, keepalive_expiry, pool_timeout, client_strategy, clients,
+                                       retries, retry_backoff, retry_max_backoff)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--max-connections / --max-keepalive / --keepalive-expiry / --pool-timeout / --clients / --retries / --retry-backoff / --retry-max-backoff")
+
+    # Profile every test, including those run in other processes or by worker agents, when asked to
+    Profiler.enable(profile, profile_top)
+
+    # When to send each transaction and for how long.  Closed loop unless a rate has been given
+    load_profile = LoadProfile(rate, duration, warm_up, cool_down, step_every, step_workers, step_rate, ramp)
+
+    # Tests with workers stop early on Ctrl-C and report what they recorded until then.  Other tests
+    # stop at once.  Either way the results of the tests run so far are still shown
+    try:
+        for test_name in tests:
+            # Once a test has been stopped early with Ctrl-C, run no more
+            if any(result.cancelled for result in results.values()):
+                break
+
+            test = benchmark_test_map[test_name]
+
+            # The Scenario test takes its mix of transactions in place of the cypher statement
+            test_cypher = tx_scenario if test_name == "Scenario" else neo4j_cypher
+
+            # Run the test on worker agents, each using the number of processes given
+            if distribute:
+                test = Distributed(test_name, distribute.split(","), processes, worker_token)
 
-        results[test_name] = total_time
+            # Get past the GIL by running the test in more than one process
+            elif processes > 1:
+                test = MultiProcess(test, processes)
 
-    # Generate a graph
+            if batch_sizes:
+                # Run the test at each batch size and keep the result of each one.  Implicit tests only ever have one statement
+                for batch_size, result in BatchSweep.run(test, batch_sweep, num_requests, test_cypher, neo4j_url, neo4j_usr, neo4j_pwd, neo4j_db, network_timeout, max_workers, network_http2,
+                                                         load_profile, parameters, tx_shape if test_name in managed_tests else None, client_options):
+                    results[f"{test_name} x {batch_size}"] = result
+
+                    if result.cancelled:
+                        break
+
+                continue
+
+            if search:
+                if test_name not in searchable_tests:
+                    raise click.UsageError(f"--search needs a test that uses workers, one of {', '.join(searchable_tests)}")
+
+                # Run trials to find the best workers or rate and keep the result of the best one
+                best, trials = ConcurrencySearch.run(test, search, search_latency_bound / 1000, search_trial_time, search_max_trials,
+                                                     num_requests, test_cypher, neo4j_url, neo4j_usr, neo4j_pwd, neo4j_db, network_timeout, max_workers, network_http2, rate, parameters, tx_shape, client_options,
+                                                     search_error_bound / 100)
+
+                if best is None and not trials[-1]["result"].cancelled:
+                    print(f"{test_name}: no trial had a p99 latency inside {search_latency_bound}ms with no more than {search_error_bound}% of transactions failing")
+
+                result = (best or trials[-1])["result"]
+                result.search_trials = [{key: value for key, value in trial.items() if key != "result"} | {"best": trial is best} for trial in trials]
+
+                # The search was stopped early
+                result.cancelled = trials[-1]["result"].cancelled
+
+                results[test_name] = result
+                continue
+
+            result = test.run(num_requests, test_cypher, neo4j_url, neo4j_usr, neo4j_pwd, neo4j_db, network_timeout, max_workers, network_http2, load_profile, parameters, tx_shape, client_options)
+
+            results[test_name] = result
+
+    except KeyboardInterrupt:
+        print("\nStopped early.  Showing the results of the tests that finished")
+
+    # A worker agent failed.  What the others recorded until they were stopped is kept, as with Ctrl-C
+    except WorkerAgentError as e:
+        print(f"\n{e}")
+
+        if e.result is not None:
+            results[test_name] = e.result
+
+        print("Stopped early.  Showing the results of the tests that finished")
+
+    # A process of a test run with --processes did not start
+    except ProcessStartError as e:
+        print(f"\n{e}")
+        print("Stopped early.  Showing the results of the tests that finished")
+
+    if mock_process:
+        mock_process.terminate()
+
+    # Stopped before any test finished
+    if not results:
+        return
+
+    # Generate a graph, named after the run so it can be matched to the results store
     if output_graph:
-        generate_graph(results)
+        generate_graph(results, f"{run_id}.png")
+
+        # And one of the parts of each request, when they were timed
+        if any("http" in result.summary() for result in results.values()):
+            generate_http_graph(results, f"{run_id}_http.png")
 
     # Generate a table
     if output_table:
-        generate_table(results, num_requests)
+        generate_table(results)
+
+    # Save the results as JSON
+    if output_json:
+        generate_json(results, output_json)
+
+    # Save the collapsed stacks of each profiled test, named after the run
+    if profile:
+        generate_profile_files(results, run_id)
+
+    # Keep the results to compare against later
+    if results_store:
+        ResultsStore(results_store).add(run_id, started, label, config, results)
 
 
 
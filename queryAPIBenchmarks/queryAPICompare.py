@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+
+# Generic / built in
+import os
+import sys
+
+import click
+from dotenv import load_dotenv
+
+# Owned
+from queryAPIBenchmarks.common import ResultsStore
+from queryAPIBenchmarks.common.compareResults import compare_runs
+from queryAPIBenchmarks.common.showResults import generate_compare_table
+
+
+load_dotenv()
+
+RESULTS_STORE = os.getenv('RESULTS_STORE', '')
+COMPARE_THRESHOLD = float(os.getenv('COMPARE_THRESHOLD', 5))
+COMPARE_ALPHA = float(os.getenv('COMPARE_ALPHA', 0.05))
+
+
+@click.command()
+@click.option("--results-store", "-store", default=RESULTS_STORE, type=str, required=True, help="JSON Lines file written with --results-store")
+@click.option("--baseline", "-baseline", default="-2", type=str, help="Run id, label or position of the baseline run. Default is the run before the latest")
+@click.option("--current", "-current", default="-1", type=str, help="Run id, label or position of the run to check. Default is the latest")
+@click.option("--threshold", "-threshold", default=COMPARE_THRESHOLD, type=float, help="Percentage fall in throughput or rise in p99 latency that is a regression")
+@click.option("--alpha", "-alpha", default=COMPARE_ALPHA, type=float, help="Significance level a difference must reach to be a regression")
+def compare(results_store: str, baseline: str, current: str, threshold: float, alpha: float) -> None:
+
+    store = ResultsStore(results_store)
+
+    baseline_run = store.find(baseline)
+    current_run = store.find(current)
+
+    for reference, run in ((baseline, baseline_run), (current, current_run)):
+        if run is None:
+            print(f"No run {reference} in {results_store}")
+            sys.exit(2)
+
+    comparisons = compare_runs(baseline_run, current_run, threshold, alpha)
+
+    if not comparisons:
+        print(f"Runs {baseline_run['run_id']} and {current_run['run_id']} have no tests in common")
+        sys.exit(2)
+
+    generate_compare_table(comparisons, baseline_run, current_run)
+
+    # A non zero exit code lets a CI job fail on a regression
+    regressions = [comparison for comparison in comparisons if comparison["regression"]]
+
+    if regressions:
+        print(f"\n {len(regressions)} regression(s) of more than {threshold}% found\n")
+        sys.exit(1)
+
+    print(f"\n No regressions of more than {threshold}% found\n")
+
+
+
+if __name__ == "__main__":
+    compare()
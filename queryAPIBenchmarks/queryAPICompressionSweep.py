@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+
+# Generic / built in
+import json
+import os
+
+import click
+from dotenv import load_dotenv
+
+# Owned
+from queryAPIBenchmarks.benchmarks import CompressionSweep
+from queryAPIBenchmarks.benchmarks.queryAPICompressionSweep import ROWS_CYPHER
+from queryAPIBenchmarks.common import CONTENT_ENCODINGS, ClientOptions, start_mock_query_api
+from queryAPIBenchmarks.common.showResults import generate_compression_table
+from queryAPIBenchmarks.queryAPIMockServer import mock_settings
+
+
+load_dotenv()
+
+NUM_REQUESTS = int(os.getenv('NUM_REQUESTS', 5))
+NEO4J_URL = os.getenv('NEO4J_URL')
+NEO4J_USR = os.getenv('NEO4J_USERNAME')
+NEO4J_PWD = os.getenv('NEO4J_PASSWORD')
+NEO4J_DB = os.getenv('NEO4J_DATABASE')
+NETWORK_TIMEOUT = int(os.getenv('NETWORK_TIMEOUT',30))
+COMPRESSION_ROWS = os.getenv('COMPRESSION_ROWS', '1,100,10000,100000')
+
+
+@click.command()
+@click.option("--num-requests", "-n", default=NUM_REQUESTS, type=int, help="Transactions to send for each result size and encoding")
+@click.option("--neo4j-url", "-url", default=NEO4J_URL, type=str)
+@click.option("--neo4j-usr", "-usr", default=NEO4J_USR, type=str)
+@click.option("--neo4j-pwd", "-pwd", default=NEO4J_PWD, type=str)
+@click.option("--neo4j-db", "-db", default=NEO4J_DB, type=str)
+@click.option("--network-timeout", "-timeout", default=NETWORK_TIMEOUT, type=int)
+@click.option("--rows", "-rows", default=COMPRESSION_ROWS, type=str, help="Comma separated rows in each result to sweep")
+@click.option("--neo4j-cypher", "-cypher", default=ROWS_CYPHER, type=str, help="Statement making a result of $rows rows")
+@click.option("--encoding", "-encoding", "encodings", multiple=True, type=click.Choice(list(CONTENT_ENCODINGS)), help="Accept-Encoding to compare. Can be given more than once. All of them when not given")
+@click.option("--request-encoding", default="identity", type=click.Choice(list(CONTENT_ENCODINGS)), help="Compress request bodies with this")
+@click.option("--output-json", "-json", default="", type=str, help="Write the results to this file as JSON")
+@click.option("--mock", "-mock", is_flag=True, default=False, help="Run against a local mock of the Query API, started with each number of rows, instead of Neo4j")
+def compression_sweep(num_requests: int, neo4j_url: str, neo4j_usr: str, neo4j_pwd: str, neo4j_db: str, network_timeout: int, rows: str,
+                      neo4j_cypher: str, encodings: tuple, request_encoding: str, output_json: str, mock: bool) -> None:
+
+    try:
+        result_rows = tuple(int(row) for row in rows.split(","))
+    except ValueError:
+        raise click.BadParameter(f"{rows} is not a comma separated list of whole numbers", param_hint="--rows")
+
+    if mock:
+        neo4j_db = neo4j_db or "neo4j"
+        neo4j_usr = neo4j_usr or "neo4j"
+        neo4j_pwd = neo4j_pwd or "neo4j"
+
+    client_options = ClientOptions(request_encoding=request_encoding)
+
+    sweep = []
+
+    for result_size in result_rows:
+        mock_process = None
+
+        # The mock ignores the statement so is started with the rows wanted
+        if mock:
+            mock_process, neo4j_url = start_mock_query_api(**(mock_settings() | {"rows": result_size}))
+
+        try:
+            sweep += CompressionSweep.run(num_requests, result_size, neo4j_url, neo4j_usr, neo4j_pwd, neo4j_db, network_timeout,
+                                          cypher=neo4j_cypher, encodings=encodings or CONTENT_ENCODINGS, client_options=client_options)
+        finally:
+            if mock_process:
+                mock_process.terminate()
+
+    generate_compression_table(sweep)
+
+    if output_json:
+        with open(output_json, "w") as f:
+            json.dump(sweep, f, indent=2)
+
+
+
+if __name__ == "__main__":
+    compression_sweep()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+
+# Generic / built in
+import json
+import os
+
+import click
+from dotenv import load_dotenv
+
+# Owned
+from queryAPIBenchmarks.benchmarks import DecodeCost
+from queryAPIBenchmarks.common.showResults import generate_decode_table
+
+
+load_dotenv()
+
+DECODE_ROWS = os.getenv('DECODE_ROWS', '1,10,100,1000,10000,100000')
+DECODE_ROW_SIZE = int(os.getenv('DECODE_ROW_SIZE', 8))
+DECODE_REPEATS = int(os.getenv('DECODE_REPEATS', 20))
+
+
+@click.command()
+@click.option("--rows", "-rows", default=DECODE_ROWS, type=str, help="Comma separated rows in each response to measure")
+@click.option("--row-size", "-row-size", default=DECODE_ROW_SIZE, type=int, help="Bytes in each row")
+@click.option("--repeats", "-repeats", default=DECODE_REPEATS, type=int, help="Times to read each response.  The mean is reported")
+@click.option("--output-json", "-json", default="", type=str, help="Write the results to this file as JSON")
+def decode_cost(rows: str, row_size: int, repeats: int, output_json: str) -> None:
+
+    try:
+        response_rows = tuple(int(row) for row in rows.split(","))
+    except ValueError:
+        raise click.BadParameter(f"{rows} is not a comma separated list of whole numbers", param_hint="--rows")
+
+    costs = DecodeCost.run(response_rows, row_size, repeats)
+
+    generate_decode_table(costs)
+
+    if output_json:
+        with open(output_json, "w") as f:
+            json.dump(costs, f, indent=2)
+
+
+
+if __name__ == "__main__":
+    decode_cost()
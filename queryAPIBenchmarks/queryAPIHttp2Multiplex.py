@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+
+# Generic / built in
+import json
+import os
+
+import click
+from dotenv import load_dotenv
+
+# Owned
+from queryAPIBenchmarks.benchmarks import Http2Multiplex
+from queryAPIBenchmarks.benchmarks.queryAPIHttp2Multiplex import PROTOCOLS
+from queryAPIBenchmarks.common import start_mock_query_api
+from queryAPIBenchmarks.common.showResults import generate_multiplex_table
+from queryAPIBenchmarks.queryAPIMockServer import mock_settings
+
+
+load_dotenv()
+
+NUM_REQUESTS = int(os.getenv('NUM_REQUESTS', 5))
+NEO4J_URL = os.getenv('NEO4J_URL')
+NEO4J_USR = os.getenv('NEO4J_USERNAME')
+NEO4J_PWD = os.getenv('NEO4J_PASSWORD')
+NEO4J_DB = os.getenv('NEO4J_DATABASE')
+NEO4J_CYPHER = os.getenv('NEO4J_CYPHER', 'RETURN 1')
+NETWORK_TIMEOUT = int(os.getenv('NETWORK_TIMEOUT',30))
+HTTP2_CONNECTIONS = os.getenv('HTTP2_CONNECTIONS', '1,2,4')
+HTTP2_STREAMS = os.getenv('HTTP2_STREAMS', '1,4,16,64')
+
+
+def _whole_numbers(value: str, param_hint: str) -> tuple:
+    """
+    PRIVATE
+    A comma separated list of whole numbers, each at least 1
+    """
+    try:
+        numbers = tuple(int(number) for number in value.split(","))
+    except ValueError:
+        raise click.BadParameter(f"{value} is not a comma separated list of whole numbers", param_hint=param_hint)
+
+    if min(numbers) < 1:
+        raise click.BadParameter(f"{value} must all be at least 1", param_hint=param_hint)
+
+    return numbers
+
+
+@click.command()
+@click.option("--num-requests", "-n", default=NUM_REQUESTS, type=int, help="Transactions to send for each number of connections, streams and protocol")
+@click.option("--neo4j-url", "-url", default=NEO4J_URL, type=str, help="https is needed for HTTP/2")
+@click.option("--neo4j-usr", "-usr", default=NEO4J_USR, type=str)
+@click.option("--neo4j-pwd", "-pwd", default=NEO4J_PWD, type=str)
+@click.option("--neo4j-db", "-db", default=NEO4J_DB, type=str)
+@click.option("--neo4j-cypher", "-cypher", default=NEO4J_CYPHER, type=str)
+@click.option("--network-timeout", "-timeout", default=NETWORK_TIMEOUT, type=int)
+@click.option("--connections", "-connections", default=HTTP2_CONNECTIONS, type=str, help="Comma separated HTTP/2 connections to sweep")
+@click.option("--streams", "-streams", default=HTTP2_STREAMS, type=str, help="Comma separated concurrent streams on each connection to sweep")
+@click.option("--protocol", "-protocol", "protocols", multiple=True, type=click.Choice(list(PROTOCOLS)), help="Protocol to compare. Can be given more than once. Both when not given")
+@click.option("--output-json", "-json", default="", type=str, help="Write the results to this file as JSON")
+@click.option("--mock", "-mock", is_flag=True, default=False, help="Run against a local mock of the Query API instead of Neo4j. The mock only speaks HTTP/1.1")
+def multiplex(num_requests: int, neo4j_url: str, neo4j_usr: str, neo4j_pwd: str, neo4j_db: str, neo4j_cypher: str, network_timeout: int,
+              connections: str, streams: str, protocols: tuple, output_json: str, mock: bool) -> None:
+
+    connection_counts = _whole_numbers(connections, "--connections")
+    stream_counts = _whole_numbers(streams, "--streams")
+
+    mock_process = None
+
+    if mock:
+        mock_process, neo4j_url = start_mock_query_api(**mock_settings())
+        neo4j_db = neo4j_db or "neo4j"
+        neo4j_usr = neo4j_usr or "neo4j"
+        neo4j_pwd = neo4j_pwd or "neo4j"
+
+    try:
+        sweep = Http2Multiplex.run(num_requests, neo4j_cypher, neo4j_url, neo4j_usr, neo4j_pwd, neo4j_db, network_timeout,
+                                   connection_counts, stream_counts, protocols or PROTOCOLS)
+    finally:
+        if mock_process:
+            mock_process.terminate()
+
+    generate_multiplex_table(sweep)
+
+    if output_json:
+        with open(output_json, "w") as f:
+            json.dump(sweep, f, indent=2)
+
+
+
+if __name__ == "__main__":
+    multiplex()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+
+# Generic / built in
+import os
+
+import click
+from dotenv import load_dotenv
+
+# Owned
+from queryAPIBenchmarks.common import MockQueryAPIServer
+
+
+load_dotenv()
+
+MOCK_HOST = os.getenv('MOCK_HOST', '127.0.0.1')
+MOCK_PORT = int(os.getenv('MOCK_PORT', 7474))
+MOCK_LATENCY = float(os.getenv('MOCK_LATENCY', 0))
+MOCK_JITTER = float(os.getenv('MOCK_JITTER', 0))
+MOCK_ERROR_RATE = float(os.getenv('MOCK_ERROR_RATE', 0))
+MOCK_ERROR_CODE = os.getenv('MOCK_ERROR_CODE', 'Neo.TransientError.Request.ResourceExhaustion')
+MOCK_ROWS = int(os.getenv('MOCK_ROWS', 1))
+MOCK_ROW_SIZE = int(os.getenv('MOCK_ROW_SIZE', 8))
+MOCK_CLUSTER_AFFINITY = os.getenv('MOCK_CLUSTER_AFFINITY', '')
+MOCK_SEED = int(os.getenv('MOCK_SEED', 0))
+
+
+def mock_settings(latency: float = MOCK_LATENCY, jitter: float = MOCK_JITTER, error_rate: float = MOCK_ERROR_RATE,
+                  error_code: str = MOCK_ERROR_CODE, rows: int = MOCK_ROWS, row_size: int = MOCK_ROW_SIZE,
+                  cluster_affinity: str = MOCK_CLUSTER_AFFINITY, seed: int = MOCK_SEED) -> dict:
+    """
+    Settings for MockQueryAPIServer taken from the MOCK_ environment variables.  Latency and jitter are in ms
+    """
+
+    return {"latency": latency / 1000, "jitter": jitter / 1000, "error_rate": error_rate, "error_code": error_code,
+            "rows": rows, "row_size": row_size, "cluster_affinity": cluster_affinity, "seed": seed}
+
+
+@click.command()
+@click.option("--host", "-host", default=MOCK_HOST, type=str)
+@click.option("--port", "-port", default=MOCK_PORT, type=int)
+@click.option("--neo4j-usr", "-usr", default="", type=str, help="Username to expect.  Any are accepted when not given")
+@click.option("--neo4j-pwd", "-pwd", default="", type=str, help="Password to expect")
+@click.option("--latency", "-latency", default=MOCK_LATENCY, type=float, help="ms to wait before answering each request")
+@click.option("--jitter", "-jitter", default=MOCK_JITTER, type=float, help="Up to this many ms are added to or taken from --latency")
+@click.option("--error-rate", "-errors", default=MOCK_ERROR_RATE, type=float, help="Share of requests, 0 to 1, that fail with --error-code")
+@click.option("--error-code", default=MOCK_ERROR_CODE, type=str, help="Neo4j error code to fail requests with")
+@click.option("--rows", "-rows", default=MOCK_ROWS, type=int, help="Rows in the result of each cypher statement")
+@click.option("--row-size", default=MOCK_ROW_SIZE, type=int, help="Bytes in each row. Use with --rows for large results")
+@click.option("--cluster-affinity", default=MOCK_CLUSTER_AFFINITY, type=str, help="Return this in the neo4j-cluster-affinity header, as Aura does")
+@click.option("--seed", "-seed", default=MOCK_SEED, type=int, help="Seed for latency, jitter and errors so that runs can be repeated")
+def run_mock_server(host: str, port: int, neo4j_usr: str, neo4j_pwd: str, latency: float, jitter: float, error_rate: float,
+                    error_code: str, rows: int, row_size: int, cluster_affinity: str, seed: int) -> None:
+
+    settings = mock_settings(latency, jitter, error_rate, error_code, rows, row_size, cluster_affinity, seed)
+
+    server = MockQueryAPIServer(host, port, neo4j_usr, neo4j_pwd, **settings)
+
+    print(f"Mock Query API listening on {server.url}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+
+if __name__ == "__main__":
+    run_mock_server()
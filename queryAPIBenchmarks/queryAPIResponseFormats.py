@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+
+# Generic / built in
+import json
+import os
+
+import click
+from dotenv import load_dotenv
+
+# Owned
+from queryAPIBenchmarks.benchmarks import BenchmarkResponseFormats
+from queryAPIBenchmarks.benchmarks.queryAPIResponseFormats import RESULT_SHAPES
+from queryAPIBenchmarks.common import RESPONSE_FORMATS, start_mock_query_api
+from queryAPIBenchmarks.common.showResults import generate_format_table
+from queryAPIBenchmarks.queryAPIMockServer import mock_settings
+
+
+load_dotenv()
+
+NUM_REQUESTS = int(os.getenv('NUM_REQUESTS', 5))
+NEO4J_URL = os.getenv('NEO4J_URL')
+NEO4J_USR = os.getenv('NEO4J_USERNAME')
+NEO4J_PWD = os.getenv('NEO4J_PASSWORD')
+NEO4J_DB = os.getenv('NEO4J_DATABASE')
+NETWORK_TIMEOUT = int(os.getenv('NETWORK_TIMEOUT',30))
+
+
+@click.command()
+@click.option("--num-requests", "-n", default=NUM_REQUESTS, type=int, help="Transactions to send for each shape and format")
+@click.option("--neo4j-url", "-url", default=NEO4J_URL, type=str)
+@click.option("--neo4j-usr", "-usr", default=NEO4J_USR, type=str)
+@click.option("--neo4j-pwd", "-pwd", default=NEO4J_PWD, type=str)
+@click.option("--neo4j-db", "-db", default=NEO4J_DB, type=str)
+@click.option("--network-timeout", "-timeout", default=NETWORK_TIMEOUT, type=int)
+@click.option("--shape", "-shape", "shapes", multiple=True, help="Result shape to compare as name=cypher. Can be given more than once. A small and a large result when not given")
+@click.option("--format", "-format", "formats", multiple=True, type=click.Choice(list(RESPONSE_FORMATS)), help="Response format to compare. Can be given more than once. All of them when not given")
+@click.option("--output-json", "-json", default="", type=str, help="Write the results to this file as JSON")
+@click.option("--mock", "-mock", is_flag=True, default=False, help="Run against a local mock of the Query API instead of Neo4j. Every shape then has the MOCK_ROWS result")
+def compare_formats(num_requests: int, neo4j_url: str, neo4j_usr: str, neo4j_pwd: str, neo4j_db: str, network_timeout: int, shapes: tuple,
+                    formats: tuple, output_json: str, mock: bool) -> None:
+
+    result_shapes = RESULT_SHAPES
+
+    if shapes:
+        result_shapes = {}
+
+        for shape in shapes:
+            name, separator, cypher = shape.partition("=")
+
+            if not separator or not name or not cypher:
+                raise click.BadParameter(f"{shape} is not name=cypher", param_hint="--shape")
+
+            result_shapes[name] = cypher
+
+    mock_process = None
+
+    if mock:
+        mock_process, neo4j_url = start_mock_query_api(**mock_settings())
+        neo4j_db = neo4j_db or "neo4j"
+        neo4j_usr = neo4j_usr or "neo4j"
+        neo4j_pwd = neo4j_pwd or "neo4j"
+
+    try:
+        comparison = BenchmarkResponseFormats.run(num_requests, result_shapes, neo4j_url, neo4j_usr, neo4j_pwd, neo4j_db, network_timeout,
+                                                  formats=formats or tuple(RESPONSE_FORMATS))
+    finally:
+        if mock_process:
+            mock_process.terminate()
+
+    generate_format_table(comparison)
+
+    if output_json:
+        with open(output_json, "w") as f:
+            json.dump(comparison, f, indent=2)
+
+
+
+if __name__ == "__main__":
+    compare_formats()
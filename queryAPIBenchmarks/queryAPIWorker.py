@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+# Generic/Built-in
+from __future__ import absolute_import
+
+__author__ = 'Jonathan Giffard'
+__copyright__ = 'Copyright 2025, Neo4j'
+__credits__ = ['Jonathan Giffard']
+__license__ = 'MIT License'
+__version__ = '0.0.1'
+__maintainer__ = 'Jonathan Giffard'
+__email__ = 'jon.giffard@neo4j.com'
+__status__ = 'Alpha'
+
+
+# Generic / built in
+import _thread
+import hmac
+import ipaddress
+import multiprocessing
+import os
+import queue
+import socket
+import threading
+import time
+
+import click
+from dotenv import load_dotenv
+
+# Owned
+from queryAPIBenchmarks.benchmarks import MultiProcess
+from queryAPIBenchmarks.common import (WORKER_PORT, ClientOptions, LoadProfile, ParameterSource, Profiler, ProgressBar, Scenario, TransactionShape,
+                                       receive_message, send_message)
+from queryAPIBenchmarks.queryAPIBenchmarks import benchmark_test_map
+
+
+load_dotenv()
+
+WORKER_HOST = os.getenv('WORKER_HOST', '127.0.0.1')
+WORKER_TOKEN = os.getenv('WORKER_TOKEN', '')
+
+# The worker's own credentials.  A coordinator never sends any
+NEO4J_USR = os.getenv('NEO4J_USERNAME')
+NEO4J_PWD = os.getenv('NEO4J_PASSWORD')
+
+# How often, in seconds, progress is sent to the coordinator
+PROGRESS_EVERY = 0.5
+
+
+def _is_loopback(host: str) -> bool:
+    # Whether only this machine can connect to an address
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == "localhost"
+
+
+class _Stopper:
+    """
+    PRIVATE
+    Stops the test running in the main thread, as Ctrl-C would, when the coordinator asks or goes away.
+    Tests with workers then send what they recorded until then
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._running = False
+        self.stopped = False
+
+
+    def running(self, running: bool):
+        # Called before and after a test runs
+        with self._lock:
+            self._running = running
+
+            if running:
+                self.stopped = False
+
+
+    def stop(self):
+        with self._lock:
+            if self._running and not self.stopped:
+                self.stopped = True
+                _thread.interrupt_main()
+
+
+def _read_messages(stream, messages: queue.Queue, stopper: _Stopper):
+    # Reads every message from the coordinator so that a stop is seen while a test runs.  None once it has gone
+    while True:
+        try:
+            message = receive_message(stream)
+        except (ConnectionError, OSError, ValueError):
+            stopper.stop()
+            messages.put(None)
+            return
+
+        if message.get("type") == "stop":
+            stopper.stop()
+        else:
+            messages.put(message)
+
+
+def _send_progress(stream, counter, stop: threading.Event):
+    # Sends the number of transactions finished until the test ends
+    while not stop.wait(PROGRESS_EVERY):
+        send_message(stream, "progress", done=counter.value)
+
+
+def _run_test(stream, message: dict, counter, stopper: _Stopper):
+    # Runs a test for the coordinator and sends back its result as histograms
+
+    test = benchmark_test_map[message["test"]]
+
+    if message["processes"] > 1:
+        test = MultiProcess(test, message["processes"])
+
+    load_profile = LoadProfile(**message["load_profile"])
+    parameters = ParameterSource.from_dict(message["parameters"]) if message["parameters"] else None
+
+    # A scenario test has its Scenario in place of the cypher statement
+    args = message["args"]
+    args[3], args[4] = NEO4J_USR, NEO4J_PWD
+    if message.get("scenario"):
+        args[1] = Scenario.from_dict(message["scenario"])
+
+    tx_shape = TransactionShape(**message["tx_shape"]) if message.get("tx_shape") else None
+    client_options = ClientOptions.from_dict(message["client_options"]) if message.get("client_options") else None
+
+    # Profile the test as the coordinator was asked to, or not at all
+    Profiler.enable(**message.get("profile", {}))
+
+    # Start at the same moment as every other worker
+    delay = message["start_at"] - time.time()
+    if delay > 0:
+        time.sleep(delay)
+
+    with counter.get_lock():
+        counter.value = 0
+
+    stop = threading.Event()
+    progress = threading.Thread(target=_send_progress, args=(stream, counter, stop), daemon=True)
+    progress.start()
+
+    stopper.running(True)
+
+    try:
+        result = test.run(*args, load_profile=load_profile, parameters=parameters, tx_shape=tx_shape, client_options=client_options)
+
+    # Stopped by the coordinator before it had a result.  A Ctrl-C here stops the worker agent
+    except KeyboardInterrupt:
+        if not stopper.stopped:
+            raise
+        result = None
+
+    finally:
+        stopper.running(False)
+        stop.set()
+        progress.join()
+
+    if result is None:
+        send_message(stream, "stopped")
+    else:
+        send_message(stream, "result", report=result.histograms())
+
+
+def _serve_coordinator(stream, counter, token: str) -> bool:
+    # Answers a coordinator until it disconnects.  It may run several tests, one after the other.
+    # A coordinator must give our token in its first message, False when it did not
+
+    first = True
+    messages = queue.Queue()
+    stopper = _Stopper()
+    threading.Thread(target=_read_messages, args=(stream, messages, stopper), daemon=True).start()
+
+    while True:
+        message = messages.get()
+
+        if message is None:
+            return not first
+
+        if first:
+            given = message.get("token") if message.get("type") == "time" else None
+
+            if not isinstance(given, str) or not hmac.compare_digest(given.encode(), token.encode()):
+                send_message(stream, "error", message="Wrong or missing worker token, see WORKER_TOKEN")
+                return False
+
+            first = False
+
+        if message["type"] == "time":
+            send_message(stream, "time", time=time.time())
+
+        elif message["type"] == "run":
+            print(f"Running {message['test']} for the coordinator")
+
+            try:
+                _run_test(stream, message, counter, stopper)
+
+            # Failed transactions are counted by the tests so only errors setting up a test get here
+            except Exception as e:
+                send_message(stream, "error", message=f"{type(e).__name__}: {e}")
+
+            # Stopped just as the test finished
+            except KeyboardInterrupt:
+                if not stopper.stopped:
+                    raise
+                send_message(stream, "stopped")
+
+
+@click.command()
+@click.option("--host", "-host", default=WORKER_HOST, type=str, help="Address to listen on. Use 0.0.0.0 for every interface, together with --token")
+@click.option("--port", "-port", default=WORKER_PORT, type=int)
+@click.option("--token", "-token", default=WORKER_TOKEN, type=str, help="Only run tests for coordinators that give this token")
+def run_worker(host: str, port: int, token: str) -> None:
+
+    # Anyone who can connect can run tests against Neo4j with our credentials
+    if not token and not _is_loopback(host):
+        print(f"Warning: listening on {host} without a token.  Any machine that can reach it can run tests with this "
+              f"worker's Neo4j credentials.  Set WORKER_TOKEN, or --token, here and on the coordinator")
+
+    if not NEO4J_USR or not NEO4J_PWD:
+        print("Warning: NEO4J_USERNAME or NEO4J_PASSWORD is not set.  Workers use their own credentials, not the coordinator's")
+
+    # Progress is sent to the coordinator rather than shown here
+    counter = multiprocessing.Value("q", 0)
+    ProgressBar.share(counter)
+
+    with socket.create_server((host, port)) as server:
+        print(f"Worker agent listening on {host}:{port}")
+
+        try:
+            while True:
+                connection, address = server.accept()
+                print(f"Coordinator connected from {address[0]}")
+
+                with connection, connection.makefile("rwb") as stream:
+                    try:
+                        if not _serve_coordinator(stream, counter, token or ""):
+                            print(f"Refused coordinator at {address[0]}: wrong or missing token")
+
+                    # The coordinator has gone
+                    except OSError:
+                        pass
+
+                    # Ends the thread still reading from it
+                    try:
+                        connection.shutdown(socket.SHUT_RDWR)
+                    except OSError:
+                        pass
+
+        except KeyboardInterrupt:
+            pass
+
+
+
+if __name__ == "__main__":
+    run_worker()
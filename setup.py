@@ -17,5 +17,12 @@ setup(
     entry_points="""
         [console_scripts]
         queryAPIBenchmarks=queryAPIBenchmarks.queryAPIBenchmarks:run_benchmark_tests
+        queryAPIMockServer=queryAPIBenchmarks.queryAPIMockServer:run_mock_server
+        queryAPIWorker=queryAPIBenchmarks.queryAPIWorker:run_worker
+        queryAPICompare=queryAPIBenchmarks.queryAPICompare:compare
+        queryAPIDecodeCost=queryAPIBenchmarks.queryAPIDecodeCost:decode_cost
+        queryAPIResponseFormats=queryAPIBenchmarks.queryAPIResponseFormats:compare_formats
+        queryAPICompressionSweep=queryAPIBenchmarks.queryAPICompressionSweep:compression_sweep
+        queryAPIHttp2Multiplex=queryAPIBenchmarks.queryAPIHttp2Multiplex:multiplex
     """,
 )
\ No newline at end of file